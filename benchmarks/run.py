@@ -0,0 +1,324 @@
+"""Benchmarks de carga e busca do CardDatabase e da CLI.
+
+Mede, para as pastas reais (database/en, database/pt) e para cópias
+sintéticas ampliadas (10x, 100x):
+
+- tempo de carga e pico de memória (RSS) do CardDatabase, em processo
+  separado, para cada modo de carga;
+- latência da busca (p50/p95/p99);
+- vazão do load_deck;
+- tempo até o primeiro prompt do ``python cli.py``.
+
+O resultado é um JSON (em stdout ou em ``--output``) para comparar entre
+commits com ``--compare``:
+
+    python -m benchmarks.run --output atual.json
+    python -m benchmarks.run --compare base.json atual.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from models import catalog  # noqa: E402
+from models.database import CardDatabase  # noqa: E402
+from models.deck import Deck  # noqa: E402
+from models.search_index import index_path  # noqa: E402
+from storage.storage import load_deck, save_deck  # noqa: E402
+
+LOAD_MODES = ("folder", "catalog-cold", "catalog-warm", "lazy-warm")
+QUERIES = (
+    "dragon", "blue eyes", "destroy", "draw 1 card", "special summon", "warrior",
+    "fusão", "dragão", "monstro", "+", "zzzqqq", "rago",
+)
+ID_STRIDE = 100000  # ids sintéticos: id original + cópia * ID_STRIDE
+
+
+# DADOS SINTÉTICOS
+
+def make_synthetic(source, dest, scale, cards_per_file=100):
+    """Gera em ``dest`` ``scale`` cópias das cartas de ``source`` (com ids novos).
+
+    As cartas são agrupadas em arquivos com ``cards_per_file`` cartas cada,
+    para não criar milhões de arquivos nas escalas maiores. A pasta é
+    reaproveitada se já existir.
+    """
+    if os.path.isdir(dest):
+        return dest
+
+    catalog.sync_catalog(source)
+    records = catalog.read_catalog(catalog.catalog_path(source))
+    tmp_dest = dest + ".tmp"
+    shutil.rmtree(tmp_dest, ignore_errors=True)
+    os.makedirs(tmp_dest)
+
+    batch = []
+    files = 0
+    for copy in range(scale):
+        for data in records:
+            data = dict(data, id=data["id"] + copy * ID_STRIDE)
+            if copy:
+                data["name"] = f"{data.get('name')} #{copy}"
+            batch.append(data)
+            if len(batch) == cards_per_file:
+                _write_batch(tmp_dest, files, batch)
+                files += 1
+                batch = []
+    if batch:
+        _write_batch(tmp_dest, files, batch)
+
+    os.replace(tmp_dest, dest)
+    return dest
+
+
+def _write_batch(folder, number, batch):
+    with open(os.path.join(folder, f"{number:07}.json"), "w", encoding="utf-8") as f:
+        json.dump(batch, f, ensure_ascii=False)
+
+
+# MEDIÇÕES
+
+def _peak_rss_kb():
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS usa bytes
+
+
+def _remove_generated(folder):
+    for path in (catalog.catalog_path(folder), index_path(folder)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def measure_load_child(folder, mode):
+    """Executado no processo filho: carrega a base uma vez e mede."""
+    start = time.perf_counter()
+    if mode == "folder":
+        db = CardDatabase(path=folder, use_catalog=False)
+    else:
+        db = CardDatabase(path=folder, lazy=(mode == "lazy-warm"))
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "peak_rss_kb": _peak_rss_kb(), "cards": len(db.cards)}
+
+
+def measure_load(folder, mode):
+    """Mede a carga em um processo novo, para que o RSS seja só dela."""
+    if mode == "catalog-cold":
+        _remove_generated(folder)
+    elif mode in ("catalog-warm", "lazy-warm"):
+        catalog.sync_catalog(folder)
+
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--child-load", folder, mode],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout)
+
+
+def percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def measure_search(db, rounds):
+    start = time.perf_counter()
+    db.index
+    index_seconds = time.perf_counter() - start
+
+    samples = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            db.search(query)
+            samples.append(time.perf_counter() - start)
+
+    return {"index_load_seconds": index_seconds, "queries": len(samples), **percentiles(samples)}
+
+
+def measure_load_deck(db, decks, cards_per_deck=40, seed=0):
+    rng = random.Random(seed)
+    ids = sorted(db.cards)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for i in range(decks):
+            deck = Deck(f"bench_{i}")
+            for card_id in rng.choices(ids, k=cards_per_deck):
+                deck.add_card(card_id)
+            save_deck(deck, folder=folder)
+
+        start = time.perf_counter()
+        for i in range(decks):
+            load_deck(f"bench_{i}", db, folder=folder)
+        seconds = time.perf_counter() - start
+
+    return {"decks": decks, "seconds": seconds, "decks_per_second": decks / seconds}
+
+
+def measure_cli_first_prompt(runs):
+    """Tempo de ``python cli.py`` até o primeiro prompt (saindo logo em seguida).
+
+    Decks e lista de banidas ficam numa pasta temporária: o diário e a
+    gravação ao sair nunca tocam o ``data/decks`` de quem roda o benchmark.
+    """
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["YUGIDB_DECKS"] = os.path.join(tmp, "decks")
+        env["YUGIDB_BANLIST"] = os.path.join(tmp, "banlist.json")
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "cli.py"], cwd=ROOT, input="exit\n", env=env,
+                capture_output=True, text=True, check=True,
+            )
+            samples.append(time.perf_counter() - start)
+    return {"runs": runs, "median_seconds": statistics.median(samples), "min_seconds": min(samples)}
+
+
+def bench_folder(folder, args):
+    result = {"load": {mode: measure_load(folder, mode) for mode in args.modes}}
+
+    db = CardDatabase(path=folder)
+    result["cards"] = len(db.cards)
+    result["search"] = measure_search(db, args.rounds)
+    result["load_deck"] = measure_load_deck(db, args.decks)
+    return result
+
+
+def run_suite(args):
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "datasets": {},
+    }
+
+    for folder in args.folders:
+        name = os.path.basename(os.path.normpath(folder))
+        results["datasets"][name] = bench_folder(folder, args)
+
+        for scale in args.scales:
+            dest = os.path.join(args.workdir, f"{name}_x{scale}")
+            make_synthetic(folder, dest, scale, args.cards_per_file)
+            results["datasets"][f"{name}_x{scale}"] = bench_folder(dest, args)
+
+    if args.cli_runs:
+        results["cli_first_prompt"] = measure_cli_first_prompt(args.cli_runs)
+
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+# COMPARAÇÃO
+
+def flatten(results, prefix=""):
+    """Métricas numéricas como {"datasets.en.load.folder.seconds": 0.4, ...}."""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+# métricas em que um valor maior é melhor
+HIGHER_IS_BETTER = ("decks_per_second",)
+# métricas que não medem desempenho
+IGNORED = ("cards", "queries", "decks", "runs", "cpus")
+
+
+def compare(base, current, threshold):
+    """Lista as métricas que pioraram mais que ``threshold`` (razão)."""
+    base, current = flatten(base), flatten(current)
+    regressions = []
+
+    for key, old in sorted(base.items()):
+        new = current.get(key)
+        leaf = key.rsplit(".", 1)[-1]
+        if new is None or leaf in IGNORED or key.startswith("meta.") or not old:
+            continue
+
+        ratio = old / new if leaf in HIGHER_IS_BETTER else new / old
+        if ratio > threshold:
+            regressions.append((key, old, new, ratio))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folders", nargs="+", default=["database/en", "database/pt"])
+    parser.add_argument("--scales", nargs="*", type=int, default=[10, 100])
+    parser.add_argument("--cards-per-file", type=int, default=100)
+    parser.add_argument("--modes", nargs="+", choices=LOAD_MODES, default=list(LOAD_MODES))
+    parser.add_argument("--rounds", type=int, default=20, help="repetições da lista de consultas")
+    parser.add_argument("--decks", type=int, default=500)
+    parser.add_argument("--cli-runs", type=int, default=5)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "yugidb-bench"))
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "ATUAL"))
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--child-load", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child_load:
+        print(json.dumps(measure_load_child(*args.child_load)))
+        return 0
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            current = json.load(f)
+
+        regressions = compare(base, current, args.threshold)
+        for key, old, new, ratio in regressions:
+            print(f"{key}: {old:.4g} -> {new:.4g} ({ratio:.2f}x pior)")
+        if not regressions:
+            print("Nenhuma regressão acima do limite.")
+        return 1 if regressions else 0
+
+    os.makedirs(args.workdir, exist_ok=True)
+    results = run_suite(args)
+    text = json.dumps(results, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,78 +1,301 @@
+import argparse
 import cmd
+import contextlib
+import copy
+import io
+import json
 import os
+import sys
+import threading
 from models.database import CardDatabase
-from models.deck import Deck
-from storage.storage import save_deck, load_deck
+from models import ratios
+from models.deck import Deck, default_zone, id_of
+from models.legality import Report, Validator
+from storage.deck_cache import CardUsage, DeckCache
+from storage.journal import DeckJournal
+from storage.relevance import CardRelevance
+from storage.similarity import SimilarDecks
+from storage.storage import open_store
+
+# Pasta de decks JSON ou arquivo SQLite (.db) onde os decks ficam salvos
+DECKS_STORE = os.environ.get("YUGIDB_DECKS", "data/decks")
+# Lista de banidas (veja models.legality); sem o arquivo vale o limite de 3 cópias
+BANLIST = os.environ.get("YUGIDB_BANLIST", "data/banlist.json")
+SEARCH_PAGE = 50  # cartas por página em search
 
 
 class DeckManager:
-    def __init__(self):
-        self.decks = {}  # nome -> Deck
+    """Decks em memória sobre um backend, seguros para várias threads.
+
+    Cada deck tem sua trava, então operações em decks diferentes correm em
+    paralelo; só o trecho curto que registra a alteração no diário e a
+    aplica em memória passa pela trava geral (``_lock``), que protege
+    também a tabela de nomes e o índice reverso. Ler ou gravar um deck no
+    backend acontece fora dela. Quem precisa de várias travas toma as dos
+    decks primeiro (em ordem de nome) e a geral por último.
+    """
+
+    def __init__(self, store=None, resolve=None, journal=None, validator=None):
+        self.decks = DeckCache(store, resolve)  # nome -> Deck, lido do backend no primeiro get
+        self.usage = CardUsage(self.decks)  # id da carta -> decks que a usam
+        self.relevance = CardRelevance(self.decks)  # inclusão e coocorrência nos decks salvos
+        self.similarity = SimilarDecks(self.decks)  # índice LSH das assinaturas dos decks salvos
+        self.journal = journal  # DeckJournal opcional: cada alteração é registrada antes de aplicada
+        self.validator = validator  # Validator opcional: add recusa o que deixaria o deck ilegal
+        self._lock = threading.RLock()
+        self._deck_locks = {}  # nome -> RLock (nunca removidas, para não trocar a trava de quem espera)
+        if journal is not None:
+            journal.load(self.decks, resolve)
+
+    def _deck_lock(self, name):
+        with self._lock:
+            lock = self._deck_locks.get(name)
+            if lock is None:
+                lock = self._deck_locks[name] = threading.RLock()
+            return lock
+
+    @contextlib.contextmanager
+    def _locked(self, *names):
+        with contextlib.ExitStack() as stack:
+            for name in sorted(set(names)):
+                stack.enter_context(self._deck_lock(name))
+            yield
+
+    @contextlib.contextmanager
+    def locked(self, name):
+        """Trava o deck e o entrega (ou None) para uma leitura consistente."""
+        with self._deck_lock(name):
+            yield self._get(name)
+
+    def _log(self, op, name, **fields):
+        """Registra a alteração no diário e devolve seu número (0 sem diário)."""
+        if self.journal is None:
+            return 0
+        if self.journal.needs_compaction():
+            self.journal.compact(self.decks)
+        return self.journal.append(op, name, **fields)
+
+    def _get(self, name):
+        # Chamado com a trava do deck: ninguém mais o lê do backend ao mesmo tempo
+        with self._lock:
+            if name not in self.decks:
+                return None
+            deck = self.decks.peek(name)
+        if deck is not None:
+            return deck
+
+        deck = self.decks.read(name)
+        with self._lock:
+            return self.decks.fill(name, deck)
+
+    def _deck(self, name):
+        deck = self._get(name)
+        if deck is None:
+            raise ValueError("Deck não encontrado.")
+        return deck
 
     def create(self, name):
-        if name in self.decks:
-            raise ValueError("Já existe um deck com esse nome.")
-        self.decks[name] = Deck(name)
+        with self._deck_lock(name), self._lock:
+            if name in self.decks:
+                raise ValueError("Já existe um deck com esse nome.")
+            seq = self._log("create", name)
+            deck = self.decks[name] = Deck(name)
+            deck.seq = seq
 
     def get(self, name):
-        return self.decks.get(name)
+        with self._deck_lock(name):
+            return self._get(name)
 
     def list(self):
-        return list(self.decks.keys())
+        with self._lock:
+            return list(self.decks.keys())
+
+    def delete(self, name, persist=False):
+        """Apaga o deck; com ``persist``, também do backend, antes de liberar o nome."""
+        with self._deck_lock(name):
+            deck = self._deck(name)  # lido também para o diário saber o seu seq
+            with self._lock:
+                if name not in self.decks:
+                    raise ValueError("Deck não encontrado.")
+                self._log("delete", name)
+                if self.usage.ready:
+                    self.usage.discard_deck(name, deck)
+                del self.decks[name]
+            if persist:
+                self.flush([name])
+
+    def add(self, name, card, amount=1, zone=None):
+        zone = zone or default_zone(card)
+        with self._deck_lock(name):
+            deck = self._deck(name)
+            if self.validator is not None:
+                problem = self.validator.check_add(deck, id_of(card), amount, zone)
+                if problem:
+                    raise ValueError(problem.message)
+            with self._lock:
+                deck.seq = self._log("add", name, card=id_of(card), amount=amount, zone=zone)
+                deck.add_card(card, amount, zone)
+                self.decks.mark_dirty(name)
+                self.usage.add(name, id_of(card))
+
+    def remove(self, name, card_id, amount=1, zone=None):
+        with self._deck_lock(name):
+            deck = self._deck(name)
+            if not deck.count(card_id, zone):
+                return 0
+            with self._lock:
+                deck.seq = self._log("remove", name, card=card_id, amount=amount, zone=zone)
+                self.decks.mark_dirty(name)
+                removed = deck.remove_card(card_id, amount, zone)
+                if not deck.count(card_id):
+                    self.usage.discard(name, card_id)
+            return removed
+
+    def clear(self, name):
+        with self._deck_lock(name):
+            deck = self._deck(name)
+            with self._lock:
+                deck.seq = self._log("clear", name)
+                self.usage.discard_deck(name, deck)
+                deck.clear()
+                self.decks.mark_dirty(name)
+
+    def rename(self, old, new, persist=False):
+        """Renomeia o deck; com ``persist``, grava a troca no backend antes de soltar os dois nomes."""
+        with self._locked(old, new):
+            deck = self._get(old)
+            if deck is None:
+                raise ValueError("Deck original não encontrado.")
+            with self._lock:
+                if new in self.decks:
+                    raise ValueError("Já existe um deck com esse nome.")
+                seq = self._log("rename", old, new=new)
+                del self.decks[old]
+                self.usage.discard_deck(old, deck)
+                deck.name = new
+                deck.seq = seq
+                self.decks[new] = deck
+                self.usage.add_deck(new, deck)
+            if persist:
+                self.flush([old, new])
+
+    def validate(self, name):
+        """Report com os problemas de legalidade do deck.
+
+        Um deck ainda não lido é conferido direto do registro salvo, sem
+        ficar em memória.
+        """
+        validator = self.validator or Validator()
+        with self._deck_lock(name):
+            with self._lock:
+                if name not in self.decks:
+                    raise ValueError("Deck não encontrado.")
+                deck = self.decks.peek(name)
+            if deck is not None:
+                return Report(name, validator.check(deck.zones))
+
+            raw = self.decks.store.read(name)
+            if raw is None:
+                raise ValueError("Deck não encontrado.")
+            return Report(name, validator.check(validator.raw_zones(raw)))
+
+    def validate_all(self):
+        """Report de cada deck, um de cada vez (os não lidos não ficam em memória)."""
+        for name in self.list():
+            try:
+                yield self.validate(name)
+            except ValueError:
+                continue  # apagado durante a passada
+
+    def decks_containing(self, card_id):
+        """Nomes dos decks (salvos ou não) que usam a carta, em ordem alfabética."""
+        with self._lock:
+            return self.usage.decks_containing(card_id)
+
+    def flush(self, names=None):
+        """Grava no backend só os decks alterados (ou só ``names``) e apaga os removidos.
+
+        Gravando tudo, o diário recomeça.
+        """
+        if names is None:
+            with self._lock:
+                if self.journal is not None:
+                    self.journal.compact(self.decks)
+                else:
+                    self.decks.flush()
+            return
 
-    def delete(self, name):
-        if name not in self.decks:
-            raise ValueError("Deck não encontrado.")
-        del self.decks[name]
+        # Com as travas dos decks nenhum deles muda durante a gravação,
+        # e os outros decks seguem livres
+        with self._locked(*names):
+            with self._lock:
+                save = [self.decks.peek(name) for name in names if name in self.decks.dirty]
+                delete = [name for name in names if name in self.decks.deleted]
+            if save or delete:
+                self.decks.write(save, delete)
+            with self._lock:
+                self.decks.dirty.difference_update(deck.name for deck in save)
+                self.decks.deleted.difference_update(delete)
 
-    def add(self, name, card):
-        deck = self.get(name)
-        if not deck:
-            raise ValueError("Deck não encontrado.")
-        deck.add_card(card)
 
-    def remove(self, name, card_id):
-        deck = self.get(name)
-        if not deck:
-            raise ValueError("Deck não encontrado.")
-        deck.remove_card(card_id)
-
-    def rename(self, old, new):
-        if old not in self.decks:
-            raise ValueError("Deck original não encontrado.")
-        if new in self.decks:
-            raise ValueError("Já existe um deck com esse nome.")
-        deck = self.decks.pop(old)
-        deck.name = new
-        self.decks[new] = deck
+class CommandError(Exception):
+    """Falha de um comando da CLI; a mensagem é o que o usuário vê."""
 
 
 class CardCLI(cmd.Cmd):
     intro = "Sistema de Decks Yu-Gi-Oh - digite help para ver os comandos"
     prompt = "> "
 
-    def __init__(self):
+    def __init__(self, defer_writes=False):
         super().__init__()
         self.db = CardDatabase()
-        self.manager = DeckManager()
+        self.defer_writes = defer_writes  # modo em lote: grava os decks só no final
+
+        # Decks salvos (lidos sob demanda) mais as alterações registradas no diário
+        self.store = open_store(DECKS_STORE)
+        self.journal = DeckJournal(self.store)
+        self.manager = DeckManager(self.store, self.db.get, self.journal, Validator.load(BANLIST, self.db.get))
 
-        # CARREGAMENTO AUTOMÁTICO
-        decks_path = "data/decks"
-        os.makedirs(decks_path, exist_ok=True)
+        print(f"{len(self.manager.decks)} deck(s) carregados automaticamente.")
 
-        loaded = 0
-        for filename in os.listdir(decks_path):
-            if filename.endswith(".json"):
-                name = filename.replace(".json", "")
-                try:
-                    deck = load_deck(name, self.db)
-                    self.manager.decks[deck.name] = deck
-                    loaded += 1
-                except Exception as e:
-                    print(f"[Aviso] Erro ao carregar {filename}: {e}")
+    def postloop(self):
+        self.close()
 
-        print(f"{loaded} deck(s) carregados automaticamente.")
+    def _print(self, *args):
+        print(*args, file=self.stdout)
 
+    def session(self, stdout):
+        """Cópia leve da CLI, com a mesma base e os mesmos decks, que escreve em ``stdout``.
+
+        Cada comando do servidor (ou do lote) roda na sua, então comandos em
+        threads diferentes não misturam a saída.
+        """
+        session = copy.copy(self)
+        session.stdout = stdout
+        session.cmdqueue = []
+        return session
+
+    def execute(self, line):
+        """Roda um comando; CommandError sobe para quem chamou (lote, servidor)."""
+        return super().onecmd(line)
+
+    def onecmd(self, line):
+        # No modo interativo a falha só é mostrada
+        try:
+            return self.execute(line)
+        except CommandError as e:
+            self._print(e)
+
+    def close(self):
+        """Grava os decks alterados e fecha o diário e o backend."""
+        self.manager.flush()
+        self.journal.close()
+        self.store.close()
+
+    def _write(self, names):
+        # No modo em lote cada deck é gravado uma vez só, no close()
+        if not self.defer_writes:
+            self.manager.flush(names)
 
     # CRIAR DECK
 
@@ -80,14 +303,13 @@ class CardCLI(cmd.Cmd):
         """create_deck <nome> - cria um novo deck"""
         name = name.strip()
         if not name:
-            print("Uso: create_deck <nome>")
-            return
+            raise CommandError("Uso: create_deck <nome>")
 
         try:
             self.manager.create(name)
-            print(f"Deck '{name}' criado.")
         except ValueError as e:
-            print(e)
+            raise CommandError(str(e))
+        self._print(f"Deck '{name}' criado.")
 
     # LISTAR DECKS
 
@@ -95,10 +317,10 @@ class CardCLI(cmd.Cmd):
         """list_decks - lista todos os decks"""
         decks = self.manager.list()
         if not decks:
-            print("Nenhum deck disponível.")
+            self._print("Nenhum deck disponível.")
         else:
             for d in decks:
-                print("•", d)
+                self._print("•", d)
 
     # MOSTRAR CARTAS DO DECK
 
@@ -107,21 +329,24 @@ class CardCLI(cmd.Cmd):
         name = name.strip()
 
         if not name:
-            print("Uso: show_deck <nome>")
-            return
+            raise CommandError("Uso: show_deck <nome>")
 
-        deck = self.manager.get(name)
-        if not deck:
-            print("Deck não encontrado.")
-            return
+        with self.manager.locked(name) as deck:
+            if deck is None:
+                raise CommandError("Deck não encontrado.")
 
-        print(f"Deck: {deck.name}")
-        if not deck.cards:
-            print("(vazio)")
-            return
+            self._print(f"Deck: {deck.name}")
+            if not len(deck):
+                self._print("(vazio)")
+                return
 
-        for card in deck.cards:
-            print(f"{card.id} — {card.name}")
+            for zone, title in (("main", "Main Deck"), ("extra", "Extra Deck"), ("side", "Side Deck")):
+                entries = deck.entries(zone)
+                if not entries:
+                    continue
+                self._print(f"{title} ({deck.size(zone)}):")
+                for card, amount in entries:
+                    self._print(f"  {amount}x {card.id} — {card.name}")
 
     # APAGA O DECK
 
@@ -129,21 +354,19 @@ class CardCLI(cmd.Cmd):
         """delete_deck <nome> - apaga o deck"""
         name = name.strip()
         if not name:
-            print("Uso: delete_deck <nome>")
-            return
+            raise CommandError("Uso: delete_deck <nome>")
 
+        saved = name in self.store
         try:
-            self.manager.delete(name)
+            # Fora do modo em lote o arquivo some junto com o deck
+            self.manager.delete(name, persist=not self.defer_writes)
         except ValueError as e:
-            print(e)
-            return
+            raise CommandError(str(e))
 
-        path = os.path.join("data/decks", f"{name}.json")
-        if os.path.exists(path):
-            os.remove(path)
-            print(f"Deck '{name}' deletado e arquivo removido.")
+        if saved:
+            self._print(f"Deck '{name}' deletado e arquivo removido.")
         else:
-            print(f"Deck '{name}' deletado (sem arquivo salvo).")
+            self._print(f"Deck '{name}' deletado (sem arquivo salvo).")
 
     # RENOMEAR DECK
 
@@ -152,31 +375,22 @@ class CardCLI(cmd.Cmd):
 
         parts = args.split()
         if len(parts) != 2:
-            print("Uso: rename_deck <antigo> <novo>")
-            return
+            raise CommandError("Uso: rename_deck <antigo> <novo>")
 
         old, new = parts
         old = old.strip()
         new = new.strip()
 
         if not old or not new:
-            print("Os nomes não podem ser vazios.")
-            return
-
-        old_path = os.path.join("data/decks", f"{old}.json")
-        new_path = os.path.join("data/decks", f"{new}.json")
+            raise CommandError("Os nomes não podem ser vazios.")
 
         try:
-            self.manager.rename(old, new)
+            # Renomeia também o deck salvo, se existir, sob as mesmas travas
+            self.manager.rename(old, new, persist=not self.defer_writes and old in self.store)
         except ValueError as e:
-            print(e)
-            return
+            raise CommandError(str(e))
 
-        # Renomeia arquivo se existir
-        if os.path.exists(old_path):
-            os.rename(old_path, new_path)
-
-        print(f"Deck renomeado de '{old}' para '{new}'.")
+        self._print(f"Deck renomeado de '{old}' para '{new}'.")
 
     # APAGAS APENAS AS CARTAS DO DECK
 
@@ -184,60 +398,147 @@ class CardCLI(cmd.Cmd):
         """clear_deck <nome> - remove todas as cartas do deck"""
         name = name.strip()
         if not name:
-            print("Uso: clear_deck <nome>")
-            return
+            raise CommandError("Uso: clear_deck <nome>")
 
         deck = self.manager.get(name)
-        if not deck:
-            print("Deck não encontrado.")
-            return
+        if deck is None:
+            raise CommandError("Deck não encontrado.")
 
-        deck.cards = []
-        print(f"Deck '{name}' esvaziado (todas as cartas removidas).")
+        self.manager.clear(name)
+        self._print(f"Deck '{name}' esvaziado (todas as cartas removidas).")
 
     # PROCURA CARTAS
 
     def do_search(self, text):
-        """search <texto> - busca cartas pelo nome"""
-        text = text.strip()
+        """search <texto> [--page N] - busca cartas pelo nome e efeito, das mais relevantes às menos"""
+        parts = text.split()
+        page = 1
+        if len(parts) >= 2 and parts[-2] == "--page":
+            try:
+                page = int(parts[-1])
+            except ValueError:
+                page = 0
+            if page < 1:
+                raise CommandError("Página inválida.")
+            parts = parts[:-2]
+
+        text = " ".join(parts)
         if not text:
-            print("Uso: search <texto>")
+            raise CommandError("Uso: search <texto> [--page N]")
+
+        total, results = self.db.search_ranked(text, SEARCH_PAGE, (page - 1) * SEARCH_PAGE)
+        if not total:
+            self._print("Nenhuma carta encontrada.")
+            suggestions = self.db.find_by_name(text, 5)
+            if suggestions:
+                self._print("Você quis dizer:")
+                for c, _ in suggestions:
+                    self._print(f"  {c.id}: {c.name}")
             return
 
-        results = self.db.search(text)
+        for c in results:
+            self._print(f"{c.id}: {c.name}")
+
+        pages = -(-total // SEARCH_PAGE)
+        if pages > 1:
+            self._print(f"Página {page} de {pages} ({total} cartas).")
+            if page < pages:
+                self._print(f"Próxima: search {text} --page {page + 1}")
+
+    # CONSULTA CARTAS POR ATRIBUTOS
+
+    def do_query(self, text):
+        """query <filtros> - busca cartas por atributos (ex.: query type=monster attribute=TREVAS level>=7 atk>=2500)"""
+        text = text.strip()
+        if not text:
+            raise CommandError(
+                "Uso: query <campo><operador><valor> ...\n"
+                "Campos: type, attribute, property, level, rank, link, scale, atk, def"
+            )
+
+        try:
+            results = self.db.query(text)
+        except ValueError as e:
+            raise CommandError(str(e))
+
         if not results:
-            print("Nenhuma carta encontrada.")
+            self._print("Nenhuma carta encontrada.")
             return
 
         for c in results[:50]:
-            print(f"{c.id}: {c.name}")
+            self._print(f"{c.id}: {c.name}")
+        if len(results) > 50:
+            self._print(f"... {len(results)} cartas no total.")
+
+    # ESTATÍSTICAS DAS CARTAS
+
+    def do_stats(self, text):
+        """stats [filtros] - estatísticas de ATK/DEF, níveis e atributos (ex.: stats type=monster)"""
+        try:
+            columns = self.db.columns
+            mask = columns.mask(text.strip())
+        except (ImportError, ValueError) as e:
+            raise CommandError(str(e))
+
+        total = int(mask.sum())
+        self._print(f"Cartas: {total}")
+        if not total:
+            return
+
+        for field, label in (("atk", "ATK"), ("def", "DEF")):
+            info = columns.describe(field, mask)
+            if info["count"]:
+                self._print(
+                    f"{label}: mín {info['min']} | máx {info['max']} | "
+                    f"média {info['mean']:.1f} | mediana {info['median']:.0f} ({info['count']} cartas)"
+                )
+
+        levels = columns.histogram("level", mask)
+        if levels:
+            self._print("Nível: " + ", ".join(f"{lvl}: {n}" for lvl, n in levels.items()))
+
+        for field, label in (("type", "Tipo"), ("attribute", "Atributo")):
+            counts = columns.count_by(field, mask)
+            self._print(f"{label}: " + ", ".join(f"{k}: {n}" for k, n in sorted(counts.items(), key=lambda kv: -kv[1])))
 
     # ADICIONA CARTA AO DECK
 
     def do_add_card(self, args):
-        """add_card <deck> <id> - adiciona carta ao deck"""
-        parts = args.split()
+        """add_card <deck> <id ou nome> - adiciona carta ao deck (o nome tolera erros de digitação)"""
+        parts = args.split(maxsplit=1)
         if len(parts) != 2:
-            print("Uso: add_card <deck> <id>")
-            return
+            raise CommandError("Uso: add_card <deck> <id ou nome>")
 
-        deck_name, cid = parts
-        try:
-            cid = int(cid)
-        except ValueError:
-            print("ID inválido.")
-            return
-
-        card = self.db.get(cid)
-        if not card:
-            print("Carta não encontrada.")
-            return
+        deck_name, ref = parts
+        by_name = not ref.lstrip("-").isdigit()
+        card = self._find_by_name(ref) if by_name else self.db.get(int(ref))
+        if card is None:
+            raise CommandError("Carta não encontrada.")
 
         try:
             self.manager.add(deck_name, card)
-            print(f"Carta {cid} adicionada ao deck '{deck_name}'.")
         except ValueError as e:
-            print(e)
+            raise CommandError(str(e))
+
+        if by_name:
+            self._print(f"Carta {card.id} — {card.name} adicionada ao deck '{deck_name}'.")
+        else:
+            self._print(f"Carta {card.id} adicionada ao deck '{deck_name}'.")
+
+    def _find_by_name(self, name):
+        """A carta de nome mais parecido, se for uma só; senão CommandError com as candidatas."""
+        matches = self.db.find_by_name(name, 5)
+        if not matches:
+            raise CommandError("Carta não encontrada.")
+
+        (card, cost), rest = matches[0], matches[1:]
+        missing = cost[0]
+        if not missing and (not rest or rest[0][1] != cost):
+            return card
+
+        lines = ["Mais de uma carta parecida; use o id:" if not missing else "Nenhuma carta com esse nome. Parecidas:"]
+        lines += [f"  {card.id}: {card.name}" for card, _ in matches]
+        raise CommandError("\n".join(lines))
 
     # REMOVE CARTA DO DECK
 
@@ -245,21 +546,228 @@ class CardCLI(cmd.Cmd):
         """remove_card <deck> <id> - remove carta do deck"""
         parts = args.split()
         if len(parts) != 2:
-            print("Uso: remove_card <deck> <id>")
-            return
+            raise CommandError("Uso: remove_card <deck> <id>")
 
         deck_name, cid = parts
         try:
             cid = int(cid)
         except ValueError:
-            print("ID inválido.")
+            raise CommandError("ID inválido.")
+
+        try:
+            removed = self.manager.remove(deck_name, cid)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if not removed:
+            raise CommandError(f"A carta {cid} não está no deck '{deck_name}'.")
+        self._print(f"Carta {cid} removida do deck '{deck_name}'.")
+
+    # CHANCE DA MÃO INICIAL
+
+    def do_odds(self, args):
+        """odds <deck> <condição> ... [--hand N] - chance de abrir com as cartas (ex.: odds Dragoes 4007,4064 2:5649)"""
+        self._odds(args, simulate=False)
+
+    def do_simulate(self, args):
+        """simulate <deck> <condição> ... [--hand N] [--trials N] [--seed N] - estima a chance sorteando mãos"""
+        self._odds(args, simulate=True)
+
+    def _odds(self, args, simulate):
+        # Cada condição: id, ids separados por vírgula (qualquer um) ou N:ids (N cópias entre eles)
+        try:
+            parts, options = split_options(args, {"--hand": 5, "--trials": 1_000_000, "--seed": None})
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if len(parts) < 2:
+            raise CommandError(
+                "Uso: odds <deck> <condição> ... [--hand N]\n"
+                "Condição: 4007 (uma cópia), 4007,4064 (qualquer uma) ou 2:4007,4064 (duas entre elas)"
+            )
+
+        name, needs = parts[0], " ".join(parts[1:])
+        with self.manager.locked(name) as deck:
+            if deck is None:
+                raise CommandError("Deck não encontrado.")
+            try:
+                if simulate:
+                    result = deck.simulate(needs, options["--hand"], options["--trials"], options["--seed"])
+                else:
+                    result = deck.odds(needs, options["--hand"])
+            except (ImportError, ValueError) as e:
+                raise CommandError(str(e))
+            size = deck.size("main")
+
+        self._print(f"Main Deck com {size} cartas, mão de {options['--hand']}.")
+        if isinstance(result, float):
+            self._print(f"Chance: {result:.2%} (exata)")
+        else:
+            self._print(
+                f"Chance: {result.probability:.2%} "
+                f"(IC 95%: {result.low:.2%} a {result.high:.2%}, {result.trials} mãos)"
+            )
+
+    # MELHORES QUANTIDADES DE CÓPIAS
+
+    def do_optimize(self, args):
+        """optimize <deck> <condição> ... --flex id:mín-máx,... - quantidades de cópias com maior chance de abrir com a condição"""
+        try:
+            parts, options = split_options(
+                args,
+                {"--flex": "", "--hand": 5, "--top": 5, "--trials": 100_000, "--workers": None, "--seed": None},
+                flags=("--simulate",),
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if len(parts) < 2 or not options["--flex"]:
+            raise CommandError(
+                "Uso: optimize <deck> <condição> ... --flex id:mín-máx,... [--hand N] [--top N]\n"
+                "Opções da simulação: --simulate --trials N --workers N --seed N"
+            )
+
+        name, needs = parts[0], " ".join(parts[1:])
+        with self.manager.locked(name) as deck:
+            if deck is None:
+                raise CommandError("Deck não encontrado.")
+            snapshot = Deck(deck.name)
+            for card_id, amount in deck.zones["main"].items():
+                snapshot.add_card(card_id, amount, "main")
+
+        # A simulação roda fora da trava do deck
+        try:
+            best = ratios.optimize(
+                snapshot, needs, options["--flex"], options["--hand"], options["--top"],
+                options["--simulate"], options["--trials"], options["--workers"], options["--seed"],
+            )
+        except (ImportError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self._print(f"Melhores variantes (mão de {options['--hand']}):")
+        for position, variant in enumerate(best, 1):
+            copies = ", ".join(
+                f"{n}x {getattr(self.db.get(card_id), 'name', card_id)}" for card_id, n in variant.copies.items()
+            )
+            self._print(f"{position}. {variant.probability:.2%} — {variant.size} cartas: {copies}")
+
+    # LEGALIDADE
+
+    def do_validate(self, name):
+        """validate [nome] - confere tamanhos, cópias e lista de banidas (sem nome: todos os decks)"""
+        name = name.strip()
+        if name:
+            try:
+                report = self.manager.validate(name)
+            except ValueError as e:
+                raise CommandError(str(e))
+            if not report.problems:
+                self._print(f"Deck '{name}' é válido.")
+                return
+            self._print(f"Deck '{name}' tem {len(report.problems)} problema(s):")
+            for problem in report.problems:
+                self._print("•", problem.message)
             return
 
+        # Todos os decks, um de cada vez; só os inválidos são detalhados
+        total = valid = 0
+        for report in self.manager.validate_all():
+            total += 1
+            if not report.problems:
+                valid += 1
+                continue
+            self._print(f"{report.name}:")
+            for problem in report.problems:
+                self._print("  •", problem.message)
+        self._print(f"{valid} de {total} deck(s) válidos.")
+
+    # DECKS QUE USAM UMA CARTA
+
+    def do_where_used(self, cid):
+        """where_used <id> - lista os decks que usam a carta"""
+        cid = cid.strip()
+        if not cid:
+            raise CommandError("Uso: where_used <id>")
+
         try:
-            self.manager.remove(deck_name, cid)
-            print(f"Carta {cid} removida do deck '{deck_name}'.")
+            cid = int(cid)
+        except ValueError:
+            raise CommandError("ID inválido.")
+
+        names = self.manager.decks_containing(cid)
+        if not names:
+            self._print(f"Nenhum deck usa a carta {cid}.")
+            return
+
+        self._print(f"Carta {cid} usada em {len(names)} deck(s):")
+        for name in names:
+            self._print("•", name)
+
+    # DECKS PARECIDOS
+
+    def do_similar_decks(self, args):
+        """similar_decks <nome> [--top N] - decks salvos mais parecidos, com a similaridade estimada"""
+        try:
+            parts, options = split_options(args, {"--top": 10})
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if len(parts) != 1:
+            raise CommandError("Uso: similar_decks <nome> [--top N]")
+
+        name = parts[0]
+        with self.manager.locked(name) as deck:
+            if deck is None:
+                raise CommandError("Deck não encontrado.")
+            similar = self.manager.similarity.similar(deck, options["--top"])
+
+        if not similar:
+            self._print(f"Nenhum deck salvo parecido com '{name}'.")
+            return
+
+        self._print(f"Decks parecidos com '{name}' (Jaccard estimado):")
+        for other in similar:
+            self._print(f"• {other.name} — {other.jaccard:.0%}")
+
+    # CARTAS JOGADAS JUNTO
+
+    def do_related(self, args):
+        """related <id ou nome> [--top N] - cartas mais jogadas junto com ela nos decks salvos"""
+        try:
+            parts, options = split_options(args, {"--top": 10})
         except ValueError as e:
-            print(e)
+            raise CommandError(str(e))
+
+        if not parts:
+            raise CommandError("Uso: related <id ou nome> [--top N]")
+
+        ref = " ".join(parts)
+        if ref.lstrip("-").isdigit():
+            card_id = int(ref)
+        else:
+            card_id = self._find_by_name(ref).id
+
+        relevance = self.manager.relevance
+        stats = relevance.stats(card_id)
+        if not stats.decks:
+            self._print(f"Nenhum deck salvo usa a carta {card_id}.")
+            return
+
+        self._print(
+            f"{self._card_label(card_id)}: em {stats.decks} de {len(relevance)} deck(s) salvos "
+            f"({stats.inclusion:.0%}), {stats.copies:.1f} cópia(s) em média."
+        )
+        partners = relevance.played_with(card_id, options["--top"])
+        if not partners:
+            self._print("Nenhuma outra carta nesses decks.")
+            return
+
+        self._print("Jogadas junto:")
+        for partner in partners:
+            self._print(f"• {self._card_label(partner.card_id)} — {partner.decks} deck(s) ({partner.share:.0%})")
+
+    def _card_label(self, card_id):
+        card = self.db.get(card_id)
+        return f"{card_id} {card.name}" if card is not None else str(card_id)
 
     # SALVA O DECK
 
@@ -267,28 +775,126 @@ class CardCLI(cmd.Cmd):
         """save_deck <nome> - salva o deck"""
         name = name.strip()
         if not name:
-            print("Uso: save_deck <nome>")
-            return
+            raise CommandError("Uso: save_deck <nome>")
 
         deck = self.manager.get(name)
-        if not deck:
-            print("Deck não encontrado.")
-            return
+        if deck is None:
+            raise CommandError("Deck não encontrado.")
 
-        save_deck(deck)
-        print(f"Deck '{name}' salvo")
+        self._write([name])
+        self._print(f"Deck '{name}' salvo")
 
     # SAI DO PROGRAMA
 
     def do_exit(self, _):
         """exit - sai do programa"""
-        print("Saindo...")
+        self._print("Saindo...")
         return True
 
 
-def main():
-    CardCLI().cmdloop()
+def split_options(text, options, flags=()):
+    """Separa de ``text`` as ``--opção valor`` de ``options`` ({nome: padrão}) e as ``--flag``.
+
+    Devolve (demais palavras, valores). Os valores viram int, a menos que o
+    padrão seja texto; ValueError se algum não for número.
+    """
+    values = dict(options, **dict.fromkeys(flags, False))
+    parts = []
+    tokens = iter(text.split())
+    for token in tokens:
+        if token in flags:
+            values[token] = True
+        elif token in options:
+            value = next(tokens, "")
+            if isinstance(options[token], str):
+                values[token] = value
+                continue
+            try:
+                values[token] = int(value)
+            except ValueError:
+                raise ValueError(f"Valor inválido para {token}.")
+        else:
+            parts.append(token)
+    return parts, values
+
+
+def run_batch(cli, commands):
+    """Executa os comandos em sequência e devolve um resultado por comando.
+
+    Cada resultado tem o comando, as linhas que ele imprimiu e ``ok``;
+    comandos desconhecidos, que falham (CommandError) ou que levantam outra
+    exceção vêm com ``ok`` falso e ``error``. Linhas vazias e comentários
+    (#) são ignorados.
+    """
+    results = []
+    for line in commands:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        result = {"command": line, "ok": True}
+        buffer = io.StringIO()
+        stop = False
+
+        name = cli.parseline(line)[0]
+        if not name or not hasattr(cli, "do_" + name):
+            result["ok"] = False
+            result["error"] = f"Comando desconhecido: {line}"
+        else:
+            try:
+                stop = cli.session(buffer).execute(line)
+            except Exception as e:  # noqa: BLE001 - CommandError ou falha inesperada, vira "error"
+                result["ok"] = False
+                result["error"] = str(e)
+
+        result["output"] = buffer.getvalue().splitlines()
+        results.append(result)
+        if stop:
+            break
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de Decks Yu-Gi-Oh")
+    parser.add_argument(
+        "-c", "--command", action="append", dest="commands", metavar="COMANDO",
+        help="executa o comando e sai (pode ser repetido)",
+    )
+    parser.add_argument(
+        "-f", "--file", metavar="ARQUIVO",
+        help="executa os comandos do arquivo, um por linha ('-' lê da entrada padrão), antes dos -c",
+    )
+    parser.add_argument("--text", action="store_true", help="imprime a saída dos comandos em vez de JSON")
+    args = parser.parse_args(argv)
+
+    if not args.commands and not args.file:
+        CardCLI().cmdloop()
+        return 0
+
+    commands = []
+    if args.file == "-":
+        commands.extend(sys.stdin)
+    elif args.file:
+        with open(args.file, encoding="utf-8") as f:
+            commands.extend(f)
+    commands.extend(args.commands or [])
+
+    # Uma carga da base para todos os comandos; a saída sai toda de uma vez no final
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = CardCLI(defer_writes=True)
+    try:
+        results = run_batch(cli, commands)
+    finally:
+        cli.close()
+
+    if args.text:
+        out = "".join(line + "\n" for result in results for line in result["output"])
+    else:
+        out = "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results)
+    sys.stdout.write(out)
+    return 0 if all(result["ok"] for result in results) else 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
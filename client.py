@@ -0,0 +1,103 @@
+"""Cliente do servidor local (server.py).
+
+Repassa comandos da CLI ao servidor, que já tem a base carregada, e
+imprime a saída. Usa só a biblioteca padrão, para abrir rápido.
+
+    python client.py -c "search dragão" -c "show_deck Dragoes"
+    python client.py -f comandos.txt --json
+    python client.py                     # modo interativo
+"""
+import argparse
+import json
+import socket
+import sys
+
+DEFAULT_SOCKET = "data/yugidb.sock"
+DEFAULT_HOST = "127.0.0.1"
+
+
+class Client:
+    def __init__(self, path=DEFAULT_SOCKET, host=DEFAULT_HOST, port=None):
+        if port is None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection((host, port))
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile("rwb")
+
+    def request(self, request):
+        """Envia uma requisição e devolve a resposta (dicionários)."""
+        self.file.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("O servidor fechou a conexão.")
+        return json.loads(line)
+
+    def command(self, text):
+        return self.request({"command": text})
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def _print_result(result, as_json):
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    for line in result.get("output", ()):
+        print(line)
+    if "error" in result:
+        print(result["error"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-c", "--command", action="append", dest="commands", metavar="COMANDO")
+    parser.add_argument("-f", "--file", metavar="ARQUIVO", help="comandos do arquivo, um por linha, antes dos -c")
+    parser.add_argument("--json", action="store_true", help="imprime as respostas em JSON lines")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--port", type=int, help="conecta por TCP nesta porta")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    args = parser.parse_args(argv)
+
+    try:
+        client = Client(args.socket, args.host, args.port)
+    except OSError as e:
+        print(f"Não foi possível conectar ao servidor: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        if not args.commands and not args.file:
+            # Interativo: uma linha por comando, até exit ou fim da entrada
+            for line in sys.stdin:
+                line = line.strip()
+                if line in ("exit", "quit"):
+                    break
+                if line:
+                    _print_result(client.command(line), args.json)
+            return 0
+
+        commands = []
+        if args.file:
+            with open(args.file, encoding="utf-8") as f:
+                commands.extend(f)
+        commands.extend(args.commands or [])
+
+        ok = True
+        for line in commands:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            result = client.command(line)
+            ok = ok and result.get("ok", False)
+            _print_result(result, args.json)
+        return 0 if ok else 1
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
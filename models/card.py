@@ -1,14 +1,75 @@
+from sys import intern
+
+
+def _intern(value):
+    return intern(value) if isinstance(value, str) else value
+
+
+def _intern_list(values):
+    return [_intern(v) for v in values]
+
+
+def _intern_tuple(values):
+    # A tupla vazia é um objeto único; a maioria das cartas não tem setas
+    return tuple(_intern(v) for v in values) if values else ()
+
+
 class Card:
+    # Sem __dict__ por instância: cada campo ocupa só um ponteiro. Valores
+    # que se repetem entre milhares de cartas (tipo, atributo, propriedades,
+    # setas de link) são internados e compartilhados.
+    __slots__ = (
+        "id", "type", "name", "old_name", "english_attribute", "attribute",
+        "effect", "pend_effect", "notes", "level", "rank", "link_rating",
+        "link_arrows", "pend_scale", "atk", "def_", "properties",
+        "english_property", "localized_property",
+    )
+
     def __init__(self, data):
         self.id = data["id"]
-        self.type = data.get("type")
+        self.type = _intern(data.get("type"))
         self.name = data.get("name")
-        self.attribute = data.get("localizedAttribute")
+        self.old_name = data.get("oldName")
+        self.english_attribute = _intern(data.get("englishAttribute"))
+        self.attribute = _intern(data.get("localizedAttribute"))
         self.effect = data.get("effectText")
+        self.pend_effect = data.get("pendEffect")
+        self.notes = data.get("notes")
         self.level = data.get("level")
+        self.rank = data.get("rank")
+        self.link_rating = data.get("linkRating")
+        self.link_arrows = _intern_tuple(data.get("linkArrows"))
+        self.pend_scale = data.get("pendScale")
         self.atk = data.get("atk")
         self.def_ = data.get("def")
-        self.properties = data.get("properties", [])
+        self.properties = _intern_list(data.get("properties", []))
+        self.english_property = _intern(data.get("englishProperty"))
+        self.localized_property = _intern(data.get("localizedProperty"))
+
+    def to_dict(self):
+        """Reconstrói o registro no formato do JSON de origem (sem campos ausentes)."""
+        data = {
+            "id": self.id,
+            "type": self.type,
+            "name": self.name,
+            "oldName": self.old_name,
+            "englishAttribute": self.english_attribute,
+            "localizedAttribute": self.attribute,
+            "notes": self.notes,
+            "effectText": self.effect,
+            "pendEffect": self.pend_effect,
+            "pendScale": self.pend_scale,
+            "level": self.level,
+            "rank": self.rank,
+            "linkRating": self.link_rating,
+            "linkArrows": list(self.link_arrows),
+            "atk": self.atk,
+            "def": self.def_,
+            "properties": self.properties,
+            "englishProperty": self.english_property,
+            "localizedProperty": self.localized_property,
+        }
+        return {key: value for key, value in data.items() if value is not None and value != []}
 
     def __repr__(self):
         return f"{self.name} (ID: {self.id})"
@@ -0,0 +1,296 @@
+"""Catálogo empacotado: todas as cartas de uma pasta em um único arquivo.
+
+Formato do arquivo (``database/<lang>.catalog``):
+
+- cabeçalho fixo: assinatura, offset e tamanho dos metadados;
+- região de registros: um array JSON com uma carta por elemento;
+- metadados: JSON com o índice ``[id, offset, tamanho]`` de cada registro
+  e o manifesto dos arquivos de origem (tamanho, mtime e registros gerados).
+
+Como a região de registros é um array JSON válido, o carregamento completo
+é um único ``json.loads``; o índice permite ler uma carta isolada. O
+manifesto permite atualizar o catálogo relendo só os arquivos alterados.
+"""
+import json
+import mmap
+import os
+import stat
+import struct
+import sys
+import tempfile
+import uuid
+from collections import namedtuple
+from .loader import load_files
+
+MAGIC = b"YGDBCAT2"
+HEADER = struct.Struct("<8sQQ")  # assinatura, offset e tamanho dos metadados
+EXTENSION = ".catalog"
+
+# Resultado de sync_catalog: carimbo anterior e atual do catálogo e os
+# registros que saíram e entraram (para atualizar índices derivados).
+CatalogUpdate = namedtuple("CatalogUpdate", "previous stamp removed added")
+
+
+def text_update(update):
+    """O mesmo CatalogUpdate só com id, nome e efeito dos registros (o que o índice usa)."""
+    def texts(records):
+        return [{"id": d["id"], "name": d.get("name"), "effectText": d.get("effectText")} for d in records]
+    return update._replace(removed=texts(update.removed), added=texts(update.added))
+
+
+def catalog_path(folder_path):
+    """database/en -> database/en.catalog"""
+    return os.path.normpath(folder_path) + EXTENSION
+
+
+def scan_folder(folder_path):
+    """Manifesto atual da pasta: nome do arquivo -> (tamanho, mtime em ns)."""
+    files = {}
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                st = entry.stat()
+                files[entry.name] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_catalog(records, path, files=None, stamp=None):
+    """Grava o catálogo (via arquivo temporário) e devolve o carimbo gerado.
+
+    ``records`` é uma sequência de ``(id, JSON codificado)``; ``files`` é o
+    manifesto ``nome -> [tamanho, mtime, primeiro registro, quantidade]``.
+    """
+    stamp = stamp or uuid.uuid4().hex
+    entries = []
+    # Nome único: outro processo sincronizando o mesmo catálogo não pisa neste
+    fd, tmp_path = temp_file(path)
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(HEADER.pack(MAGIC, 0, 0))
+            out.write(b"[")
+            for i, (card_id, raw) in enumerate(records):
+                if i:
+                    out.write(b",")
+                entries.append([card_id, out.tell(), len(raw)])
+                out.write(raw)
+            out.write(b"]")
+
+            meta = {"stamp": stamp, "cards": entries, "files": files or {}}
+            meta = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            meta_offset = out.tell()
+            out.write(meta)
+
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, meta_offset, len(meta)))
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        discard(tmp_path)
+        raise
+    return stamp
+
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _umask()
+
+
+def temp_file(path):
+    """Arquivo temporário exclusivo ao lado de ``path``: (descritor, caminho).
+
+    O mkstemp cria o arquivo só para o dono (0600) e o ``os.replace``
+    mantém isso; aqui ele recebe as permissões de ``path``, se já existe,
+    ou as de um arquivo novo (0666 menos a umask).
+    """
+    folder, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=folder or ".")
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = 0o666 & ~_UMASK
+    try:
+        os.chmod(tmp_path, mode)
+    except BaseException:
+        os.close(fd)
+        discard(tmp_path)
+        raise
+    return fd, tmp_path
+
+
+def discard(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def read_header(buf):
+    magic, meta_offset, meta_length = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Arquivo de catálogo inválido.")
+    return meta_offset, meta_length
+
+
+def read_meta(buf):
+    """Metadados (carimbo, índice e manifesto) do catálogo em ``buf``."""
+    meta_offset, meta_length = read_header(buf)
+    return json.loads(bytes(buf[meta_offset:meta_offset + meta_length]))
+
+
+def read_index(buf):
+    """Devolve a lista ``[id, offset, tamanho]`` do catálogo em ``buf``."""
+    return read_meta(buf)["cards"]
+
+
+def read_catalog(path):
+    """Lê o catálogo inteiro e devolve a lista de registros."""
+    with open(path, "rb") as f:
+        buf = f.read()
+
+    meta_offset, _ = read_header(buf)
+    return json.loads(buf[HEADER.size:meta_offset])
+
+
+def _read_existing_meta(path):
+    """Metadados de um catálogo existente, ou None se não houver um válido."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            meta_offset, meta_length = read_header(header)
+            f.seek(meta_offset)
+            return json.loads(f.read(meta_length))
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def sync_catalog(folder_path, path=None, workers=None):
+    """Atualiza o catálogo para refletir a pasta, relendo só o que mudou.
+
+    Compara o manifesto gravado com o tamanho e o mtime atuais de cada
+    arquivo: registros de arquivos inalterados são copiados do catálogo
+    antigo sem decodificar o JSON; arquivos novos ou alterados são lidos
+    de novo (em paralelo com ``workers`` > 1). Devolve um CatalogUpdate
+    com as diferenças.
+    """
+    path = path or catalog_path(folder_path)
+    current = scan_folder(folder_path)
+    meta = _read_existing_meta(path)
+    old_files = meta["files"] if meta else {}
+
+    if meta and old_files.keys() == current.keys() and all(
+        tuple(old_files[name][:2]) == signature for name, signature in current.items()
+    ):
+        return CatalogUpdate(meta["stamp"], meta["stamp"], [], [])
+
+    buf = b""
+    if meta:
+        with open(path, "rb") as f:
+            buf = f.read()
+
+    def old_records(name):
+        first, count = old_files[name][2:]
+        return meta["cards"][first:first + count]
+
+    def unchanged(name):
+        old = old_files.get(name)
+        return old is not None and (old[0], old[1]) == current[name]
+
+    names = sorted(current)
+    changed = [name for name in names if not unchanged(name)]
+    parsed = dict(zip(changed, load_files(folder_path, changed, workers)))
+
+    records = []
+    files = {}
+    removed = []
+    added = []
+
+    for name in names:
+        size, mtime = current[name]
+        first = len(records)
+
+        if name not in parsed:
+            for card_id, offset, length in old_records(name):
+                records.append((card_id, buf[offset:offset + length]))
+        else:
+            if name in old_files:
+                removed.extend(json.loads(buf[o:o + n]) for _, o, n in old_records(name))
+            for data in parsed[name]:
+                records.append((data["id"], encode(data)))
+                added.append(data)
+
+        files[name] = [size, mtime, first, len(records) - first]
+
+    for name in old_files.keys() - current.keys():
+        removed.extend(json.loads(buf[o:o + n]) for _, o, n in old_records(name))
+
+    stamp = write_catalog(records, path, files)
+    return CatalogUpdate(meta["stamp"] if meta else None, stamp, removed, added)
+
+
+def build_catalog(folder_path, path=None, workers=None):
+    """Compila a pasta inteira em um catálogo novo e devolve o caminho gerado."""
+    path = path or catalog_path(folder_path)
+    if os.path.exists(path):
+        os.remove(path)
+    sync_catalog(folder_path, path, workers)
+    return path
+
+
+class CatalogReader:
+    """Acesso aleatório a um catálogo mapeado em memória.
+
+    Mantém apenas o índice id -> (offset, tamanho); cada carta é decodificada
+    do mapeamento somente quando pedida.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offsets = {
+            card_id: (offset, length)
+            for card_id, offset, length in read_index(self._map)
+        }
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, card_id):
+        return card_id in self.offsets
+
+    def ids(self):
+        return self.offsets.keys()
+
+    def record(self, card_id):
+        """Decodifica o registro de uma carta (KeyError se não existir)."""
+        offset, length = self.offsets[card_id]
+        return json.loads(self._map[offset:offset + length])
+
+    def records(self):
+        """Decodifica todos os registros de uma vez, sem guardá-los."""
+        meta_offset, _ = read_header(self._map)
+        return json.loads(self._map[HEADER.size:meta_offset])
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def main(argv=None):
+    folders = (argv if argv is not None else sys.argv[1:]) or ["database/en", "database/pt"]
+    for folder in folders:
+        path = build_catalog(folder, workers=os.cpu_count())
+        print(f"Catálogo gerado: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Representação colunar das cartas para estatísticas (requer NumPy).
+
+Cada campo numérico vira um array ``int32`` e os campos categóricos são
+codificados por dicionário (array de códigos + lista de rótulos). As
+propriedades viram uma matriz booleana carta x propriedade. Filtros são
+máscaras vetorizadas sobre os arrays, sem percorrer objetos Card.
+"""
+import operator
+from . import optional
+from .query import ALTERNATES, CATEGORICAL, NUMERIC, parse_query
+from .search_index import fold
+
+np = None  # importado por require_numpy, no primeiro build (dependência opcional)
+
+# Valor usado nas colunas numéricas quando a carta não tem o campo.
+# ATK/DEF "?" aparecem como -1 no JSON e também são tratados como ausentes.
+MISSING = -(2 ** 31)
+
+_COMPARE = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+def require_numpy():
+    global np
+    np = optional.require_numpy("As estatísticas colunares precisam do NumPy (pip install numpy).")
+    return np
+
+
+class CardColumns:
+    def __init__(self, ids, numeric, codes, labels, properties, property_labels, alternates=None):
+        self.ids = ids
+        self.numeric = numeric  # campo -> array int32
+        self.codes = codes  # campo categórico -> array de códigos
+        self.labels = labels  # campo categórico -> rótulos na ordem dos códigos
+        self.properties = properties  # matriz booleana (cartas x propriedades)
+        self.property_labels = property_labels
+        self.alternates = alternates or {}  # campo -> (códigos, rótulos) da outra grafia (ALTERNATES)
+
+    @classmethod
+    def build(cls, cards):
+        require_numpy()
+        cards = list(cards)
+
+        ids = np.fromiter((c.id for c in cards), dtype=np.int64, count=len(cards))
+
+        numeric = {}
+        for field, attr in NUMERIC.items():
+            values = (getattr(c, attr) for c in cards)
+            column = np.fromiter(
+                (MISSING if v is None else v for v in values), dtype=np.int32, count=len(cards)
+            )
+            if field in ("atk", "def"):
+                column[column < 0] = MISSING
+            numeric[field] = column
+
+        codes = {}
+        labels = {}
+        for field, attr in CATEGORICAL.items():
+            codes[field], labels[field] = _encode([getattr(c, attr) for c in cards])
+        alternates = {field: _encode([getattr(c, attr, None) for c in cards]) for field, attr in ALTERNATES.items()}
+
+        property_labels = sorted({p for c in cards for p in c.properties or ()})
+        position = {label: i for i, label in enumerate(property_labels)}
+        properties = np.zeros((len(cards), len(property_labels)), dtype=bool)
+        for row, card in enumerate(cards):
+            for prop in card.properties or ():
+                properties[row, position[prop]] = True
+
+        return cls(ids, numeric, codes, labels, properties, property_labels, alternates)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, field):
+        return self.numeric[field]
+
+    # FILTROS
+
+    def mask(self, text=""):
+        """Máscara booleana das cartas que satisfazem os filtros de ``text``.
+
+        Usa a mesma sintaxe de ``CardDatabase.query``.
+        """
+        result = np.ones(len(self), dtype=bool)
+        for field, op, value in parse_query(text):
+            result &= self._condition_mask(field, op, value)
+        return result
+
+    def _condition_mask(self, field, op, value):
+        if field in self.numeric:
+            column = self.numeric[field]
+            return (column != MISSING) & _COMPARE[op](column, value)
+
+        if field == "property":
+            matches = [i for i, label in enumerate(self.property_labels) if fold(label) == value]
+            found = self.properties[:, matches].any(axis=1)
+        else:
+            found = _matching(self.codes[field], self.labels[field], value)
+            if field in self.alternates:
+                found |= _matching(*self.alternates[field], value)
+
+        return ~found if op == "!=" else found
+
+    # AGREGAÇÕES
+
+    def describe(self, field, mask=None):
+        """Contagem, mínimo, máximo, média e mediana de um campo numérico."""
+        column = self.numeric[field]
+        selected = column != MISSING
+        if mask is not None:
+            selected &= mask
+        values = column[selected]
+
+        if not len(values):
+            return {"count": 0, "min": None, "max": None, "mean": None, "median": None}
+        return {
+            "count": int(len(values)),
+            "min": int(values.min()),
+            "max": int(values.max()),
+            "mean": float(values.mean()),
+            "median": float(np.median(values)),
+        }
+
+    def histogram(self, field, mask=None):
+        """Quantidade de cartas por valor de um campo numérico."""
+        column = self.numeric[field]
+        selected = column != MISSING
+        if mask is not None:
+            selected &= mask
+        values, counts = np.unique(column[selected], return_counts=True)
+        return {int(v): int(n) for v, n in zip(values, counts)}
+
+    def count_by(self, field, mask=None):
+        """Quantidade de cartas por rótulo de um campo categórico ou de property."""
+        if field == "property":
+            rows = self.properties if mask is None else self.properties[mask]
+            counts = rows.sum(axis=0)
+            return {label: int(n) for label, n in zip(self.property_labels, counts) if n}
+
+        codes = self.codes[field] if mask is None else self.codes[field][mask]
+        counts = np.bincount(codes, minlength=len(self.labels[field]))
+        return {label: int(n) for label, n in zip(self.labels[field], counts) if n and label is not None}
+
+
+def _matching(codes, labels, value):
+    matches = [i for i, label in enumerate(labels) if label is not None and fold(label) == value]
+    return np.isin(codes, matches)
+
+
+def _encode(values):
+    """Codificação por dicionário: (array de códigos, rótulos)."""
+    labels = sorted({v for v in values if v is not None})
+    labels.append(None)  # último código: valor ausente
+    position = {label: i for i, label in enumerate(labels)}
+    codes = np.fromiter((position[v] for v in values), dtype=np.int16, count=len(values))
+    return codes, labels
@@ -1,37 +1,238 @@
-import json
 import os
+from collections import OrderedDict
+from collections.abc import Mapping
 from .card import Card
+from . import catalog
+from .columns import CardColumns
+from .fuzzy import NameMatcher
+from .loader import load_files
+from .query import QueryIndex, parse_query
+from .search_index import DEFAULT_LIMIT, SearchIndex, contains, index_path, needs_substring, sync_index
+
+
+class LazyCards(Mapping):
+    """Mapa id -> Card que materializa as cartas sob demanda.
+
+    As cartas são lidas do catálogo mapeado em memória e mantidas em um
+    cache LRU limitado a ``cache_size`` entradas.
+    """
+
+    def __init__(self, reader, cache_size=256):
+        self.reader = reader
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def __getitem__(self, card_id):
+        card = self._cache.get(card_id)
+        if card is not None:
+            self._cache.move_to_end(card_id)
+            return card
+
+        card = Card(self.reader.record(card_id))
+        self._remember(card)
+        return card
+
+    def __contains__(self, card_id):
+        return card_id in self.reader
+
+    def __iter__(self):
+        return iter(self.reader.ids())
+
+    def __len__(self):
+        return len(self.reader)
+
+    def materialize(self, data):
+        """Devolve o Card de um registro já decodificado, passando pelo cache."""
+        card = self._cache.get(data["id"])
+        if card is None:
+            card = Card(data)
+            self._remember(card)
+        return card
+
+    def _remember(self, card):
+        self._cache[card.id] = card
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
 
 class CardDatabase:
-    def __init__(self, path="database/pt"):
+    def __init__(self, path="database/pt", use_catalog=True, lazy=False, cache_size=256, workers=None):
+        self.path = path
+        self.lazy = lazy
+        self.workers = workers  # processos para ler a pasta (None: leitura serial)
+        self._reader = None
+        self._index = None
+        self._query_index = None
+        self._names = None
+        self._columns = None
+        self._update = None  # diferenças aplicadas ao catálogo nesta carga
         self.cards = {}
-        self.load_from_folder(path)
 
-    def load_from_folder(self, folder_path):
-        for filename in os.listdir(folder_path):
-            if filename.endswith(".json"):
-                full_path = os.path.join(folder_path, filename)
+        if not (use_catalog or lazy):
+            self.load_from_folder(path)
+            return
 
-                with open(full_path, encoding="utf-8") as f:
-                    data = json.load(f)
+        # O catálogo (database/<lang>.catalog) é mantido em sincronia com a
+        # pasta: só os arquivos novos, alterados ou removidos são relidos.
+        path_catalog = catalog.catalog_path(path)
+        try:
+            self._update = catalog.sync_catalog(path, path_catalog, workers)
+        except OSError:
+            if lazy:
+                raise
+            # Sem como gravar ao lado da pasta (permissão, somente leitura,
+            # disco cheio): lê direto dos JSON
+            self.load_from_folder(path)
+            return
 
-                    # Se o arquivo contém 1 carta
-                    if isinstance(data, dict):
-                        card = Card(data)
-                        self.cards[card.id] = card
+        if lazy:
+            # Modo preguiçoso: só o índice do catálogo fica em memória
+            self._reader = catalog.CatalogReader(path_catalog)
+            self.cards = LazyCards(self._reader, cache_size)
+        else:
+            self.load_from_catalog(path_catalog)
 
-                    # Se contém várias cartas
-                    elif isinstance(data, list):
-                        for entry in data:
-                            card = Card(entry)
-                            self.cards[card.id] = card
+        # Se a pasta mudou e já existe um índice gravado, atualiza-o agora,
+        # enquanto as diferenças ainda correspondem ao índice salvo
+        if self._update.removed or self._update.added:
+            if os.path.exists(index_path(path)):
+                self._index = self._load_index()
+        # Daqui em diante só o carimbo importa: sem índice gravado ele será
+        # montado do zero, então os registros alterados não ficam em memória
+        self._update = self._update._replace(previous=None, removed=[], added=[])
+
+    def load_from_folder(self, folder_path):
+        names = sorted(f for f in os.listdir(folder_path) if f.endswith(".json"))
+
+        # Cada arquivo pode conter 1 carta ou uma lista delas
+        for records in load_files(folder_path, names, self.workers):
+            for entry in records:
+                card = Card(entry)
+                self.cards[card.id] = card
+
+    def load_from_catalog(self, catalog_path):
+        for entry in catalog.read_catalog(catalog_path):
+            card = Card(entry)
+            self.cards[card.id] = card
 
     def get(self, card_id):
         return self.cards.get(card_id)
 
+    @property
+    def index(self):
+        """Índice invertido de nome e efeito, carregado na primeira busca."""
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def _load_index(self):
+        if self._update is None:
+            # Sem catálogo não há carimbo para validar um índice gravado
+            return SearchIndex.build(self._text_records())
+
+        return sync_index(index_path(self.path), self._update, self._text_records)
+
+    def _text_records(self):
+        if self.lazy:
+            return [(d["id"], d.get("name"), d.get("effectText")) for d in self._reader.records()]
+        return [(card.id, card.name, card.effect) for card in self.cards.values()]
+
     def search(self, text):
-        text = text.lower()
-        return [
-            card for card in self.cards.values()
-            if (card.name and text in card.name.lower()) or (card.effect and text in card.effect.lower())
-        ]
+        """Cartas cujo nome ou efeito contém todos os termos do texto.
+
+        Cada termo casa com qualquer palavra que o contenha (``drag`` ->
+        Dragon, Hydragon), sem diferenciar maiúsculas nem acentos. Consultas
+        sem termos indexáveis (só pontuação) caem na busca por substring; com
+        pontuação ou termos curtos, os candidatos do índice ainda precisam
+        conter o texto inteiro (``needs_substring``).
+        """
+        ids = self.index.search(text, keep=self._substring_filter(text))
+        if ids is None:
+            return self._scan(text)
+        return [self.cards[card_id] for card_id in sorted(ids)]
+
+    def search_ranked(self, text, limit=DEFAULT_LIMIT, offset=0):
+        """Busca ordenada por relevância, em páginas: (total, cartas da página).
+
+        Casa as mesmas cartas que ``search``; só as da página são lidas.
+        """
+        result = self.index.ranked(text, limit, offset, self._substring_filter(text))
+        if result is None:
+            matches = self._scan(text)
+            return len(matches), matches[offset:offset + limit]
+        total, ids = result
+        return total, [self.cards[card_id] for card_id in ids]
+
+    def _substring_filter(self, text):
+        # id -> se nome ou efeito contém o texto; None se os termos bastam
+        if not needs_substring(text):
+            return None
+        has_text = contains(text)
+
+        def keep(card_id):
+            if self.lazy:
+                data = self._reader.record(card_id)
+                return has_text(data.get("name")) or has_text(data.get("effectText"))
+            card = self.cards[card_id]
+            return has_text(card.name) or has_text(card.effect)
+        return keep
+
+    def _scan(self, text):
+        has_text = contains(text)
+
+        if self.lazy:
+            # Filtra os registros crus; só os acertos viram Card
+            return [
+                self.cards.materialize(data) for data in self._reader.records()
+                if has_text(data.get("name")) or has_text(data.get("effectText"))
+            ]
+
+        return [card for card in self.cards.values() if has_text(card.name) or has_text(card.effect)]
+
+    @property
+    def names(self):
+        """Índice dos nomes para a busca aproximada, montado no primeiro uso.
+
+        Usa os nomes já normalizados do índice de busca, sem ler as cartas.
+        """
+        if self._names is None:
+            self._names = NameMatcher.build((card_id, name) for card_id, (name, _) in self.index.docs.items())
+        return self._names
+
+    def find_by_name(self, text, limit=10):
+        """Cartas com o nome mais parecido com ``text`` (tolera erros): [(carta, custo)]."""
+        return [(self.cards[card_id], cost) for card_id, cost in self.names.match(text, limit)]
+
+    @property
+    def query_index(self):
+        """Índices secundários por atributo, montados na primeira consulta."""
+        if self._query_index is None:
+            self._query_index = QueryIndex.build(self._all_cards())
+        return self._query_index
+
+    @property
+    def columns(self):
+        """Representação colunar (NumPy) para estatísticas, montada no primeiro uso."""
+        if self._columns is None:
+            self._columns = CardColumns.build(self._all_cards())
+        return self._columns
+
+    def _all_cards(self):
+        if self.lazy:
+            # Cartas temporárias, fora do cache: só os valores vão para os índices
+            return (Card(data) for data in self._reader.records())
+        return self.cards.values()
+
+    def query(self, text):
+        """Cartas que satisfazem todos os filtros, como ``type=monster atk>=2500``.
+
+        Levanta ValueError se a consulta for inválida.
+        """
+        ids = self.query_index.query(parse_query(text))
+        return [self.cards[card_id] for card_id in sorted(ids)]
+
+    def close(self):
+        """Libera o catálogo mapeado em memória (modo preguiçoso)."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
@@ -1,23 +1,162 @@
+from . import odds as _odds
+from .search_index import fold
+
+ZONES = ("main", "extra", "side")
+
+# Propriedades (sem acentos, em minúsculas) das cartas que vão para o Extra Deck
+EXTRA_PROPERTIES = {"fusion", "synchro", "xyz", "link", "fusao", "sincro"}
+
+
+def id_of(card):
+    """Id de uma carta ou do próprio id (o deck aceita os dois)."""
+    return getattr(card, "id", card)
+
+
+def default_zone(card):
+    """Extra Deck para Fusão/Sincro/Xyz/Link, Main Deck para o resto."""
+    for prop in getattr(card, "properties", None) or ():
+        if fold(prop) in EXTRA_PROPERTIES:
+            return "extra"
+    return "main"
+
+
 class Deck:
     def __init__(self, name):
         self.name = name
-        self.cards = []
+        self.zones = {zone: {} for zone in ZONES}  # zona -> id -> quantidade
+        self._sizes = dict.fromkeys(ZONES, 0)
+        self._cards = {}  # id -> objeto guardado para exibição (Card ou o id)
+        self.seq = 0  # última alteração do diário de decks aplicada a este deck
 
-    def add_card(self, card):
-        self.cards.append(card)
+    def add_card(self, card, amount=1, zone=None):
+        zone = zone or default_zone(card)
+        cid = id_of(card)
+        counts = self.zones[zone]
 
-    def remove_card(self, card_id, amount=1):
+        counts[cid] = counts.get(cid, 0) + amount
+        self._sizes[zone] += amount
+        self._cards.setdefault(cid, card)
+
+    def remove_card(self, card_id, amount=1, zone=None):
+        """Remove até ``amount`` cópias da carta e devolve quantas saíram.
+
+        Sem ``zone`` procura a carta no Main, no Extra e no Side, nessa ordem.
+        """
         removed = 0
-        for card in self.cards[:]:
-            if card == card_id and removed < amount:
-                self.cards.remove(card)
-                removed += 1
+        for name in (zone,) if zone else ZONES:
+            counts = self.zones[name]
+            have = counts.get(card_id, 0)
+            if not have:
+                continue
+
+            take = min(have, amount - removed)
+            if take == have:
+                del counts[card_id]
+            else:
+                counts[card_id] = have - take
+            self._sizes[name] -= take
+            removed += take
+
+            if removed == amount:
+                break
+
+        if removed and not self.count(card_id):
+            del self._cards[card_id]
+        return removed
+
+    def count(self, card_id, zone=None):
+        """Quantidade de cópias da carta (em uma zona ou no deck todo)."""
+        if zone:
+            return self.zones[zone].get(card_id, 0)
+        return sum(counts.get(card_id, 0) for counts in self.zones.values())
+
+    def size(self, zone=None):
+        if zone:
+            return self._sizes[zone]
+        return sum(self._sizes.values())
+
+    def clear(self):
+        for zone in ZONES:
+            self.zones[zone] = {}
+            self._sizes[zone] = 0
+        self._cards = {}
+
+    def card(self, card_id):
+        """Objeto guardado para a carta (Card ou o próprio id)."""
+        return self._cards.get(card_id)
+
+    def ids(self):
+        """Ids distintos das cartas do deck (em qualquer zona)."""
+        return self._cards.keys()
+
+    def entries(self, zone):
+        """Pares (carta, quantidade) de uma zona, na ordem em que entraram."""
+        return [(self._cards[cid], n) for cid, n in self.zones[zone].items()]
+
+    @property
+    def cards(self):
+        """Visão em lista (uma entrada por cópia), na ordem Main, Extra, Side."""
+        return [card for zone in ZONES for card, n in self.entries(zone) for _ in range(n)]
+
+    @cards.setter
+    def cards(self, cards):
+        self.clear()
+        for card in cards:
+            self.add_card(card)
+
+    def __contains__(self, card):
+        return id_of(card) in self._cards
+
+    def __len__(self):
+        return self.size()
+
+    def odds(self, needs, hand_size=_odds.HAND_SIZE):
+        """Probabilidade de abrir o Main Deck com ``needs`` (texto ou lista de Need).
+
+        Exata quando os grupos não têm cartas em comum; senão, uma
+        ``Estimate`` da simulação.
+        """
+        if isinstance(needs, str):
+            needs = _odds.parse_needs(needs)
+        if _odds.is_exact(needs):
+            return _odds.exact_odds(self.zones["main"], needs, hand_size)
+        return self.simulate(needs, hand_size)
+
+    def simulate(self, needs, hand_size=_odds.HAND_SIZE, trials=_odds.TRIALS, seed=None):
+        """Estima a probabilidade de abrir com ``needs`` sorteando ``trials`` mãos."""
+        if isinstance(needs, str):
+            needs = _odds.parse_needs(needs)
+        return _odds.simulate(self.zones["main"], needs, hand_size, trials, seed)
 
     def to_dict(self):
         return {
             "name": self.name,
-            "cards": [c for c in self.cards]
+            **{zone: dict(self.zones[zone]) for zone in ZONES},
         }
 
+    @classmethod
+    def from_dict(cls, raw, resolve):
+        """Monta o deck a partir de ``to_dict``; ``resolve`` converte id em carta.
+
+        Aceita também o formato antigo (``"cards": [id, id, ...]``). Cartas
+        que ``resolve`` não encontra são ignoradas.
+        """
+        deck = cls(raw["name"])
+        deck.seq = raw.get("seq", 0)
+
+        if "cards" in raw:
+            for cid in raw["cards"]:
+                card = resolve(cid)
+                if card:
+                    deck.add_card(card)
+            return deck
+
+        for zone in ZONES:
+            for cid, amount in raw.get(zone, {}).items():
+                card = resolve(int(cid))
+                if card:
+                    deck.add_card(card, amount, zone)
+        return deck
+
     def __repr__(self):
-        return f"<Deck {self.name} ({len(self.cards)} cartas)>"
+        return f"<Deck {self.name} ({len(self)} cartas)>"
@@ -0,0 +1,131 @@
+"""Busca aproximada de cartas pelo nome, tolerante a erros de digitação.
+
+Os nomes são comparados palavra a palavra, normalizados como na busca
+textual (minúsculas, sem acentos nem pontuação: "Blue-Eyes" = "blue eyes").
+Cada palavra digitada é procurada no vocabulário dos nomes: os trigramas
+em comum separam poucas candidatas, e só nelas é calculada a distância de
+edição, limitada a ``max_typos``. Depois, os nomes que têm essas palavras
+são ordenados por palavras faltando, erros e palavras a mais.
+"""
+import heapq
+from collections import Counter
+
+from .search_index import tokenize
+
+DEFAULT_LIMIT = 10
+
+
+def max_typos(word):
+    """Erros tolerados numa palavra: nenhum até 3 letras, um até 7 e dois a partir de 8."""
+    if len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 7 else 2
+
+
+def trigrams(word):
+    padded = f"^{word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Distância de edição (com transposição de letras vizinhas) entre ``a`` e ``b``.
+
+    Para assim que passa de ``limit`` e devolve ``limit + 1``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            value = min(previous[j - 1] + (ca != cb), previous[j] + 1, current[j - 1] + 1)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, before[j - 2] + 1)
+            current.append(value)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class NameMatcher:
+    def __init__(self):
+        self.names = {}  # id -> palavras do nome
+        self.words = {}  # palavra -> ids das cartas com ela no nome
+        self.grams = {}  # trigrama -> palavras do vocabulário que o contêm
+
+    @classmethod
+    def build(cls, records):
+        """Monta o índice a partir de (id, nome) de cada carta."""
+        matcher = cls()
+        for card_id, name in records:
+            words = tuple(tokenize(name))
+            if not words:
+                continue
+            matcher.names[card_id] = words
+            for word in set(words):
+                matcher.words.setdefault(word, []).append(card_id)
+
+        for word in matcher.words:
+            for gram in trigrams(word):
+                matcher.grams.setdefault(gram, []).append(word)
+        return matcher
+
+    def similar_words(self, word):
+        """Palavras do vocabulário a até ``max_typos(word)`` erros: {palavra: erros}."""
+        # Palavra que existe em algum nome é tomada como digitada certo
+        if word in self.words:
+            return {word: 0}
+        limit = max_typos(word)
+        if not limit:
+            return {}
+
+        # Cada erro desfaz no máximo 4 trigramas (3, ou 4 numa transposição)
+        grams = trigrams(word)
+        needed = max(1, len(grams) - 4 * limit)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.grams.get(gram, ()))
+
+        found = {}
+        for other, count in shared.items():
+            if count < needed or abs(len(other) - len(word)) > limit:
+                continue
+            distance = edit_distance(word, other, limit)
+            if distance <= limit:
+                found[other] = distance
+        return found
+
+    def match(self, text, limit=DEFAULT_LIMIT):
+        """Ids dos nomes mais parecidos com ``text``: [(id, custo)], do mais próximo.
+
+        O custo é (palavras que faltam, erros de digitação, palavras a mais);
+        pelo menos metade das palavras digitadas precisa aparecer no nome.
+        """
+        query = list(dict.fromkeys(tokenize(text)))
+        if not query:
+            return []
+
+        # Por palavra digitada: id -> menor número de erros dela no nome
+        per_word = []
+        for word in query:
+            best = {}
+            for other, distance in self.similar_words(word).items():
+                for card_id in self.words[other]:
+                    if distance < best.get(card_id, distance + 1):
+                        best[card_id] = distance
+            per_word.append(best)
+
+        hits = Counter()
+        for best in per_word:
+            hits.update(best.keys())
+
+        def cost(card_id):
+            matched = hits[card_id]
+            typos = sum(best[card_id] for best in per_word if card_id in best)
+            return len(query) - matched, typos, len(self.names[card_id]) - matched
+
+        needed = (len(query) + 1) // 2
+        candidates = [card_id for card_id, matched in hits.items() if matched >= needed]
+        return [(card_id, cost(card_id)) for card_id in heapq.nsmallest(limit, candidates, key=lambda c: (cost(c), c))]
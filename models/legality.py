@@ -0,0 +1,145 @@
+"""Legalidade dos decks: tamanho das zonas, limite de cópias e lista de banidas.
+
+A lista de banidas é um arquivo JSON local com os ids de cada categoria:
+
+    {"forbidden": [id, ...], "limited": [id, ...], "semi_limited": [id, ...]}
+
+Ao carregar, ela vira um array id -> limite de cópias (0, 1, 2 ou 3), e
+cada consulta é um acesso por índice. Se a carta vai ao Extra Deck
+(Fusão/Sincro/Xyz/Link, pelas ``properties``) fica num array igual,
+preenchido conforme as cartas aparecem. Validar um deck inteiro percorre
+só as cartas dele; validar uma adição (``check_add``) olha só a carta e
+o tamanho da zona.
+"""
+import json
+from collections import Counter, namedtuple
+
+from .deck import ZONES, default_zone
+
+MIN_MAIN = 40
+MAX_MAIN = 60
+MAX_EXTRA = 15
+MAX_SIDE = 15
+MAX_COPIES = 3
+MAX_SIZES = {"main": MAX_MAIN, "extra": MAX_EXTRA, "side": MAX_SIDE}
+ZONE_NAMES = {"main": "Main Deck", "extra": "Extra Deck", "side": "Side Deck"}
+LIMITS = {"forbidden": 0, "limited": 1, "semi_limited": 2}
+
+# Valores de Validator._kinds
+_UNSEEN, _MAIN, _EXTRA, _UNKNOWN = range(4)
+
+Problem = namedtuple("Problem", "card_id message")  # card_id None: problema do deck todo
+Report = namedtuple("Report", "name problems")
+
+
+def load_banlist(path):
+    """Lê a lista de banidas e devolve o array id -> limite (bytearray).
+
+    Arquivo inexistente é uma lista vazia; ValueError se o formato for inválido.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return bytearray()
+
+    if not isinstance(raw, dict) or set(raw) - set(LIMITS):
+        raise ValueError(f"Lista de banidas inválida: {path} (use {', '.join(LIMITS)}).")
+    ids = {int(card_id): LIMITS[key] for key in LIMITS for card_id in raw.get(key, ())}
+    limits = bytearray([MAX_COPIES]) * (max(ids, default=-1) + 1)
+    for card_id, limit in ids.items():
+        limits[card_id] = limit
+    return limits
+
+
+class Validator:
+    def __init__(self, limits=None, resolve=None):
+        self.limits = limits or bytearray()  # id -> limite; ids além do fim: MAX_COPIES
+        self.resolve = resolve  # id -> carta, para saber a zona; None: não confere zonas
+        self._kinds = bytearray()  # id -> _MAIN/_EXTRA/_UNKNOWN (_UNSEEN: ainda não consultada)
+
+    @classmethod
+    def load(cls, path, resolve=None):
+        return cls(load_banlist(path), resolve)
+
+    def limit(self, card_id):
+        """Cópias permitidas da carta no deck (Main, Extra e Side juntos)."""
+        return self.limits[card_id] if 0 <= card_id < len(self.limits) else MAX_COPIES
+
+    def _kind(self, card_id):
+        if self.resolve is None or card_id < 0:
+            return _UNKNOWN
+        if card_id >= len(self._kinds):
+            self._kinds.extend(bytes(card_id + 1 - len(self._kinds)))
+        kind = self._kinds[card_id]
+        if kind == _UNSEEN:
+            card = self.resolve(card_id)
+            if card is None or not hasattr(card, "properties"):
+                kind = _UNKNOWN
+            else:
+                kind = _EXTRA if default_zone(card) == "extra" else _MAIN
+            self._kinds[card_id] = kind
+        return kind
+
+    def _copies_problem(self, card_id, copies):
+        limit = self.limit(card_id)
+        if copies <= limit:
+            return None
+        if not limit:
+            return Problem(card_id, f"Carta {card_id} é proibida.")
+        return Problem(card_id, f"{copies} cópias da carta {card_id} (o limite é {limit}).")
+
+    def _zone_problem(self, card_id, zone):
+        kind = self._kind(card_id)
+        if zone == "main" and kind == _EXTRA:
+            return Problem(card_id, f"Carta {card_id} é do Extra Deck e está no Main Deck.")
+        if zone == "extra" and kind == _MAIN:
+            return Problem(card_id, f"Carta {card_id} não pode ficar no Extra Deck.")
+        return None
+
+    def check(self, zones):
+        """Problemas de um deck dado por {zona: {id: cópias}} (como ``Deck.zones``): [Problem]."""
+        problems = []
+        sizes = {zone: sum(zones.get(zone, {}).values()) for zone in ZONES}
+        if not MIN_MAIN <= sizes["main"] <= MAX_MAIN:
+            problems.append(Problem(None, f"Main Deck com {sizes['main']} cartas (precisa ter de {MIN_MAIN} a {MAX_MAIN})."))
+        for zone in ("extra", "side"):
+            if sizes[zone] > MAX_SIZES[zone]:
+                problems.append(Problem(None, f"{ZONE_NAMES[zone]} com {sizes[zone]} cartas (máximo {MAX_SIZES[zone]})."))
+
+        copies = Counter()
+        for zone in ZONES:
+            copies.update(zones.get(zone, {}))
+        for card_id, n in copies.items():
+            problem = self._copies_problem(card_id, n)
+            if problem:
+                problems.append(problem)
+
+        for zone in ("main", "extra"):
+            for card_id in zones.get(zone, {}):
+                problem = self._zone_problem(card_id, zone)
+                if problem:
+                    problems.append(problem)
+        return problems
+
+    def check_add(self, deck, card_id, amount, zone):
+        """O problema que adicionar ``amount`` cópias a ``zone`` criaria, ou None.
+
+        Só os limites que uma adição pode passar: cópias, máximo da zona e
+        carta na zona errada. O mínimo do Main Deck fica para ``check``.
+        """
+        problem = self._copies_problem(card_id, deck.count(card_id) + amount)
+        if problem:
+            return problem
+        size = deck.size(zone) + amount
+        if size > MAX_SIZES[zone]:
+            return Problem(None, f"O {ZONE_NAMES[zone]} passaria a ter {size} cartas (máximo {MAX_SIZES[zone]}).")
+        return self._zone_problem(card_id, zone)
+
+    def raw_zones(self, raw):
+        """{zona: {id: cópias}} de um registro salvo (aceita o formato antigo)."""
+        zones = {zone: {int(cid): n for cid, n in raw.get(zone, {}).items()} for zone in ZONES}
+        for cid in raw.get("cards", ()):
+            zone = "extra" if self._kind(int(cid)) == _EXTRA else "main"
+            zones[zone][int(cid)] = zones[zone].get(int(cid), 0) + 1
+        return zones
@@ -0,0 +1,60 @@
+"""Leitura dos arquivos JSON de uma pasta de cartas, serial ou em paralelo.
+
+No modo paralelo a lista de arquivos é dividida em blocos contíguos
+distribuídos entre processos (a decodificação do JSON disputa o GIL, então
+precisa de processos); dentro de cada processo a leitura dos arquivos usa
+threads, já que E/S libera o GIL. Os blocos são devolvidos na ordem em que
+foram enviados, então o resultado é idêntico ao da leitura serial.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+IO_THREADS = 8
+SHARDS_PER_WORKER = 4
+
+
+def decode(raw):
+    """Registros de um JSON (uma carta ou uma lista delas)."""
+    data = json.loads(raw)
+    if isinstance(data, dict):
+        return [data]
+    if isinstance(data, list):
+        return data
+    return []
+
+
+def load_file(full_path):
+    with open(full_path, "rb") as f:
+        return decode(f.read())
+
+
+def _read_bytes(full_path):
+    with open(full_path, "rb") as f:
+        return f.read()
+
+
+def _load_shard(folder_path, names):
+    paths = [os.path.join(folder_path, name) for name in names]
+    with ThreadPoolExecutor(IO_THREADS) as pool:
+        raws = list(pool.map(_read_bytes, paths))
+    return [decode(raw) for raw in raws]
+
+
+def load_files(folder_path, names, workers=None):
+    """Lê os arquivos ``names`` da pasta.
+
+    Devolve, na mesma ordem de ``names``, a lista de registros de cada
+    arquivo. Com ``workers`` maior que 1 a leitura é feita em paralelo.
+    """
+    names = list(names)
+
+    if not workers or workers < 2 or len(names) < workers * SHARDS_PER_WORKER:
+        return [load_file(os.path.join(folder_path, name)) for name in names]
+
+    size = -(-len(names) // (workers * SHARDS_PER_WORKER))
+    shards = [names[i:i + size] for i in range(0, len(names), size)]
+
+    with ProcessPoolExecutor(workers) as pool:
+        results = pool.map(_load_shard, [folder_path] * len(shards), shards)
+        return [records for shard in results for records in shard]
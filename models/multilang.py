@@ -0,0 +1,178 @@
+"""Base de cartas com vários idiomas carregados ao mesmo tempo.
+
+Os campos que não dependem do idioma (tipo, nível, ATK/DEF, escalas,
+setas de link...) são iguais em ``database/en`` e ``database/pt`` e ficam
+guardados uma única vez por id. Cada idioma guarda apenas os textos
+localizados (nome, efeitos, atributo e propriedades traduzidos), em tuplas
+compactas; listas de propriedades repetidas e textos iguais entre idiomas
+são compartilhados.
+"""
+import os
+
+from . import catalog
+from .card import Card
+from .loader import load_files
+from .search_index import DEFAULT_LIMIT, SearchIndex, contains, index_path, needs_substring, sync_index
+
+DEFAULT_PATHS = {"en": "database/en", "pt": "database/pt"}
+
+SHARED_FIELDS = (
+    "id", "type", "english_attribute", "level", "rank", "link_rating",
+    "link_arrows", "pend_scale", "atk", "def_", "english_property",
+)
+LOCALIZED_FIELDS = (
+    "name", "old_name", "attribute", "effect", "pend_effect", "notes",
+    "properties", "localized_property",
+)
+_NAME = LOCALIZED_FIELDS.index("name")
+_EFFECT = LOCALIZED_FIELDS.index("effect")
+_PROPERTIES = LOCALIZED_FIELDS.index("properties")
+
+
+class MultiLocaleDatabase:
+    def __init__(self, paths=None, default="pt", workers=None):
+        self.paths = dict(paths or DEFAULT_PATHS)
+        if default not in self.paths:
+            raise ValueError(f"Idioma padrão sem pasta configurada: {default}")
+
+        self.default = default
+        self.shared = {}  # id -> tupla com os campos comuns a todos os idiomas
+        self.texts = {}  # idioma -> id -> tupla com os campos localizados
+        self._updates = {}
+        self._indexes = {}
+        self._tuples = {}  # tuplas de propriedades já vistas, para compartilhar
+
+        for lang, path in self.paths.items():
+            texts = self.texts[lang] = {}
+            for data in self._records(lang, path, workers):
+                card = Card(data)
+                if card.id not in self.shared:
+                    self.shared[card.id] = tuple(getattr(card, f) for f in SHARED_FIELDS)
+                texts[card.id] = self._localized(card)
+
+    def _records(self, lang, path, workers):
+        # Registros do idioma pelo catálogo, como em CardDatabase; sem como
+        # gravá-lo (permissão, somente leitura, disco cheio), direto dos JSON
+        path_catalog = catalog.catalog_path(path)
+        try:
+            update = catalog.sync_catalog(path, path_catalog, workers)
+        except OSError:
+            self._updates[lang] = None
+            names = sorted(f for f in os.listdir(path) if f.endswith(".json"))
+            return [data for records in load_files(path, names, workers) for data in records]
+        self._updates[lang] = catalog.text_update(update)  # o índice só usa os textos
+        return catalog.read_catalog(path_catalog)
+
+    def _localized(self, card):
+        values = [getattr(card, f) for f in LOCALIZED_FIELDS]
+        props = tuple(values[_PROPERTIES])
+        values[_PROPERTIES] = self._tuples.setdefault(props, props)
+
+        # Reaproveita o objeto de um texto idêntico já carregado em outro idioma
+        for texts in self.texts.values():
+            other = texts.get(card.id)
+            if other is not None:
+                values = [o if o == v else v for o, v in zip(other, values)]
+                break
+
+        return tuple(values)
+
+    @property
+    def languages(self):
+        return list(self.paths)
+
+    def _lang(self, lang):
+        lang = lang or self.default
+        if lang not in self.texts:
+            raise ValueError(f"Idioma não carregado: {lang}")
+        return lang
+
+    def _compose(self, card_id, text):
+        card = Card.__new__(Card)
+        for field, value in zip(SHARED_FIELDS, self.shared[card_id]):
+            setattr(card, field, value)
+        for field, value in zip(LOCALIZED_FIELDS, text):
+            setattr(card, field, value)
+        card.properties = list(card.properties)
+        return card
+
+    def get(self, card_id, lang=None):
+        """Carta no idioma pedido, ou None se ela não existe nesse idioma."""
+        text = self.texts[self._lang(lang)].get(card_id)
+        if text is None:
+            return None
+        return self._compose(card_id, text)
+
+    def ids(self, lang=None):
+        return self.texts[self._lang(lang)].keys()
+
+    def index(self, lang=None):
+        """Índice de busca do idioma, carregado na primeira busca nele."""
+        lang = self._lang(lang)
+        if lang not in self._indexes:
+            texts = self.texts[lang]
+
+            def records():
+                return [(card_id, t[_NAME], t[_EFFECT]) for card_id, t in texts.items()]
+
+            if self._updates[lang] is None:
+                # Sem catálogo não há carimbo para validar um índice gravado
+                self._indexes[lang] = SearchIndex.build(records())
+            else:
+                self._indexes[lang] = sync_index(index_path(self.paths[lang]), self._updates[lang], records)
+        return self._indexes[lang]
+
+    @staticmethod
+    def _substring_filter(text, texts):
+        # Como em CardDatabase: id -> se o texto aparece inteiro; None se os termos bastam
+        if not needs_substring(text):
+            return None
+        has_text = contains(text)
+
+        def keep(card_id):
+            t = texts.get(card_id)
+            return t is not None and (has_text(t[_NAME]) or has_text(t[_EFFECT]))
+        return keep
+
+    def search(self, text, lang=None):
+        """Busca textual no idioma pedido (mesmas regras de CardDatabase.search)."""
+        lang = self._lang(lang)
+        texts = self.texts[lang]
+        ids = self.index(lang).search(text, keep=self._substring_filter(text, texts))
+
+        if ids is None:
+            # Sem termos indexáveis: busca por substring nos textos do idioma
+            has_text = contains(text)
+            ids = [card_id for card_id, t in texts.items() if has_text(t[_NAME]) or has_text(t[_EFFECT])]
+
+        return [self._compose(card_id, texts[card_id]) for card_id in sorted(ids) if card_id in texts]
+
+    def search_ranked(self, text, limit=DEFAULT_LIMIT, offset=0, lang=None):
+        """Busca por relevância no idioma pedido (como CardDatabase.search_ranked)."""
+        lang = self._lang(lang)
+        texts = self.texts[lang]
+        result = self.index(lang).ranked(text, limit, offset, self._substring_filter(text, texts))
+        if result is None:
+            matches = self.search(text, lang)
+            return len(matches), matches[offset:offset + limit]
+        total, ids = result
+        return total, [self._compose(card_id, texts[card_id]) for card_id in ids if card_id in texts]
+
+    def view(self, lang):
+        """Visão de um idioma com a interface de CardDatabase (get/search)."""
+        return LocaleView(self, self._lang(lang))
+
+
+class LocaleView:
+    def __init__(self, database, lang):
+        self.database = database
+        self.lang = lang
+
+    def get(self, card_id):
+        return self.database.get(card_id, self.lang)
+
+    def search(self, text):
+        return self.database.search(text, self.lang)
+
+    def search_ranked(self, text, limit=DEFAULT_LIMIT, offset=0):
+        return self.database.search_ranked(text, limit, offset, self.lang)
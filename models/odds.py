@@ -0,0 +1,144 @@
+"""Probabilidades da mão inicial de um deck.
+
+Uma condição é uma lista de Need: "pelo menos ``minimum`` cópias entre as
+cartas ``ids``", todas ao mesmo tempo. Em texto, cada termo separado por
+espaço é uma Need: ``4007`` (uma cópia), ``4007,4064`` (uma de qualquer
+das duas) ou ``2:4007,4064`` (duas entre elas).
+
+Quando os grupos de cartas não se sobrepõem a conta é exata
+(hipergeométrica multivariada). Senão, ou a pedido, as mãos são sorteadas
+em lotes com NumPy: o deck vira um array de inteiros e cada lote de mãos é
+uma matriz, sem laços em Python por mão.
+"""
+import math
+import re
+from collections import namedtuple
+from itertools import product
+
+from . import optional
+
+np = None  # importado por require_numpy, na primeira simulação (dependência opcional)
+
+HAND_SIZE = 5
+TRIALS = 1_000_000
+BATCH = 100_000  # mãos por lote (memória: BATCH x tamanho do deck)
+Z_95 = 1.959964
+
+Need = namedtuple("Need", "ids minimum")
+Estimate = namedtuple("Estimate", "probability low high trials")
+
+_NEED = re.compile(r"^(?:(\d+):)?(\d+(?:,\d+)*)$")
+
+
+def require_numpy():
+    global np
+    np = optional.require_numpy("A simulação precisa do NumPy (pip install numpy).")
+    return np
+
+
+def parse_needs(text):
+    """Converte ``"4007,4064 2:5649"`` em [Need]; ValueError se mal formado."""
+    needs = []
+    for part in text.split():
+        match = _NEED.match(part)
+        if not match:
+            raise ValueError(f"Condição inválida: {part}")
+        minimum = int(match.group(1) or 1)
+        if minimum < 1:
+            raise ValueError(f"Condição inválida: {part}")
+        needs.append(Need(frozenset(int(i) for i in match.group(2).split(",")), minimum))
+    if not needs:
+        raise ValueError("Nenhuma condição informada.")
+    return needs
+
+
+def _check(counts, hand_size):
+    size = sum(counts.values())
+    if not 0 < hand_size <= size:
+        raise ValueError(f"A mão precisa ter de 1 a {size} cartas (o deck tem {size}).")
+    return size
+
+
+def is_exact(needs):
+    """Se a conta exata se aplica: nenhuma carta em mais de um grupo."""
+    seen = set()
+    for need in needs:
+        if seen & need.ids:
+            return False
+        seen |= need.ids
+    return True
+
+
+def exact_odds(counts, needs, hand_size=HAND_SIZE):
+    """Probabilidade exata de ``needs`` numa mão de ``hand_size`` cartas.
+
+    ``counts`` é {id: cópias} (o Main Deck). Os grupos não podem se
+    sobrepor (``is_exact``).
+    """
+    if not is_exact(needs):
+        raise ValueError("Grupos com cartas em comum: use a simulação.")
+    size = _check(counts, hand_size)
+
+    groups = [sum(counts.get(card_id, 0) for card_id in need.ids) for need in needs]
+    rest = size - sum(groups)
+
+    # Soma sobre quantas cópias de cada grupo vêm na mão
+    ways = 0
+    ranges = [range(need.minimum, min(group, hand_size) + 1) for need, group in zip(needs, groups)]
+    for drawn in product(*ranges):
+        others = hand_size - sum(drawn)
+        if others < 0 or others > rest:
+            continue
+        term = math.comb(rest, others)
+        for group, k in zip(groups, drawn):
+            term *= math.comb(group, k)
+        ways += term
+    return ways / math.comb(size, hand_size)
+
+
+def wilson(hits, trials, z=Z_95):
+    """Intervalo de confiança de Wilson para a proporção ``hits / trials``."""
+    p = hits / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def simulate(counts, needs, hand_size=HAND_SIZE, trials=TRIALS, seed=None):
+    """Estimativa por sorteio de ``trials`` mãos, com intervalo de 95%.
+
+    Com a mesma ``seed`` o resultado se repete.
+    """
+    require_numpy()
+    _check(counts, hand_size)
+    if trials < 1:
+        raise ValueError("O número de mãos precisa ser positivo.")
+
+    ids = list(counts)
+    deck = np.repeat(np.arange(len(ids)), [counts[card_id] for card_id in ids])
+    # Uma linha por condição: 1 nas posições (de ids) das cartas do grupo
+    members = np.array([[card_id in need.ids for card_id in ids] for need in needs], dtype=np.int8)
+    minimums = [need.minimum for need in needs]
+
+    rng = np.random.default_rng(seed)
+    hits = 0
+    done = 0
+    while done < trials:
+        batch = min(BATCH, trials - done)
+        # As hand_size menores chaves aleatórias de cada linha são uma mão sem reposição
+        keys = rng.random((batch, deck.size), dtype=np.float32)
+        if hand_size < deck.size:
+            positions = np.argpartition(keys, hand_size - 1, axis=1)[:, :hand_size]
+        else:
+            positions = np.broadcast_to(np.arange(deck.size), (batch, deck.size))
+        hands = deck[positions]
+
+        ok = np.ones(batch, dtype=bool)
+        for member, minimum in zip(members, minimums):
+            ok &= member[hands].sum(axis=1) >= minimum
+        hits += int(ok.sum())
+        done += batch
+
+    low, high = wilson(hits, trials)
+    return Estimate(hits / trials, low, high, trials)
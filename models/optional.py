@@ -0,0 +1,30 @@
+"""Dependências opcionais, importadas só no primeiro uso.
+
+O NumPy leva ~0,1 s para importar; carregar a base e abrir a CLI não
+dependem dele, então os módulos com caminhos vetorizados o pedem aqui
+quando precisam, e não ao serem importados.
+"""
+_numpy = None
+_tried = False
+
+
+def numpy():
+    """O módulo numpy, ou None se não estiver instalado."""
+    global _numpy, _tried
+    if not _tried:
+        _tried = True
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            _numpy = numpy
+    return _numpy
+
+
+def require_numpy(message):
+    """O módulo numpy; ImportError com ``message`` se não estiver instalado."""
+    np = numpy()
+    if np is None:
+        raise ImportError(message)
+    return np
@@ -0,0 +1,157 @@
+"""Consultas estruturadas por atributos das cartas.
+
+Uma consulta é uma sequência de filtros ``campo operador valor`` separados
+por espaço, por exemplo ``type=monster attribute=TREVAS level>=7 atk>=2500``.
+Valores com espaço vão entre aspas: ``property="Besta Alada"``. Propriedades
+usam os nomes da base carregada (Dragão na base pt); atributos aceitam o
+nome da base e o inglês (``attribute=TREVAS`` ou ``attribute=DARK``).
+
+Cada filtro é respondido por um índice secundário do campo (hash para
+campos categóricos, lista ordenada + bisect para campos numéricos) e o
+resultado é a interseção dos conjuntos de ids.
+"""
+import re
+import shlex
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from .search_index import fold, intersect
+
+# campo -> atributo do Card
+CATEGORICAL = {"type": "type", "attribute": "attribute"}
+# campo -> atributo do Card com outra grafia aceita nos filtros
+ALTERNATES = {"attribute": "english_attribute"}
+MULTIVALUED = {"property": "properties"}
+NUMERIC = {
+    "level": "level",
+    "rank": "rank",
+    "link": "link_rating",
+    "scale": "pend_scale",
+    "atk": "atk",
+    "def": "def_",
+}
+
+ALIASES = {
+    "attr": "attribute",
+    "prop": "property",
+    "properties": "property",
+    "linkrating": "link",
+    "pendscale": "scale",
+}
+
+OPERATORS = ("=", "!=", ">", ">=", "<", "<=")
+
+_FILTER = re.compile(r"^(\w+)\s*(>=|<=|!=|=|>|<)\s*(.+)$")
+
+Condition = namedtuple("Condition", "field op value")
+
+
+def parse_query(text):
+    """Converte o texto da consulta em uma lista de Condition.
+
+    Levanta ValueError para filtros mal formados, campos desconhecidos ou
+    operadores que não se aplicam ao campo.
+    """
+    try:
+        parts = shlex.split(text)
+    except ValueError:
+        raise ValueError("Consulta inválida: aspas não fechadas.")
+
+    conditions = []
+    for part in parts:
+        match = _FILTER.match(part)
+        if not match:
+            raise ValueError(f"Filtro inválido: {part}")
+
+        field, op, value = match.groups()
+        field = ALIASES.get(field.lower(), field.lower())
+
+        if field in NUMERIC:
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError(f"Valor numérico inválido para {field}: {value}")
+        elif field in CATEGORICAL or field in MULTIVALUED:
+            if op not in ("=", "!="):
+                raise ValueError(f"O campo {field} só aceita = ou !=.")
+            value = fold(value.strip())
+        else:
+            raise ValueError(f"Campo desconhecido: {field}")
+
+        conditions.append(Condition(field, op, value))
+
+    return conditions
+
+
+class QueryIndex:
+    def __init__(self):
+        self.ids = set()
+        self.hashes = {}  # campo -> valor normalizado -> conjunto de ids
+        self.ranges = {}  # campo -> (valores ordenados, ids na mesma ordem)
+
+    @classmethod
+    def build(cls, cards):
+        index = cls()
+        pairs = {field: [] for field in NUMERIC}
+        hashes = {field: {} for field in (*CATEGORICAL, *MULTIVALUED)}
+
+        for card in cards:
+            index.ids.add(card.id)
+
+            for field, attr in CATEGORICAL.items():
+                value = getattr(card, attr)
+                if value is not None:
+                    hashes[field].setdefault(fold(value), set()).add(card.id)
+
+            for field, attr in ALTERNATES.items():
+                value = getattr(card, attr, None)
+                if value is not None:
+                    hashes[field].setdefault(fold(value), set()).add(card.id)
+
+            for field, attr in MULTIVALUED.items():
+                for value in getattr(card, attr) or ():
+                    hashes[field].setdefault(fold(value), set()).add(card.id)
+
+            for field, attr in NUMERIC.items():
+                value = getattr(card, attr)
+                # ATK/DEF "?" vêm como -1: não casam com nenhum filtro numérico
+                if value is None or (field in ("atk", "def") and value < 0):
+                    continue
+                pairs[field].append((value, card.id))
+
+        index.hashes = hashes
+        for field, values in pairs.items():
+            values.sort()
+            index.ranges[field] = ([v for v, _ in values], [i for _, i in values])
+
+        return index
+
+    def _numeric(self, field, op, value):
+        values, ids = self.ranges[field]
+
+        if op == "=":
+            return set(ids[bisect_left(values, value):bisect_right(values, value)])
+        if op == "!=":
+            return set(ids[:bisect_left(values, value)]) | set(ids[bisect_right(values, value):])
+        if op == ">":
+            return set(ids[bisect_right(values, value):])
+        if op == ">=":
+            return set(ids[bisect_left(values, value):])
+        if op == "<":
+            return set(ids[:bisect_left(values, value)])
+        return set(ids[:bisect_right(values, value)])  # <=
+
+    def _lookup(self, condition):
+        field, op, value = condition
+        if field in NUMERIC:
+            return self._numeric(field, op, value)
+
+        matches = self.hashes[field].get(value, set())
+        if op == "!=":
+            return self.ids - matches
+        return matches
+
+    def query(self, conditions):
+        """Ids que satisfazem todas as condições (todas as cartas se vazio)."""
+        if not conditions:
+            return set(self.ids)
+        return intersect([self._lookup(condition) for condition in conditions])
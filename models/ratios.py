@@ -0,0 +1,193 @@
+"""Otimização das quantidades de cópias (ratios) de um deck.
+
+Dado um deck, as cartas flexíveis (cada uma com o intervalo de cópias a
+testar) e uma condição de mão inicial (veja ``models.odds``), percorre as
+variantes dentro das regras (40 a 60 cartas no Main Deck, no máximo 3
+cópias) e devolve as que têm maior chance de abrir com a condição.
+
+Com grupos disjuntos a chance de cada variante é exata e barata. Senão as
+variantes são simuladas em paralelo num ProcessPoolExecutor. Todas usam as
+mesmas chaves aleatórias, geradas uma vez em memória compartilhada: os
+processos só as leem, e a diferença entre duas variantes não é ruído de
+sorteio (números aleatórios comuns). Variantes do mesmo tamanho
+compartilham também as posições das mãos.
+"""
+import heapq
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+
+from . import legality, odds
+
+np = None  # importado por _require_numpy, só ao simular (dependência opcional)
+
+MIN_SIZE = legality.MIN_MAIN
+MAX_SIZE = legality.MAX_MAIN
+MAX_COPIES = legality.MAX_COPIES
+TRIALS = 100_000
+TOP = 5
+CHUNK = 8  # variantes por tarefa enviada aos processos
+
+Flex = namedtuple("Flex", "card_id low high")
+Variant = namedtuple("Variant", "probability copies size")
+
+_FLEX = re.compile(r"^(\d+):(\d+)(?:-(\d+))?$")
+
+
+def parse_flex(text):
+    """Converte ``"4041:1-3,4064:2-3"`` em [Flex]; ValueError se mal formado."""
+    flex = []
+    for part in text.replace(",", " ").split():
+        match = _FLEX.match(part)
+        if not match:
+            raise ValueError(f"Carta flexível inválida: {part} (use id:mín-máx)")
+        low = int(match.group(2))
+        high = int(match.group(3) or low)
+        if low > high:
+            raise ValueError(f"Carta flexível inválida: {part} (use id:mín-máx)")
+        flex.append(Flex(int(match.group(1)), low, high))
+    if not flex:
+        raise ValueError("Nenhuma carta flexível informada.")
+    return flex
+
+
+def variants(counts, flex, min_size=MIN_SIZE, max_size=MAX_SIZE, max_copies=MAX_COPIES):
+    """Cópias das cartas flexíveis ({id: n}) em cada combinação dentro das regras.
+
+    ``counts`` é o Main Deck ({id: cópias}); as cartas fora de ``flex``
+    ficam como estão.
+    """
+    ids = [f.card_id for f in flex]
+    fixed = sum(n for card_id, n in counts.items() if card_id not in ids)
+    ranges = [range(max(f.low, 0), min(f.high, max_copies) + 1) for f in flex]
+
+    for copies in product(*ranges):
+        size = fixed + sum(copies)
+        if min_size <= size <= max_size:
+            yield dict(zip(ids, copies))
+
+
+# PROCESSOS
+
+_keys = None  # chaves aleatórias (mãos x cartas) na memória compartilhada
+_memory = None
+
+
+def _require_numpy():
+    # Também nos processos: o ``spawn`` reimporta o módulo sem o NumPy carregado
+    global np
+    np = odds.require_numpy()
+
+
+def _attach(name, shape):
+    global _keys, _memory
+    _require_numpy()
+    _memory = shared_memory.SharedMemory(name=name)
+    _keys = np.ndarray(shape, dtype=np.float32, buffer=_memory.buf)
+
+
+def _score(size, hand_size, decks, members, minimums):
+    """Fração das mãos que cumprem a condição em cada deck (arrays de ``size`` cartas)."""
+    keys = _keys[:, :size]
+    if hand_size < size:
+        positions = np.argpartition(keys, hand_size - 1, axis=1)[:, :hand_size]
+    else:
+        positions = np.broadcast_to(np.arange(size), keys.shape)
+
+    scores = []
+    for deck in decks:
+        hands = deck[positions]
+        ok = np.ones(len(hands), dtype=bool)
+        for member, minimum in zip(members, minimums):
+            ok &= member[hands].sum(axis=1) >= minimum
+        scores.append(float(ok.mean()))
+    return scores
+
+
+def _simulate_all(counts, needs, candidates, hand_size, trials, workers, seed):
+    _require_numpy()
+    ids = sorted(set(counts) | {card_id for copies in candidates for card_id in copies})
+    members = np.array([[card_id in need.ids for card_id in ids] for need in needs], dtype=np.int8)
+    minimums = [need.minimum for need in needs]
+
+    # Uma tarefa por bloco de variantes do mesmo tamanho
+    by_size = {}
+    for i, copies in enumerate(candidates):
+        merged = {**counts, **copies}
+        deck = np.repeat(np.arange(len(ids)), [merged.get(card_id, 0) for card_id in ids])
+        by_size.setdefault(deck.size, []).append((i, deck))
+    tasks = [(size, group[start:start + CHUNK]) for size, group in by_size.items() for start in range(0, len(group), CHUNK)]
+
+    shape = (trials, max(by_size))
+    memory = shared_memory.SharedMemory(create=True, size=shape[0] * shape[1] * 4)
+    try:
+        keys = np.ndarray(shape, dtype=np.float32, buffer=memory.buf)
+        np.random.default_rng(seed).random(shape, dtype=np.float32, out=keys)
+        del keys  # a memória só fecha sem arrays apontando para ela
+
+        scores = [0.0] * len(candidates)
+        if workers == 1:
+            _attach(memory.name, shape)
+            for size, chunk in tasks:
+                for (i, _), score in zip(chunk, _score(size, hand_size, [d for _, d in chunk], members, minimums)):
+                    scores[i] = score
+        else:
+            with ProcessPoolExecutor(workers, initializer=_attach, initargs=(memory.name, shape)) as pool:
+                futures = [
+                    (chunk, pool.submit(_score, size, hand_size, [d for _, d in chunk], members, minimums))
+                    for size, chunk in tasks
+                ]
+                for chunk, future in futures:
+                    for (i, _), score in zip(chunk, future.result()):
+                        scores[i] = score
+        return scores
+    finally:
+        _detach()
+        memory.close()
+        memory.unlink()
+
+
+def _detach():
+    global _keys, _memory
+    if _memory is not None:
+        _keys = None
+        _memory.close()
+        _memory = None
+
+
+def optimize(deck, needs, flex, hand_size=odds.HAND_SIZE, top=TOP, simulate=False,
+             trials=TRIALS, workers=None, seed=None, min_size=MIN_SIZE, max_size=MAX_SIZE):
+    """As ``top`` variantes do Main Deck com maior chance de abrir com ``needs``.
+
+    ``needs`` e ``flex`` aceitam texto (``parse_needs``/``parse_flex``).
+    Devolve [Variant(probabilidade, cópias das cartas flexíveis, tamanho)],
+    da melhor para a pior; no empate vence o deck menor. ``workers``
+    processos simulam as variantes (None: um por núcleo).
+    """
+    if isinstance(needs, str):
+        needs = odds.parse_needs(needs)
+    if isinstance(flex, str):
+        flex = parse_flex(flex)
+
+    counts = dict(deck.zones["main"])
+    candidates = list(variants(counts, flex, min_size, max_size))
+    if not candidates:
+        raise ValueError(f"Nenhuma combinação deixa o Main Deck entre {min_size} e {max_size} cartas.")
+
+    fixed = sum(n for card_id, n in counts.items() if card_id not in {f.card_id for f in flex})
+    sizes = [fixed + sum(copies.values()) for copies in candidates]
+    if hand_size > min(sizes):
+        raise ValueError(f"A mão precisa ter no máximo {min(sizes)} cartas.")
+
+    if odds.is_exact(needs) and not simulate:
+        scores = [odds.exact_odds({**counts, **copies}, needs, hand_size) for copies in candidates]
+    else:
+        _require_numpy()
+        workers = workers or os.cpu_count() or 1
+        scores = _simulate_all(counts, needs, candidates, hand_size, trials, workers, seed)
+
+    ranked = heapq.nlargest(top, range(len(candidates)), key=lambda i: (scores[i], -sizes[i]))
+    return [Variant(scores[i], candidates[i], sizes[i]) for i in ranked]
@@ -0,0 +1,386 @@
+"""Índice invertido para a busca textual de cartas.
+
+Cada termo (palavra do nome ou do texto de efeito, em minúsculas e sem
+acentos) aponta para a lista ordenada de ids das cartas que o contêm e,
+em paralelo, para quantas vezes ele aparece no efeito de cada uma. Com o
+nome normalizado e o tamanho do efeito de cada carta, isso basta para
+ordenar os resultados por relevância sem ler as cartas.
+
+O índice pode ser gravado ao lado da pasta de cartas
+(``database/<lang>.index``) junto com o carimbo do catálogo que o gerou.
+"""
+import heapq
+import json
+import math
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+
+from .catalog import discard, temp_file
+
+_WORD = re.compile(r"\w+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+SHORT_TERM = 2  # termos até esse tamanho casam com quase tudo como trecho de palavra
+INDEX_VERSION = 2
+EXTENSION = ".index"
+DEFAULT_LIMIT = 50
+
+# Parâmetros usuais do BM25: saturação da frequência e peso do tamanho do texto
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Faixas de relevância, da mais forte para a mais fraca
+EXACT_NAME, NAME_PREFIX, NAME_TERMS, EFFECT_ONLY = 3, 2, 1, 0
+
+
+def _accent_table():
+    """Tabela de tradução das letras acentuadas latinas para a letra base."""
+    table = {}
+    for code in range(0xC0, 0x250):
+        decomposed = unicodedata.normalize("NFKD", chr(code))
+        base = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+        if base != chr(code):
+            table[code] = base
+    return table
+
+
+_ACCENTS = _accent_table()
+
+
+def fold(text):
+    """Minúsculas e sem acentos: 'Fusão' -> 'fusao'."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return text.translate(_ACCENTS)
+
+
+@lru_cache(maxsize=65536)
+def _fold_word(word):
+    return word if word.isascii() else word.translate(_ACCENTS)
+
+
+def tokenize(text):
+    """Divide o texto em termos normalizados."""
+    if not text:
+        return []
+    # Separar antes de remover acentos permite reaproveitar cada palavra já
+    # normalizada (o vocabulário é bem menor que o texto)
+    return [_fold_word(word) for word in _WORD.findall(text.lower())]
+
+
+def needs_substring(text):
+    """Se os termos não bastam para a consulta e o texto tem de aparecer como está.
+
+    Vale para consultas com pontuação (``e's``, ``1-card``), que a divisão
+    em termos separaria, e com termos curtos (``é``, ``1 card``), que como
+    trecho de palavra casam com quase todas as cartas.
+    """
+    return bool(_PUNCTUATION.search(text)) or any(len(word) <= SHORT_TERM for word in _WORD.findall(text))
+
+
+def contains(text):
+    """Predicado da busca por substring: se um campo (nome ou efeito) contém ``text``, em minúsculas."""
+    needle = text.lower()
+
+    def has_text(field):
+        return bool(field) and needle in field.lower()
+    return has_text
+
+
+def _query_terms(text, keep):
+    # Com ``keep`` os termos curtos ficam por conta dele: só os outros usam o índice
+    terms = list(dict.fromkeys(tokenize(text)))
+    if keep is not None:
+        terms = [term for term in terms if len(term) > SHORT_TERM]
+    return terms
+
+
+def index_path(folder_path):
+    """database/en -> database/en.index"""
+    return os.path.normpath(folder_path) + EXTENSION
+
+
+def _fields(name, effect):
+    """Termos do nome e contagem dos termos do efeito de uma carta."""
+    return tokenize(name), Counter(tokenize(effect))
+
+
+def _name_tier(name, words, phrase, terms):
+    if name == phrase:
+        return EXACT_NAME
+    if name.startswith(phrase):
+        return NAME_PREFIX
+    if all(any(term in word for word in words) for term in terms):
+        return NAME_TERMS
+    return EFFECT_ONLY
+
+
+def intersect(sets):
+    """Interseção começando pelo menor conjunto; para cedo se esvaziar."""
+    sets = sorted(sets, key=len)
+    result = set(sets[0])
+    for other in sets[1:]:
+        result.intersection_update(other)
+        if not result:
+            break
+    return result
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings = {}  # termo -> lista ordenada de ids
+        self.freqs = {}  # termo -> ocorrências no efeito, em paralelo a postings
+        self.docs = {}  # id -> (nome normalizado, número de termos do efeito)
+        self._vocabulary = None  # termos ordenados, para buscas por prefixo
+        self._avg_length = None
+
+    @classmethod
+    def build(cls, records):
+        """Monta o índice a partir de (id, nome, efeito) de cada carta."""
+        index = cls()
+        for card_id, name, effect in sorted(records, key=lambda r: r[0]):
+            name_terms, effect_terms = _fields(name, effect)
+            index.docs[card_id] = (" ".join(name_terms), sum(effect_terms.values()))
+            for term in set(name_terms).union(effect_terms):
+                posting = index.postings.get(term)
+                if posting is None:
+                    index.postings[term] = [card_id]
+                    index.freqs[term] = [effect_terms[term]]
+                elif posting[-1] != card_id:
+                    posting.append(card_id)
+                    index.freqs[term].append(effect_terms[term])
+        return index
+
+    @classmethod
+    def load(cls, path):
+        """Lê um índice gravado; devolve (índice, carimbo) ou (None, None)."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+
+        if raw.get("version") != INDEX_VERSION:
+            return None, None
+
+        index = cls()
+        index.postings = raw["postings"]
+        index.freqs = raw["freqs"]
+        index.docs = {card_id: (name, length) for card_id, name, length in raw["docs"]}
+        return index, raw["stamp"]
+
+    def save(self, path, stamp):
+        """Grava o índice (via arquivo temporário) com o carimbo do catálogo."""
+        fd, tmp_path = temp_file(path)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": INDEX_VERSION,
+                        "stamp": stamp,
+                        "postings": self.postings,
+                        "freqs": self.freqs,
+                        "docs": [[card_id, name, length] for card_id, (name, length) in self.docs.items()],
+                    },
+                    f, ensure_ascii=False, separators=(",", ":"),
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            discard(tmp_path)
+            raise
+
+    def add(self, card_id, name, effect):
+        name_terms, effect_terms = _fields(name, effect)
+        self.docs[card_id] = (" ".join(name_terms), sum(effect_terms.values()))
+        for term in set(name_terms).union(effect_terms):
+            posting = self.postings.setdefault(term, [])
+            freqs = self.freqs.setdefault(term, [])
+            i = bisect_left(posting, card_id)
+            if i < len(posting) and posting[i] == card_id:
+                freqs[i] = effect_terms[term]
+            else:
+                posting.insert(i, card_id)
+                freqs.insert(i, effect_terms[term])
+        self._vocabulary = None
+        self._avg_length = None
+
+    def remove(self, card_id, name, effect):
+        self.docs.pop(card_id, None)
+        for term in set(tokenize(name) + tokenize(effect)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            i = bisect_left(posting, card_id)
+            if i < len(posting) and posting[i] == card_id:
+                del posting[i]
+                del self.freqs[term][i]
+            if not posting:
+                del self.postings[term]
+                del self.freqs[term]
+        self._vocabulary = None
+        self._avg_length = None
+
+    @property
+    def vocabulary(self):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+
+    def lookup(self, term):
+        """Ids das cartas que contêm exatamente o termo."""
+        return self.postings.get(term, [])
+
+    def lookup_prefix(self, prefix):
+        """Ids das cartas com algum termo que começa com ``prefix``."""
+        vocabulary = self.vocabulary
+        ids = set()
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            ids.update(self.postings[vocabulary[i]])
+            i += 1
+        return ids
+
+    def lookup_infix(self, fragment):
+        """Ids das cartas com algum termo que contém ``fragment``.
+
+        Percorre apenas o vocabulário, não o texto das cartas.
+        """
+        ids = set()
+        for term in self.terms_containing(fragment):
+            ids.update(self.postings[term])
+        return ids
+
+    def terms_containing(self, fragment):
+        return [term for term in self.postings if fragment in term]
+
+    @property
+    def avg_length(self):
+        if self._avg_length is None:
+            self._avg_length = sum(length for _, length in self.docs.values()) / max(len(self.docs), 1)
+        return self._avg_length
+
+    def search(self, text, mode="infix", keep=None):
+        """Ids das cartas que contêm todos os termos da consulta (AND).
+
+        ``mode`` define como cada termo casa com as palavras indexadas:
+        ``"exact"`` (palavra igual), ``"prefix"`` (início da palavra) ou
+        ``"infix"`` (trecho da palavra, como a busca por substring).
+        Devolve None quando a consulta não tem termos indexáveis (vazia ou
+        só pontuação). ``keep`` (id -> bool), se dado, filtra o resultado e
+        responde pelos termos curtos, que não passam pelo índice.
+        """
+        terms = _query_terms(text, keep)
+        if not terms:
+            return None
+
+        lookup = {"exact": self.lookup, "prefix": self.lookup_prefix, "infix": self.lookup_infix}[mode]
+        sets = []
+        for term in terms:
+            ids = lookup(term)
+            if not ids:
+                return set()
+            sets.append(ids)
+
+        ids = intersect(sets)
+        if keep is not None:
+            ids = {card_id for card_id in ids if keep(card_id)}
+        return ids
+
+    def ranked(self, text, limit=DEFAULT_LIMIT, offset=0, keep=None):
+        """Página da busca (mesmas regras de ``search``) ordenada por relevância.
+
+        Devolve (total de acertos, ids de ``offset`` a ``offset + limit``),
+        ou None sem termos indexáveis. Nome igual à consulta vem primeiro,
+        depois nome que começa com ela, nome com todos os termos e, por
+        último, só o efeito; dentro de cada faixa vale o BM25 do efeito.
+        Só os ``offset + limit`` melhores são ordenados (num heap).
+        ``keep`` funciona como em ``search``.
+        """
+        words = tokenize(text)
+        terms = _query_terms(text, keep)
+        if not terms:
+            return None
+
+        # Cada termo da consulta vale pelas palavras que o contêm
+        # (``drag`` -> dragon, dragons, hydragon)
+        expanded = [self.terms_containing(term) for term in terms]
+        matches = []
+        for words_of_term in expanded:
+            ids = set()
+            for word in words_of_term:
+                ids.update(self.postings[word])
+            if not ids:
+                return 0, []
+            matches.append(ids)
+
+        candidates = intersect(matches)
+        if keep is not None:
+            candidates = {card_id for card_id in candidates if keep(card_id)}
+        total = len(candidates)
+        if offset >= total:
+            return total, []
+
+        # Ocorrências no efeito só dos candidatos; a frequência de documento
+        # (para o idf) soma as das palavras expandidas
+        docs = self.docs
+        occurrences = []
+        weights = []
+        for words_of_term in expanded:
+            counts = Counter()
+            frequency = 0
+            for word in words_of_term:
+                freqs = self.freqs[word]
+                frequency += len(freqs) - freqs.count(0)
+                for card_id, freq in zip(self.postings[word], freqs):
+                    if freq and card_id in candidates:
+                        counts[card_id] += freq
+            occurrences.append(counts)
+            weights.append(math.log(1 + (len(docs) - frequency + 0.5) / (frequency + 0.5)))
+
+        avg = self.avg_length or 1.0
+        phrase = " ".join(words)
+
+        def score(card_id):
+            name, length = docs.get(card_id, ("", 0))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg)
+            bm25 = 0.0
+            for weight, counts in zip(weights, occurrences):
+                freq = counts.get(card_id)
+                if freq:
+                    bm25 += weight * freq * (BM25_K1 + 1) / (freq + norm)
+            return _name_tier(name, name.split(), phrase, terms), bm25, -card_id
+
+        best = heapq.nlargest(offset + limit, candidates, key=score)
+        return total, best[offset:]
+
+
+def sync_index(path, update, text_records):
+    """Índice gravado em ``path`` alinhado ao catálogo descrito por ``update``.
+
+    ``update`` é o CatalogUpdate da última sincronização do catálogo e
+    ``text_records`` devolve (id, nome, efeito) de todas as cartas; só é
+    chamado quando o índice precisa ser reconstruído do zero.
+    """
+    index, stamp = SearchIndex.load(path)
+
+    if index is not None and stamp == update.stamp:
+        return index
+
+    if index is not None and stamp == update.previous:
+        # Reindexa só as cartas dos arquivos que mudaram
+        for data in update.removed:
+            index.remove(data["id"], data.get("name"), data.get("effectText"))
+        for data in update.added:
+            index.add(data["id"], data.get("name"), data.get("effectText"))
+    else:
+        index = SearchIndex.build(text_records())
+
+    try:
+        index.save(path, update.stamp)
+    except OSError:
+        pass  # sem onde gravar (somente leitura, disco cheio): fica só em memória
+    return index
@@ -0,0 +1,192 @@
+"""Servidor local que mantém a base de cartas e os decks em memória.
+
+Carrega o CardDatabase e o DeckManager uma vez e atende clientes por um
+socket Unix (padrão) ou por TCP em localhost, com asyncio. O protocolo é
+JSON lines: cada linha enviada é uma requisição e recebe uma linha de
+resposta, na mesma ordem.
+
+    {"command": "show_deck Dragoes"}     qualquer comando da CLI
+    {"op": "get", "id": 15579}           carta completa
+    {"op": "search", "text": "dragão"}   ids e nomes por relevância (``limit``/``offset``)
+    {"op": "query", "text": "atk>=3000"} ids e nomes (até ``limit``)
+    {"op": "shutdown"}                   grava os decks e encerra (fecha as outras conexões)
+
+Cada conexão é uma tarefa própria e cada requisição roda numa thread
+(``asyncio.to_thread``), com sua própria saída (``CardCLI.session``):
+um comando lento (``simulate``, ``optimize``, uma busca grande) não segura
+os outros clientes. Os decks ficam consistentes pelas travas por deck do
+DeckManager. Os decks alterados são gravados ao encerrar (e nas
+compactações do diário).
+
+    python server.py                  # socket em data/yugidb.sock
+    python server.py --port 8765      # TCP em 127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import sys
+import threading
+
+from cli import CardCLI, run_batch
+
+DEFAULT_SOCKET = "data/yugidb.sock"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_LIMIT = 50
+
+
+def _cards(cards, limit):
+    return _page(len(cards), cards[:limit])
+
+
+def _page(total, cards):
+    return {"ok": True, "total": total, "cards": [[c.id, c.name] for c in cards]}
+
+
+class CardServer:
+    def __init__(self, cli):
+        self.cli = cli
+        self.address = None  # caminho do socket ou (host, porta), depois de iniciar
+        self.started = threading.Event()
+        self._server = None
+        self._stop = None
+        self._loop = None
+        self._clients = {}  # tarefa de cada conexão aberta -> seu writer
+
+    def handle_request(self, request):
+        op = request.get("op", "command")
+
+        if op == "command":
+            results = run_batch(self.cli, [request.get("command", "")])
+            return results[0] if results else {"ok": False, "error": "Comando vazio."}
+
+        if op == "get":
+            card = self.cli.db.get(int(request["id"]))
+            if card is None:
+                return {"ok": False, "error": "Carta não encontrada."}
+            return {"ok": True, "card": card.to_dict()}
+
+        if op == "search":
+            limit, offset = request.get("limit", DEFAULT_LIMIT), request.get("offset", 0)
+            return _page(*self.cli.db.search_ranked(request["text"], limit, offset))
+
+        if op == "query":
+            try:
+                cards = self.cli.db.query(request["text"])
+            except ValueError as e:
+                return {"ok": False, "error": str(e)}
+            return _cards(cards, request.get("limit", DEFAULT_LIMIT))
+
+        if op == "shutdown":
+            self.stop()
+            return {"ok": True}
+
+        return {"ok": False, "error": f"Operação desconhecida: {op}"}
+
+    async def handle(self, reader, writer):
+        self._clients[asyncio.current_task()] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                    if request.get("op") == "shutdown":
+                        response = self.handle_request(request)  # no laço: responde antes de fechar
+                    else:
+                        response = await asyncio.to_thread(self.handle_request, request)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    response = {"ok": False, "error": f"Requisição inválida: {e}"}
+
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.pop(asyncio.current_task(), None)
+            writer.close()
+
+    def stop(self):
+        """Encerra o servidor; pode ser chamado de qualquer thread."""
+        if self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    async def start(self, path=DEFAULT_SOCKET, host=DEFAULT_HOST, port=None):
+        """Abre o socket: em ``path`` (socket Unix) ou, com ``port``, em TCP."""
+        self._stop = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+        if port is None:
+            if os.path.exists(path):
+                os.remove(path)  # socket de uma execução anterior
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._server = await asyncio.start_unix_server(self.handle, path)
+            self.address = path
+        else:
+            self._server = await asyncio.start_server(self.handle, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+
+        # Índice de busca carregado antes do primeiro cliente
+        self.cli.db.index
+        self.started.set()
+
+    async def wait(self):
+        """Atende até ``stop()``."""
+        try:
+            async with self._server:
+                await self._stop.wait()
+                await self._disconnect()
+        finally:
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.remove(self.address)
+
+    async def _disconnect(self):
+        # Fecha as conexões ainda abertas: cada tarefa lê o fim do arquivo e
+        # termina (depois do comando em andamento, se houver). Sem isso o
+        # fechamento do servidor espera os clientes saírem (Python 3.12.1+).
+        self._server.close()
+        tasks = list(self._clients)
+        for writer in self._clients.values():
+            writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def serve(self, path=DEFAULT_SOCKET, host=DEFAULT_HOST, port=None):
+        await self.start(path, host, port)
+        await self.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="caminho do socket Unix")
+    parser.add_argument("--port", type=int, help="usa TCP nesta porta em vez do socket Unix")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = CardCLI(defer_writes=True)
+    server = CardServer(cli)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(sig, server.stop)
+
+        await server.start(args.socket, args.host, args.port)
+        print(f"Servidor pronto em {server.address}", flush=True)
+        await server.wait()
+
+    try:
+        asyncio.run(run())
+    finally:
+        cli.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
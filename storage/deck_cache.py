@@ -0,0 +1,148 @@
+from collections.abc import MutableMapping
+
+
+class DeckCache(MutableMapping):
+    """Decks de um backend (nome -> Deck), lidos só no primeiro acesso.
+
+    Os nomes vêm de ``store.names()``, sem ler nenhum deck, então listar e
+    contar é imediato mesmo com milhares de decks. Os decks criados,
+    alterados ou apagados desde a última gravação ficam marcados para que
+    ``flush`` escreva só eles.
+    """
+
+    def __init__(self, store=None, resolve=None):
+        self.store = store
+        self.resolve = resolve
+        self._decks = dict.fromkeys(store.names() if store is not None else ())  # None = ainda não lido
+        self.dirty = set()
+        self.deleted = set()
+        self.on_write = []  # chamados com (decks, nomes apagados) depois de cada gravação
+        self.on_read = []  # chamados com cada deck lido do backend
+
+    def __getitem__(self, name):
+        deck = self._decks[name]
+        if deck is None:
+            deck = self.fill(name, self.read(name))
+            if deck is None:
+                raise KeyError(name)
+        return deck
+
+    def __setitem__(self, name, deck):
+        self._decks[name] = deck
+        self.dirty.add(name)
+        self.deleted.discard(name)
+
+    def __delitem__(self, name):
+        del self._decks[name]
+        self.dirty.discard(name)
+        self.deleted.add(name)
+
+    def __contains__(self, name):
+        return name in self._decks
+
+    def __iter__(self):
+        return iter(self._decks)
+
+    def __len__(self):
+        return len(self._decks)
+
+    def peek(self, name):
+        """O deck se já está em memória; None se não existe ou ainda não foi lido."""
+        return self._decks.get(name)
+
+    def read(self, name):
+        """Lê o deck do backend sem guardá-lo (veja ``fill``)."""
+        return self.store.load(name, self.resolve)
+
+    def fill(self, name, deck):
+        """Guarda um deck lido com ``read``, a menos que outro já esteja em memória."""
+        if name not in self._decks:
+            return None
+        if self._decks[name] is None:
+            if deck is None:
+                # Sumiu do backend depois da listagem
+                del self._decks[name]
+                return None
+            self._decks[name] = deck
+            for callback in self.on_read:
+                callback(deck)
+        return self._decks[name]
+
+    def loaded(self):
+        """Nomes dos decks já lidos do backend (ou criados nesta sessão)."""
+        return [name for name, deck in self._decks.items() if deck is not None]
+
+    def mark_dirty(self, name):
+        self.dirty.add(name)
+
+    def write(self, decks, deleted=()):
+        """Grava os decks e apaga ``deleted`` no backend, avisando ``on_write``."""
+        if self.store is None:
+            return
+        self.store.write_many(decks, deleted)
+        for callback in self.on_write:
+            callback(decks, deleted)
+
+    def flush(self, names=None):
+        """Grava os decks alterados e apaga os removidos (só ``names``, se dado)."""
+        save = set(self.dirty) if names is None else self.dirty & set(names)
+        delete = set(self.deleted) if names is None else self.deleted & set(names)
+        if save or delete:
+            self.write([self._decks[name] for name in save], delete)
+
+        self.dirty -= save
+        self.deleted -= delete
+
+
+class CardUsage:
+    """Índice reverso: id da carta -> nomes dos decks que a usam.
+
+    É montado na primeira consulta a partir do que está gravado
+    (``store.card_usage()``) e dos decks alterados ainda não gravados;
+    depois disso o DeckManager o atualiza a cada alteração.
+    """
+
+    def __init__(self, decks):
+        self.decks = decks  # DeckCache
+        self._where = None
+
+    @property
+    def ready(self):
+        return self._where is not None
+
+    def _index(self):
+        if self._where is None:
+            decks = self.decks
+            saved = decks.store.card_usage() if decks.store is not None else {}
+            changed = decks.dirty | decks.deleted
+
+            self._where = {}
+            for name, ids in saved.items():
+                if name not in changed:
+                    for card_id in ids:
+                        self._where.setdefault(card_id, set()).add(name)
+            for name in decks.dirty:
+                self.add_deck(name, decks[name])
+        return self._where
+
+    def add(self, name, card_id):
+        if self._where is not None:
+            self._where.setdefault(card_id, set()).add(name)
+
+    def discard(self, name, card_id):
+        names = self._where.get(card_id) if self._where is not None else None
+        if names:
+            names.discard(name)
+            if not names:
+                del self._where[card_id]
+
+    def add_deck(self, name, deck):
+        for card_id in deck.ids():
+            self.add(name, card_id)
+
+    def discard_deck(self, name, deck):
+        for card_id in list(deck.ids()):
+            self.discard(name, card_id)
+
+    def decks_containing(self, card_id):
+        return sorted(self._index().get(card_id, ()))
@@ -0,0 +1,179 @@
+"""Diário (write-ahead log) das alterações nos decks.
+
+Cada alteração feita pelo DeckManager (criar, adicionar, remover, renomear,
+esvaziar, apagar) vira uma linha JSON com um número de sequência,
+acrescentada ao diário antes de ser aplicada na memória. De tempos em
+tempos os decks são gravados no backend (``DeckStore``) e o diário
+recomeça, com uma linha de checkpoint que preserva a numeração.
+
+Cada deck salvo guarda o número da última alteração aplicada a ele
+(``seq``). Na abertura, as entradas do diário são reaplicadas só nos decks
+em que ainda não constam, então uma queda no meio da compactação não
+duplica nada. Para isso a numeração nunca fica atrás de um deck lido: um
+deck com ``seq`` maior que o diário (copiado de outra instalação, de um
+backup, ou salvo antes de o diário ser apagado) a faz avançar. Uma linha cortada no fim (queda no meio da escrita) é
+descartada.
+
+Cada linha vai para o sistema operacional com ``flush`` assim que é escrita,
+então um crash do processo não perde nada. O fsync é feito em lotes (a cada
+``sync_every`` entradas ou ``sync_interval`` segundos, e ao fechar): numa
+queda de energia perde-se no máximo o último lote.
+
+O diário em si não tem trava: o DeckManager escreve nele sob a sua.
+"""
+import json
+import os
+import time
+
+from models.deck import Deck
+
+from .storage import write_atomic
+
+
+def _pending(decks, name, seq):
+    """Se a entrada ``seq`` ainda não foi aplicada ao deck ``name``."""
+    deck = decks.get(name)
+    return deck is None or deck.seq < seq
+
+
+def apply_entry(decks, entry, resolve):
+    """Reaplica uma entrada do diário em ``decks`` (um DeckCache)."""
+    op, name, seq = entry["op"], entry["deck"], entry["seq"]
+
+    if op == "create":
+        if _pending(decks, name, seq):
+            decks[name] = Deck(name)
+            decks[name].seq = seq
+    elif op == "delete":
+        if name in decks and _pending(decks, name, seq):
+            del decks[name]
+    elif op == "rename":
+        new = entry["new"]
+        if not _pending(decks, new, seq):
+            # O deck já foi salvo com o nome novo; falta só tirar o antigo
+            if name in decks and _pending(decks, name, seq):
+                del decks[name]
+        elif name in decks:
+            deck = decks.pop(name)
+            deck.name = new
+            deck.seq = seq
+            decks[new] = deck
+    elif name in decks and _pending(decks, name, seq):
+        deck = decks[name]
+        if op == "clear":
+            deck.clear()
+        elif op == "add":
+            card = resolve(entry["card"])
+            if card:
+                deck.add_card(card, entry["amount"], entry["zone"])
+        elif op == "remove":
+            deck.remove_card(entry["card"], entry["amount"], entry.get("zone"))
+        deck.seq = seq
+        decks.mark_dirty(name)
+
+
+class DeckJournal:
+    def __init__(self, store, sync_every=32, sync_interval=1.0, compact_every=1000):
+        self.store = store
+        self.path = store.journal_path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+
+        self.seq = 0  # número da última entrada escrita
+        self.entries = 0  # entradas desde a última compactação
+        self._file = None
+        self._pending = 0  # entradas ainda sem fsync
+        self._last_sync = time.monotonic()
+
+    def load(self, decks, resolve):
+        """Reaplica o diário em ``decks`` (um DeckCache) e o abre para escrita.
+
+        ``resolve`` converte id em carta (``db.get``). Só os decks citados no
+        diário são lidos do backend; eles ficam marcados como alterados.
+        """
+        for name in decks.loaded():
+            self.saw(decks.peek(name))
+        decks.on_read.append(self.saw)
+        good = self.replay(decks, resolve)
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() != good:
+            # Descarta a linha cortada no fim
+            self._file.truncate(good)
+            self._sync()
+
+    def replay(self, decks, resolve):
+        """Reaplica o diário em ``decks`` sem abrir nada para escrita.
+
+        Devolve até onde o diário está íntegro (em bytes).
+        """
+        good = 0  # fim da última linha íntegra
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+
+                    good += len(line)
+                    self.seq = max(self.seq, entry["seq"])
+                    if entry["op"] != "checkpoint":
+                        apply_entry(decks, entry, resolve)
+                        self.entries += 1
+        return good
+
+    def saw(self, deck):
+        """Avança a numeração até o ``seq`` de um deck lido do backend."""
+        self.seq = max(self.seq, deck.seq)
+
+    def append(self, op, deck, **fields):
+        """Acrescenta uma entrada ao diário e devolve seu número de sequência."""
+        self.seq += 1
+        entry = {"seq": self.seq, "op": op, "deck": deck, **fields}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.entries += 1
+        self._pending += 1
+
+        if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self._sync()
+        return self.seq
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        """Força o fsync das entradas pendentes."""
+        if self._pending:
+            self._sync()
+
+    def needs_compaction(self):
+        return self.entries >= self.compact_every
+
+    def compact(self, decks):
+        """Grava no backend os decks alterados de ``decks`` e zera o diário."""
+        decks.flush()
+        self.checkpoint()
+
+    def checkpoint(self):
+        """Recomeça o diário; a linha de checkpoint mantém a numeração."""
+        self._file.close()
+        line = json.dumps({"seq": self.seq, "op": "checkpoint"})
+        write_atomic(self.path, line + "\n")
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.entries = 0
+        self._pending = 0
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,55 @@
+"""Copia os decks de um backend para outro (ex.: pasta JSON -> SQLite).
+
+    python -m storage.migrate data/decks data/decks.db
+
+As alterações ainda pendentes no diário da origem são aplicadas antes da
+cópia. Os decks são gravados no destino em lotes de ``batch_size``, cada
+lote em uma transação. A origem não é alterada.
+"""
+import argparse
+import sys
+
+from .deck_cache import DeckCache
+from .journal import DeckJournal
+from .storage import open_store
+
+
+def _keep_id(card_id):
+    # Sem a base de cartas: o deck guarda só os ids, que é o que é salvo
+    return card_id
+
+
+def migrate(source, dest, batch_size=500):
+    """Copia todos os decks de ``source`` para ``dest`` e devolve quantos foram."""
+    src, dst = open_store(source), open_store(dest)
+    try:
+        cache = DeckCache(src, _keep_id)
+        DeckJournal(src).replay(cache, _keep_id)
+        decks = list(cache.values())
+
+        # O diário do destino começa do zero; a numeração da origem não vale lá
+        for deck in decks:
+            deck.seq = 0
+
+        for start in range(0, len(decks), batch_size):
+            dst.write_many(decks[start:start + batch_size])
+        return len(decks)
+    finally:
+        src.close()
+        dst.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="pasta JSON ou arquivo .db de origem")
+    parser.add_argument("dest", help="pasta JSON ou arquivo .db de destino")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    count = migrate(args.source, args.dest, args.batch_size)
+    print(f"{count} deck(s) copiados de {args.source} para {args.dest}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Relevância das cartas no acervo de decks salvos.
+
+Para cada carta: em quantos decks ela aparece (taxa de inclusão), quantas
+cópias tem em média nesses decks e com quais outras cartas divide deck.
+As coocorrências ficam numa matriz esparsa carta x carta, um contador por
+carta só com os pares que existem, então "jogadas com X" é uma ordenação
+da linha de X.
+
+O índice é montado na primeira consulta lendo os decks do backend. Depois
+disso cada gravação (``DeckCache.write``) troca só a contribuição dos
+decks gravados: O(k²) para k cartas distintas no deck, sem reler o resto.
+"""
+import heapq
+import threading
+from collections import Counter, namedtuple
+
+from models.deck import ZONES
+
+DEFAULT_LIMIT = 10
+
+Relevance = namedtuple("Relevance", "card_id decks inclusion copies")
+Partner = namedtuple("Partner", "card_id decks share")
+
+
+def deck_counts(deck):
+    """Cópias de cada carta no deck, somando as zonas: {id: n}."""
+    counts = Counter()
+    for zone in ZONES:
+        counts.update(deck.zones[zone])
+    return dict(counts)
+
+
+def raw_counts(raw):
+    """Como ``deck_counts``, a partir do registro salvo (aceita o formato antigo)."""
+    counts = Counter(int(cid) for cid in raw.get("cards", ()))
+    for zone in ZONES:
+        for cid, amount in raw.get(zone, {}).items():
+            counts[int(cid)] += amount
+    return dict(counts)
+
+
+class CardRelevance:
+    """Inclusão, cópias médias e coocorrência das cartas nos decks salvos.
+
+    Acompanha as gravações do DeckCache; decks alterados e ainda não
+    gravados não entram na conta. Tem trava própria, então pode ser
+    consultado de qualquer thread.
+    """
+
+    def __init__(self, decks):
+        self.decks = decks  # DeckCache
+        self._counted = None  # nome -> {id: cópias}, como foi contado
+        self._decks_with = Counter()  # id -> decks que usam a carta
+        self._copies = Counter()  # id -> cópias somadas nesses decks
+        self._pairs = {}  # id -> Counter(outro id -> decks com as duas); a diagonal repete _decks_with
+        self._lock = threading.Lock()
+        decks.on_write.append(self.written)
+
+    @property
+    def ready(self):
+        return self._counted is not None
+
+    def _index(self):
+        # Chamado com a trava
+        if self._counted is None:
+            self._counted = {}
+            store = self.decks.store
+            for name in store.names() if store is not None else ():
+                raw = store.read(name)
+                if raw is not None:
+                    self._add(name, raw_counts(raw))
+
+    def _add(self, name, counts):
+        self._counted[name] = counts
+        for card_id, amount in counts.items():
+            self._decks_with[card_id] += 1
+            self._copies[card_id] += amount
+            # Counter.update conta as chaves em C; a própria carta entra junto
+            self._pairs.setdefault(card_id, Counter()).update(counts.keys())
+
+    def _discard(self, name):
+        counts = self._counted.pop(name, None)
+        if counts is None:
+            return
+        for card_id, amount in counts.items():
+            self._decks_with[card_id] -= 1
+            self._copies[card_id] -= amount
+            if not self._decks_with[card_id]:
+                del self._decks_with[card_id], self._copies[card_id], self._pairs[card_id]
+                continue
+            row = self._pairs[card_id]
+            for other in counts:
+                row[other] -= 1
+                if not row[other]:
+                    del row[other]
+
+    def written(self, decks, deleted=()):
+        """Atualiza o índice com os decks gravados e apagados no backend."""
+        with self._lock:
+            if self._counted is None:
+                return  # será lido do backend, já com eles, na primeira consulta
+            for name in deleted:
+                self._discard(name)
+            for deck in decks:
+                self._discard(deck.name)
+                self._add(deck.name, deck_counts(deck))
+
+    def __len__(self):
+        """Número de decks contados."""
+        with self._lock:
+            self._index()
+            return len(self._counted)
+
+    def _stats(self, card_id):
+        decks = self._decks_with.get(card_id, 0)
+        inclusion = decks / len(self._counted) if self._counted else 0.0
+        copies = self._copies[card_id] / decks if decks else 0.0
+        return Relevance(card_id, decks, inclusion, copies)
+
+    def stats(self, card_id):
+        """Relevance(id, decks que usam a carta, fração dos decks, cópias médias nesses decks)."""
+        with self._lock:
+            self._index()
+            return self._stats(card_id)
+
+    def top(self, limit=DEFAULT_LIMIT):
+        """As cartas presentes em mais decks: [Relevance]."""
+        with self._lock:
+            self._index()
+            ids = heapq.nsmallest(limit, self._decks_with, key=lambda c: (-self._decks_with[c], c))
+            return [self._stats(card_id) for card_id in ids]
+
+    def played_with(self, card_id, limit=DEFAULT_LIMIT):
+        """As cartas que mais aparecem junto com ``card_id``: [Partner].
+
+        ``share`` é a fração dos decks com ``card_id`` que também têm a outra.
+        """
+        with self._lock:
+            self._index()
+            row = self._pairs.get(card_id)
+            if row is None:
+                return []
+            total = self._decks_with[card_id]
+            others = (other for other in row if other != card_id)
+            ids = heapq.nsmallest(limit, others, key=lambda c: (-row[c], c))
+            return [Partner(other, row[other], row[other] / total) for other in ids]
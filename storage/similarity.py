@@ -0,0 +1,150 @@
+"""Decks parecidos por MinHash e LSH.
+
+A assinatura MinHash de um deck resume o multiconjunto das suas cartas (a
+n-ésima cópia de uma carta é um elemento à parte, então 3x e 1x da mesma
+carta não contam como iguais): é o menor valor de cada uma de ``HASHES``
+funções de hash sobre os elementos. A fração de posições iguais entre duas
+assinaturas estima a similaridade de Jaccard dos decks.
+
+Os backends guardam a assinatura de cada deck salvo, para não recalculá-las
+a cada início (``DeckStore.signatures``). O índice LSH divide a assinatura
+em ``BANDS`` faixas; decks com alguma faixa idêntica caem no mesmo balde e
+só eles são comparados, sem percorrer o acervo todo. Com 32 faixas de 4
+valores, pares a partir de ~0,4 de similaridade quase sempre se encontram.
+"""
+import heapq
+import random
+import threading
+from collections import namedtuple
+
+from models import optional
+
+from .relevance import deck_counts
+
+HASHES = 128
+BANDS = 32
+ROWS = HASHES // BANDS
+DEFAULT_LIMIT = 10
+
+# Hashes (a * x + b) mod p; com p < 2^31 a conta cabe em int64 no NumPy
+_PRIME = (1 << 31) - 1
+_SEED = 20240601  # fixo: as assinaturas gravadas precisam continuar comparáveis
+_rng = random.Random(_SEED)
+_PARAMS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(HASHES)]
+_arrays = None  # (np, a, b) montados na primeira assinatura; () sem NumPy
+
+Similar = namedtuple("Similar", "name jaccard")
+
+
+def _elements(counts):
+    # Elemento da n-ésima cópia: id e n juntos num inteiro menor que p
+    return [((card_id << 8) | copy) % _PRIME for card_id, amount in counts.items() for copy in range(min(amount, 255))]
+
+
+def _vectorized():
+    # NumPy (opcional) só na primeira assinatura: sem ele elas saem iguais, só mais devagar
+    global _arrays
+    if _arrays is None:
+        np = optional.numpy()
+        if np is None:
+            _arrays = ()
+        else:
+            a = np.array([a for a, _ in _PARAMS], dtype=np.int64)[:, None]
+            b = np.array([b for _, b in _PARAMS], dtype=np.int64)[:, None]
+            _arrays = (np, a, b)
+    return _arrays
+
+
+def signature(counts):
+    """Assinatura MinHash de {id: cópias}: tupla de ``HASHES`` inteiros (vazia para deck vazio)."""
+    elements = _elements(counts)
+    if not elements:
+        return ()
+    vectorized = _vectorized()
+    if vectorized:
+        np, a, b = vectorized
+        x = np.array(elements, dtype=np.int64)
+        return tuple(((a * x + b) % _PRIME).min(axis=1).tolist())
+    return tuple(min((a * x + b) % _PRIME for x in elements) for a, b in _PARAMS)
+
+
+def estimate(a, b):
+    """Similaridade de Jaccard estimada pelas posições iguais das assinaturas."""
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / HASHES
+
+
+def _bands(sig):
+    return [(band, sig[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+class SimilarDecks:
+    """Índice LSH das assinaturas dos decks salvos.
+
+    Montado na primeira consulta a partir de ``store.signatures()`` e, como
+    o CardRelevance, atualizado a cada gravação do DeckCache. Decks vazios
+    não entram no índice.
+    """
+
+    def __init__(self, decks):
+        self.decks = decks  # DeckCache
+        self._signatures = None  # nome -> assinatura
+        self._buckets = {}  # (faixa, valores) -> nomes
+        self._lock = threading.Lock()
+        decks.on_write.append(self.written)
+
+    def _index(self):
+        # Chamado com a trava
+        if self._signatures is None:
+            self._signatures = {}
+            store = self.decks.store
+            for name, sig in (store.signatures() if store is not None else {}).items():
+                self._add(name, tuple(sig))
+
+    def _add(self, name, sig):
+        if not sig:
+            return
+        self._signatures[name] = sig
+        for key in _bands(sig):
+            self._buckets.setdefault(key, set()).add(name)
+
+    def _discard(self, name):
+        sig = self._signatures.pop(name, None)
+        if sig is None:
+            return
+        for key in _bands(sig):
+            names = self._buckets[key]
+            names.discard(name)
+            if not names:
+                del self._buckets[key]
+
+    def written(self, decks, deleted=()):
+        """Atualiza o índice com os decks gravados e apagados no backend."""
+        with self._lock:
+            if self._signatures is None:
+                return
+            for name in deleted:
+                self._discard(name)
+            for deck in decks:
+                self._discard(deck.name)
+                self._add(deck.name, signature(deck_counts(deck)))
+
+    def similar(self, deck, limit=DEFAULT_LIMIT):
+        """Os decks salvos mais parecidos com ``deck``: [Similar(nome, Jaccard estimado)].
+
+        Só os decks que dividem algum balde com ele são comparados; o
+        próprio deck (pelo nome) fica de fora.
+        """
+        sig = signature(deck_counts(deck))
+        if not sig:
+            return []
+        with self._lock:
+            self._index()
+            candidates = set()
+            for key in _bands(sig):
+                candidates |= self._buckets.get(key, set())
+            candidates.discard(deck.name)
+            scored = [(estimate(sig, self._signatures[name]), name) for name in candidates]
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1]))
+        return [Similar(name, score) for score, name in best]
@@ -0,0 +1,141 @@
+"""Backend de decks em um único arquivo SQLite.
+
+Pensado para arquivos com dezenas de milhares de decks: os nomes ficam em
+uma tabela indexada (listar não lê nenhuma carta), cada deck é lido com uma
+consulta pela chave e as gravações em lote usam uma única transação. O
+banco roda em modo WAL, então leituras não esperam gravações. A conexão é
+compartilhada entre threads, uma operação de cada vez. A assinatura MinHash
+de cada deck (``storage.similarity``) é gravada junto, numa tabela à parte.
+"""
+import sqlite3
+import threading
+from array import array
+
+from models.deck import ZONES
+
+from .relevance import deck_counts, raw_counts
+from .similarity import signature
+from .storage import DeckStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    seq INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS deck_cards (
+    deck_id INTEGER NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+    zone TEXT NOT NULL,
+    card_id INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (deck_id, zone, card_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS deck_cards_card ON deck_cards(card_id);
+CREATE TABLE IF NOT EXISTS deck_signatures (
+    deck_id INTEGER PRIMARY KEY REFERENCES decks(id) ON DELETE CASCADE,
+    signature BLOB NOT NULL
+);
+"""
+
+
+class SqliteDeckStore(DeckStore):
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def names(self):
+        with self._lock:
+            return [name for (name,) in self.conn.execute("SELECT name FROM decks ORDER BY id")]
+
+    def __contains__(self, name):
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM decks WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def read(self, name):
+        with self._lock:
+            row = self.conn.execute("SELECT id, seq FROM decks WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+
+            deck_id, seq = row
+            rows = self.conn.execute(
+                "SELECT zone, card_id, amount FROM deck_cards WHERE deck_id = ? ORDER BY position",
+                (deck_id,),
+            ).fetchall()
+
+        raw = {"name": name, **{zone: {} for zone in ZONES}}
+        if seq:
+            raw["seq"] = seq
+        for zone, card_id, amount in rows:
+            raw[zone][card_id] = amount
+        return raw
+
+    def card_usage(self):
+        with self._lock:
+            usage = {name: [] for name in self.names()}
+            rows = self.conn.execute(
+                "SELECT d.name, c.card_id FROM deck_cards c JOIN decks d ON d.id = c.deck_id ORDER BY c.deck_id, c.position"
+            ).fetchall()
+        for name, card_id in rows:
+            usage[name].append(card_id)
+        # A mesma carta pode estar em mais de uma zona
+        return {name: list(dict.fromkeys(ids)) for name, ids in usage.items()}
+
+    def signatures(self):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT d.id, d.name, s.signature FROM decks d LEFT JOIN deck_signatures s ON s.deck_id = d.id"
+            ).fetchall()
+            signatures = {name: list(array("Q", blob)) for _, name, blob in rows if blob is not None}
+
+            # Decks gravados antes das assinaturas existirem ganham a sua agora
+            missing = [(deck_id, name) for deck_id, name, blob in rows if blob is None]
+            if missing:
+                with self.conn:
+                    for deck_id, name in missing:
+                        signatures[name] = list(signature(raw_counts(self.read(name))))
+                        self._write_signature(deck_id, signatures[name])
+        return signatures
+
+    def _write_signature(self, deck_id, sig):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO deck_signatures (deck_id, signature) VALUES (?, ?)",
+            (deck_id, array("Q", sig).tobytes()),
+        )
+
+    def write_many(self, decks, deleted=()):
+        """Grava e apaga decks em uma única transação."""
+        with self._lock, self.conn:
+            self.conn.executemany("DELETE FROM decks WHERE name = ?", [(name,) for name in deleted])
+
+            for deck in decks:
+                self.conn.execute(
+                    "INSERT INTO decks (name, seq) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET seq = excluded.seq",
+                    (deck.name, deck.seq),
+                )
+                deck_id = self.conn.execute("SELECT id FROM decks WHERE name = ?", (deck.name,)).fetchone()[0]
+
+                self.conn.execute("DELETE FROM deck_cards WHERE deck_id = ?", (deck_id,))
+                raw = deck.to_dict()
+                rows = [
+                    (deck_id, zone, card_id, amount, position)
+                    for zone in ZONES
+                    for position, (card_id, amount) in enumerate(raw[zone].items())
+                ]
+                self.conn.executemany(
+                    "INSERT INTO deck_cards (deck_id, zone, card_id, amount, position) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._write_signature(deck_id, signature(deck_counts(deck)))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -1,16 +1,296 @@
 import json
 import os
-from models.deck import Deck
+import threading
+from abc import ABC, abstractmethod
+from models.catalog import discard, temp_file
+from models.deck import ZONES, Deck
+
+from .relevance import raw_counts
+from .similarity import signature
 
 DEFAULT_FOLDER = "data/decks"
+JOURNAL_NAME = "decks.journal"
+USAGE_NAME = "decks.usage"
+SIGNATURES_NAME = "decks.minhash"
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+SIDECAR_COMPACT_MIN = 64  # linhas acrescentadas aos arquivos auxiliares antes de reescrevê-los
+
+
+def _fsync_dir(folder):
+    # Garante que o rename em si chegou ao disco (não funciona no Windows)
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path, text):
+    """Grava ``text`` em ``path`` sem deixar o arquivo pela metade.
+
+    Escreve em um temporário exclusivo na mesma pasta, faz fsync e o
+    renomeia por cima do destino: quem lê vê o arquivo antigo ou o novo,
+    nunca um misto, e dois processos gravando o mesmo deck não dividem o
+    temporário. Se algo falha, o temporário é apagado.
+    """
+    fd, tmp_path = temp_file(path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        discard(tmp_path)
+        raise
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+def _raw_ids(raw):
+    ids = {}
+    for zone in ZONES:
+        ids.update(dict.fromkeys(int(cid) for cid in raw.get(zone, ())))
+    return list(ids)
+
+
+def _raw_signature(raw):
+    return list(signature(raw_counts(raw)))
+
+
+def deck_record(deck):
+    """Registro salvo de um deck: ``to_dict`` mais o número de sequência."""
+    raw = deck.to_dict()
+    if deck.seq:
+        raw["seq"] = deck.seq
+    return raw
+
+
+class DeckStore(ABC):
+    """Interface dos backends onde os decks ficam salvos.
+
+    Os registros seguem o formato de ``Deck.to_dict`` (com ``"seq"``). Os
+    decks são lidos um a um, sob demanda; ``write_many`` grava e apaga
+    vários de uma vez. Os backends podem ser usados por várias threads.
+    """
+
+    journal_path = None  # onde fica o diário de alterações deste backend
+
+    @abstractmethod
+    def names(self):
+        """Nomes dos decks salvos."""
+
+    @abstractmethod
+    def read(self, name):
+        """Registro do deck, ou None se ele não existe."""
+
+    @abstractmethod
+    def write_many(self, decks, deleted=()):
+        """Grava ``decks`` e apaga os nomes em ``deleted``, numa só operação."""
+
+    def card_usage(self):
+        """Ids das cartas de cada deck salvo: {nome: [id, ...]}.
+
+        Os backends guardam isso à parte para que o índice reverso
+        (carta -> decks) não precise ler todos os decks.
+        """
+        usage = {}
+        for name in self.names():
+            raw = self.read(name)
+            if raw is not None:
+                usage[name] = _raw_ids(raw)
+        return usage
+
+    def signatures(self):
+        """Assinatura MinHash (``storage.similarity``) de cada deck salvo: {nome: [int, ...]}.
+
+        Os backends a guardam junto do deck, para não recalcular no início.
+        """
+        signatures = {}
+        for name in self.names():
+            raw = self.read(name)
+            if raw is not None:
+                signatures[name] = _raw_signature(raw)
+        return signatures
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    def load(self, name, resolve):
+        raw = self.read(name)
+        return None if raw is None else Deck.from_dict(raw, resolve)
+
+    def save(self, deck):
+        self.write_many([deck])
+
+    def delete(self, name):
+        self.write_many([], [name])
+
+    def close(self):
+        pass
+
+
+class JsonDeckStore(DeckStore):
+    """Um arquivo ``<nome>.json`` por deck (o formato original).
+
+    Os ids das cartas de cada deck ficam também em ``decks.usage``, e as
+    assinaturas MinHash em ``decks.minhash``, com o mtime e o tamanho do
+    arquivo de onde saíram. Esses arquivos auxiliares começam com uma linha
+    JSON com todos os decks; cada gravação só acrescenta uma linha
+    ``[nome, valor]`` (``null`` se apagado) por deck, e o arquivo é
+    reescrito inteiro quando as linhas acrescentadas passam do número de
+    decks. Assim gravar um deck custa o mesmo com 10 ou 10.000 decks.
+    """
+
+    def __init__(self, folder=DEFAULT_FOLDER):
+        self.folder = folder
+        self.journal_path = os.path.join(folder, JOURNAL_NAME)
+        self.usage_path = os.path.join(folder, USAGE_NAME)
+        # arquivo auxiliar -> valor guardado por deck, calculado do registro
+        self._derived = {USAGE_NAME: _raw_ids, SIGNATURES_NAME: _raw_signature}
+        self._saved = {}  # arquivo auxiliar -> {nome: [mtime, tamanho, valor]}, depois de lido
+        self._appended = {}  # arquivo auxiliar -> linhas acrescentadas desde a última reescrita
+        self._lock = threading.RLock()  # gravações e os arquivos auxiliares; leituras não esperam
+
+    def path(self, name):
+        return os.path.join(self.folder, f"{name}.json")
+
+    def names(self):
+        if not os.path.isdir(self.folder):
+            return []
+        return [f[:-len(".json")] for f in os.listdir(self.folder) if f.endswith(".json")]
+
+    def __contains__(self, name):
+        return os.path.exists(self.path(name))
+
+    def read(self, name):
+        try:
+            with open(self.path(name), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _stamp(self, name):
+        st = os.stat(self.path(name))
+        return [st.st_mtime_ns, st.st_size]
+
+    def card_usage(self):
+        with self._lock:
+            return {name: list(ids) for name, ids in self._load(USAGE_NAME).items()}
+
+    def signatures(self):
+        with self._lock:
+            return self._load(SIGNATURES_NAME)
+
+    def _read_saved(self, filename):
+        # Primeira linha: todos os decks; as demais, alterações por deck.
+        # Devolve também se o arquivo está íntegro: uma linha cortada no fim
+        # é ignorada (os mtimes revalidam o resto) e o arquivo, reescrito.
+        saved, appended = {}, 0
+        path = os.path.join(self.folder, filename)
+        if not os.path.exists(path):
+            return saved, appended, True
+        with open(path, encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return saved, appended, False
+                if i == 0:
+                    saved = record
+                    continue
+                name, entry = record
+                if entry is None:
+                    saved.pop(name, None)
+                else:
+                    saved[name] = entry
+                appended += 1
+        return saved, appended, True
+
+    def _load(self, filename):
+        entries = self._saved.get(filename)
+        if entries is None:
+            saved, self._appended[filename], intact = self._read_saved(filename)
+
+            # Decks novos ou alterados por fora (mtime/tamanho diferentes) são relidos
+            entries = {}
+            for name in self.names():
+                stamp = self._stamp(name)
+                entry = saved.get(name)
+                if entry is None or entry[:2] != stamp:
+                    entry = stamp + [self._derived[filename](self.read(name))]
+                entries[name] = entry
+
+            self._saved[filename] = entries
+            if entries != saved or not intact:
+                self._write_saved(filename)
+        return {name: entry[2] for name, entry in entries.items()}
+
+    def _write_saved(self, filename):
+        os.makedirs(self.folder, exist_ok=True)
+        write_atomic(os.path.join(self.folder, filename), json.dumps(self._saved[filename]) + "\n")
+        self._appended[filename] = 0
+
+    def _append_saved(self, filename, records):
+        path = os.path.join(self.folder, filename)
+        entries = self._saved[filename]
+        appended = self._appended.get(filename, 0) + len(records)
+        if not os.path.exists(path) or appended > max(SIDECAR_COMPACT_MIN, len(entries)):
+            self._write_saved(filename)
+            return
+        # Sem fsync: os arquivos auxiliares são conferidos pelo mtime ao ler
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+        self._appended[filename] = appended
+
+    def write_many(self, decks, deleted=()):
+        with self._lock:
+            self._write_many(decks, deleted)
+
+    def _write_many(self, decks, deleted):
+        # Cada arquivo é trocado atomicamente; o conjunto não (o diário cobre isso)
+        os.makedirs(self.folder, exist_ok=True)
+        records = {}
+        for deck in decks:
+            records[deck.name] = deck_record(deck)
+            text = json.dumps(records[deck.name], indent=2, ensure_ascii=False)
+            write_atomic(self.path(deck.name), text)
+
+        for name in deleted:
+            if os.path.exists(self.path(name)):
+                os.remove(self.path(name))
+
+        # Os arquivos auxiliares só são mantidos depois de carregados; senão
+        # eles são revalidados pelo mtime na próxima leitura
+        for filename, entries in self._saved.items():
+            changes = []
+            for name, raw in records.items():
+                entries[name] = self._stamp(name) + [self._derived[filename](raw)]
+                changes.append([name, entries[name]])
+            for name in deleted:
+                if entries.pop(name, None) is not None:
+                    changes.append([name, None])
+            if changes:
+                self._append_saved(filename, changes)
+
+
+def open_store(location=DEFAULT_FOLDER):
+    """Backend conforme o caminho: ``.db``/``.sqlite`` usa SQLite, o resto é pasta JSON."""
+    if location.endswith(SQLITE_EXTENSIONS):
+        from .sqlite_store import SqliteDeckStore
+
+        return SqliteDeckStore(location)
+    return JsonDeckStore(location)
+
 
 def save_deck(deck, folder=DEFAULT_FOLDER):
     """Salva o deck em data/decks/<nome>.json"""
-    os.makedirs(folder, exist_ok=True)
-    path = os.path.join(folder, f"{deck.name}.json")
-
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(deck.to_dict(), f, indent=2, ensure_ascii=False)
+    JsonDeckStore(folder).save(deck)
 
 
 def load_deck(name, db, folder=DEFAULT_FOLDER):
@@ -20,11 +300,4 @@ def load_deck(name, db, folder=DEFAULT_FOLDER):
     with open(path, encoding="utf-8") as f:
         raw = json.load(f)
 
-    deck = Deck(raw["name"])
-    for cid in raw["cards"]:
-        card = db.get(cid)
-        if card:
-            deck.add_card(card)
-
-    return deck
-
+    return Deck.from_dict(raw, db.get)
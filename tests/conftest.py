@@ -0,0 +1,44 @@
+"""Fixtures e auxiliares comuns aos testes de cartas, decks e backends."""
+import json
+
+import pytest
+
+from models.deck import Deck
+from storage.storage import open_store
+
+
+def keep_id(card_id):
+    """Resolvedor de cartas do DeckManager que devolve o próprio id."""
+    return card_id
+
+
+def write_cards(folder, files):
+    """Grava ``{arquivo: carta ou lista de cartas}`` como JSON em ``folder`` (criada se faltar)."""
+    folder.mkdir(parents=True, exist_ok=True)
+    for name, data in files.items():
+        (folder / name).write_text(json.dumps(data), encoding="utf-8")
+    return folder
+
+
+def make_deck(name, main=(), extra=(), side=()):
+    """Deck com as cartas de cada zona: lista de ids (na ordem) ou {id: cópias}."""
+    deck = Deck(name)
+    for zone, cards in (("main", main), ("extra", extra), ("side", side)):
+        items = cards.items() if isinstance(cards, dict) else ((card_id, 1) for card_id in cards)
+        for card_id, amount in items:
+            deck.add_card(card_id, amount, zone)
+    return deck
+
+
+@pytest.fixture(params=["decks", "decks.db"])
+def location(request, tmp_path):
+    """Mesmos testes com a pasta JSON e com o SQLite."""
+    return str(tmp_path / request.param)
+
+
+@pytest.fixture
+def store(location):
+    """Backend vazio em ``location``, fechado ao fim do teste."""
+    store = open_store(location)
+    yield store
+    store.close()
@@ -47,9 +47,9 @@ def test_deck_to_dict_is_copy():
     deck.add_card(2)
 
     d = deck.to_dict()
-    d["cards"][0] = 999
+    d["main"][1] = 999
 
-    assert deck.cards[0] == 1
+    assert deck.count(1) == 1
 
 
 # unit: Representação string do deck vazio contém '0 cartas'
@@ -87,7 +87,7 @@ def test_save_deck_writes_file(tmp_path):
         data = json.load(f)
 
     assert data["name"] == "save_test"
-    assert data["cards"] == [1, 2]
+    assert data["main"] == {"1": 1, "2": 1}
 
 
 # unit: load_deck pula cartas não encontradas no DB — apenas carrega as existentes
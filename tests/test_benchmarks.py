@@ -0,0 +1,50 @@
+import json
+import os
+from benchmarks.run import ID_STRIDE, compare, flatten, make_synthetic
+from models.database import CardDatabase
+
+
+# unit: A base sintética multiplica as cartas com ids novos e agrupa em arquivos
+def test_make_synthetic(tmp_path):
+    source = tmp_path / "db"
+    source.mkdir()
+    for i in range(1, 4):
+        (source / f"{i}.json").write_text(json.dumps({"id": i, "name": f"Card {i}"}), encoding="utf-8")
+
+    dest = make_synthetic(str(source), str(tmp_path / "x3"), scale=3, cards_per_file=4)
+    db = CardDatabase(path=dest)
+
+    assert len(db.cards) == 9
+    assert len(list((tmp_path / "x3").iterdir())) == 3
+    assert db.get(2 + 2 * ID_STRIDE).name == "Card 2 #2"
+
+
+# unit: compare aponta só as métricas que pioraram além do limite
+def test_compare_reports_regressions():
+    base = {"meta": {"cpus": 1}, "datasets": {"en": {"load": {"folder": {"seconds": 1.0, "cards": 10}},
+                                                    "load_deck": {"decks_per_second": 100.0}}}}
+    current = {"meta": {"cpus": 8}, "datasets": {"en": {"load": {"folder": {"seconds": 1.5, "cards": 20}},
+                                                       "load_deck": {"decks_per_second": 50.0}}}}
+
+    regressions = compare(base, current, threshold=1.2)
+
+    assert [r[0] for r in regressions] == [
+        "datasets.en.load.folder.seconds",
+        "datasets.en.load_deck.decks_per_second",
+    ]
+    assert flatten(base)["datasets.en.load.folder.seconds"] == 1.0
+
+
+# unit: A medição do primeiro prompt roda a CLI com decks e banidas numa pasta temporária
+def test_cli_first_prompt_uses_temporary_store(monkeypatch):
+    from benchmarks import run
+
+    envs = []
+    monkeypatch.setattr(run.subprocess, "run", lambda *args, **kwargs: envs.append(kwargs["env"]))
+    result = run.measure_cli_first_prompt(2)
+
+    assert result["runs"] == 2 and len(envs) == 2
+    for env in envs:
+        assert env["YUGIDB_DECKS"] != "data/decks"
+        assert os.path.commonpath([env["YUGIDB_DECKS"], env["YUGIDB_BANLIST"]]) == os.path.dirname(env["YUGIDB_DECKS"])
+        assert not os.path.exists(env["YUGIDB_DECKS"])  # pasta temporária já apagada
@@ -90,3 +90,36 @@ def test_carddatabase_missing_folder_raises(tmp_path):
 
     with pytest.raises(FileNotFoundError):
         CardDatabase(path=str(folder))
+
+
+# unit: Card mantém todos os campos do JSON de origem e reconstrói o registro
+def test_card_keeps_all_source_fields():
+    data = {
+        "id": 13034,
+        "type": "monster",
+        "name": "Link Spider",
+        "englishAttribute": "earth",
+        "localizedAttribute": "EARTH",
+        "effectText": "1 Normal Monster",
+        "linkRating": 1,
+        "linkArrows": ["2"],
+        "atk": 1000,
+        "properties": ["Cyberse", "Link", "Effect"],
+    }
+
+    card = Card(data)
+
+    assert card.link_rating == 1
+    assert card.link_arrows == ("2",)
+    assert card.english_attribute == "earth"
+    assert card.to_dict() == data
+
+
+# unit: Card usa __slots__ e compartilha strings repetidas entre cartas
+def test_card_is_slotted_and_interned():
+    a = Card({"id": 1, "type": "".join(["mon", "ster"]), "properties": ["".join(["Drag", "on"])]})
+    b = Card({"id": 2, "type": "monster", "properties": ["Dragon"]})
+
+    assert not hasattr(a, "__dict__")
+    assert a.type is b.type
+    assert a.properties[0] is b.properties[0]
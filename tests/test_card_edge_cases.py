@@ -108,7 +108,7 @@ def test_deck_remove_more_than_available():
 
 
 def test_deck_to_dict_preserves_duplicates():
-    # to_dict deve manter cartas duplicadas na lista
+    # to_dict guarda as cópias como quantidade
     deck = Deck("dupes")
     deck.add_card(7)
     deck.add_card(7)
@@ -116,5 +116,4 @@ def test_deck_to_dict_preserves_duplicates():
     
     result = deck.to_dict()
     
-    assert result["cards"].count(7) == 3
-    assert len(result["cards"]) == 3
+    assert result["main"] == {7: 3}
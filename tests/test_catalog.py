@@ -0,0 +1,139 @@
+import json
+import os
+import stat
+from conftest import write_cards
+from models import catalog
+from models.database import CardDatabase
+from models.search_index import index_path
+
+
+CARDS = {
+    "1.json": {"id": 1, "name": "Fusão Definitiva"},
+    "list.json": [{"id": 2, "name": "Alpha"}, {"id": 3, "name": "Beta", "effectText": "x\ny"}],
+}
+
+
+# unit: O catálogo gerado contém todas as cartas da pasta, inclusive de arquivos com listas
+def test_build_and_read_catalog(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+
+    path = catalog.build_catalog(str(folder))
+
+    assert path == str(folder) + ".catalog"
+    records = catalog.read_catalog(path)
+    assert sorted(r["id"] for r in records) == [1, 2, 3]
+
+
+# unit: O índice aponta para o registro JSON de cada carta dentro do arquivo
+def test_catalog_index_offsets(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    path = catalog.build_catalog(str(folder))
+
+    with open(path, "rb") as f:
+        buf = f.read()
+
+    for card_id, offset, length in catalog.read_index(buf):
+        assert json.loads(buf[offset:offset + length])["id"] == card_id
+
+
+# unit: Pasta inalterada não é relida: o catálogo é usado como está
+def test_unchanged_folder_is_not_reparsed(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    first = catalog.sync_catalog(str(folder))
+
+    # mesmo tamanho e mtime: o manifesto considera o arquivo inalterado
+    target = folder / "1.json"
+    stat = os.stat(target)
+    write_cards(folder, {"1.json": {"id": 1, "name": "Fusão Modificada"}})
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    second = catalog.sync_catalog(str(folder))
+    db = CardDatabase(path=str(folder))
+
+    assert first.previous is None and len(first.added) == 3
+    assert second == catalog.CatalogUpdate(first.stamp, first.stamp, [], [])
+    assert db.get(1).name == "Fusão Definitiva"
+    assert db.get(3).effect == "x\ny"
+
+
+# unit: Só os arquivos novos, alterados ou removidos entram nas diferenças
+def test_sync_reports_only_changed_files(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    first = catalog.sync_catalog(str(folder))
+
+    write_cards(folder, {"4.json": {"id": 4, "name": "Nova"}, "1.json": {"id": 1, "name": "Outro nome"}})
+    os.remove(folder / "list.json")
+
+    update = catalog.sync_catalog(str(folder))
+
+    assert update.previous == first.stamp and update.stamp != first.stamp
+    assert sorted(d["id"] for d in update.removed) == [1, 2, 3]
+    assert sorted(d["id"] for d in update.added) == [1, 4]
+    assert sorted(r["id"] for r in catalog.read_catalog(catalog.catalog_path(str(folder)))) == [1, 4]
+
+
+# unit: CardDatabase reflete arquivos adicionados depois do catálogo gerado
+def test_database_sees_new_files(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    catalog.build_catalog(str(folder))
+
+    write_cards(folder, {"4.json": {"id": 4, "name": "Nova"}})
+
+    db = CardDatabase(path=str(folder))
+
+    assert db.get(4).name == "Nova"
+    assert len(db.cards) == 4
+
+
+# unit: Depois da carga o banco guarda só os carimbos, não os registros alterados
+def test_database_drops_update_records(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    db = CardDatabase(path=str(folder))
+
+    assert db._update.added == [] and db._update.removed == []
+    assert [c.id for c in db.search("alpha")] == [2]
+
+
+# unit: Pasta sem como gravar o catálogo (somente leitura, disco cheio) é lida direto
+def test_database_falls_back_on_os_error(tmp_path, monkeypatch):
+    folder = write_cards(tmp_path / "db", CARDS)
+
+    def read_only(*args):
+        raise OSError(30, "Read-only file system")
+
+    monkeypatch.setattr(catalog, "sync_catalog", read_only)
+    db = CardDatabase(path=str(folder))
+
+    assert len(db.cards) == 3
+    assert [c.id for c in db.search("beta")] == [3]
+
+
+# unit: Cada gravação usa um temporário próprio e não deixa sobras na pasta
+def test_write_catalog_uses_unique_temp_file(tmp_path):
+    path = str(tmp_path / "x.catalog")
+    fd, first = catalog.temp_file(path)
+    os.close(fd)
+    fd, second = catalog.temp_file(path)
+    os.close(fd)
+    assert first != second
+    assert os.path.dirname(first) == str(tmp_path)
+    os.remove(first)
+    os.remove(second)
+
+    catalog.write_catalog([(1, catalog.encode({"id": 1}))], path)
+    assert os.listdir(tmp_path) == ["x.catalog"]
+
+
+# unit: Catálogo e índice regravados ficam com as permissões usuais, não só para o dono
+def test_rewritten_files_keep_permissions(tmp_path):
+    path = str(tmp_path / "x.catalog")
+    catalog.write_catalog([(1, catalog.encode({"id": 1}))], path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~catalog._UMASK
+
+    os.chmod(path, 0o640)
+    catalog.write_catalog([(2, catalog.encode({"id": 2}))], path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+    folder = write_cards(tmp_path / "db", CARDS)
+    CardDatabase(path=str(folder)).search("alpha")
+    assert stat.S_IMODE(os.stat(index_path(str(folder))).st_mode) == 0o666 & ~catalog._UMASK
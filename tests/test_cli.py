@@ -1,8 +1,9 @@
 import pytest
 import io
+import json
 import sys
 from unittest.mock import MagicMock, patch
-from cli import CardCLI
+from cli import CardCLI, main, run_batch
 
 # --- FIXTURES (Configurações iniciais) ---
 
@@ -28,6 +29,13 @@ def mock_dependencies(mocker):
     
     return mock_db_instance
 
+@pytest.fixture(autouse=True)
+def decks_folder(tmp_path, monkeypatch):
+    """Decks e diário de cada teste numa pasta temporária própria."""
+    folder = tmp_path / "decks"
+    monkeypatch.setattr("cli.DECKS_STORE", str(folder))
+    return folder
+
 @pytest.fixture
 def run_cli(capsys):
     """
@@ -141,4 +149,296 @@ def test_renomear_deck(run_cli):
 
     assert "Deck renomeado de 'Antigo' para 'Novo'." in output
     assert "• Novo" in output
-    assert output.count("Antigo") == 2  # Garante que o velho sumiu
\ No newline at end of file
+    assert output.count("Antigo") == 2  # Garante que o velho sumiu
+
+
+def test_consulta_por_atributos(run_cli):
+    """
+    Cenário: Usuário consulta cartas por atributos e erra um filtro.
+    """
+    input_commands = """
+    query type=monster atk>=5000
+    query cor=azul
+    exit
+    """
+    output = run_cli(input_commands)
+
+    assert "5502: Dragão de Cinco Cabeças" in output
+    assert "Campo desconhecido: cor" in output
+
+
+def test_alteracoes_sobrevivem_ao_reinicio(run_cli):
+    """
+    Cenário: Usuário edita um deck sem salvar e abre a CLI de novo.
+    """
+    run_cli("""
+    create_deck Persistente
+    add_card Persistente 15579
+    add_card Persistente 15579
+    exit
+    """)
+    output = run_cli("""
+    show_deck Persistente
+    exit
+    """)
+
+    assert "1 deck(s) carregados automaticamente." in output
+    assert "2x 15579 — Rivais Destinados" in output
+
+def test_decks_que_usam_a_carta(run_cli):
+    """
+    Cenário: Usuário pergunta em quais decks uma carta está.
+    """
+    input_commands = """
+    create_deck Dragoes
+    create_deck Outro
+    add_card Dragoes 15579
+    where_used 15579
+    where_used 10000
+    where_used abc
+    exit
+    """
+    output = run_cli(input_commands)
+
+    assert "Carta 15579 usada em 1 deck(s):" in output
+    assert "• Dragoes" in output
+    assert "Nenhum deck usa a carta 10000." in output
+    assert "ID inválido." in output
+
+
+def test_cartas_jogadas_junto(run_cli):
+    """
+    Cenário: Usuário salva decks e pergunta o que costuma ser jogado com uma carta.
+    """
+    input_commands = """
+    create_deck Magos
+    add_card Magos 4041
+    add_card Magos 4041
+    add_card Magos 4064
+    save_deck Magos
+    create_deck Outro
+    add_card Outro 4041
+    add_card Outro 4007
+    save_deck Outro
+    related mago negro --top 1
+    related 4064
+    related 15579
+    exit
+    """
+    output = run_cli(input_commands)
+
+    assert "4041 Mago Negro: em 2 de 2 deck(s) salvos (100%), 1.5 cópia(s) em média." in output
+    assert "• 4007 Dragão Branco de Olhos Azuis — 1 deck(s) (50%)" in output
+    assert "• 4064 Kuriboh" not in output
+    assert "• 4041 Mago Negro — 1 deck(s) (100%)" in output
+    assert "Nenhum deck salvo usa a carta 15579." in output
+
+
+def test_decks_parecidos(run_cli):
+    """
+    Cenário: Usuário procura decks salvos parecidos com o seu.
+    """
+    input_commands = """
+    create_deck Magos
+    add_card Magos 4041
+    add_card Magos 4064
+    save_deck Magos
+    create_deck Copia
+    add_card Copia 4041
+    add_card Copia 4064
+    save_deck Copia
+    create_deck Outro
+    add_card Outro 4007
+    save_deck Outro
+    similar_decks Magos
+    similar_decks Outro
+    similar_decks Nada
+    exit
+    """
+    output = run_cli(input_commands)
+
+    assert "Decks parecidos com 'Magos' (Jaccard estimado):\n• Copia — 100%" in output
+    assert "Nenhum deck salvo parecido com 'Outro'." in output
+    assert "Deck não encontrado." in output
+
+
+def test_legalidade_do_deck(run_cli, tmp_path, monkeypatch):
+    """
+    Cenário: Usuário com lista de banidas monta um deck e confere se ele é válido.
+    """
+    banlist = tmp_path / "banlist.json"
+    banlist.write_text(json.dumps({"limited": [4064]}), encoding="utf-8")
+    monkeypatch.setattr("cli.BANLIST", str(banlist))
+    input_commands = """
+    create_deck Magos
+    add_card Magos 4064
+    add_card Magos 4064
+    add_card Magos 4041
+    add_card Magos 10000
+    validate Magos
+    save_deck Magos
+    create_deck Vazio
+    validate
+    validate Nada
+    exit
+    """
+    output = run_cli(input_commands)
+
+    assert "2 cópias da carta 4064 (o limite é 1)." in output
+    assert "Carta 10000 adicionada ao deck 'Magos'." in output
+    assert "Deck 'Magos' tem 1 problema(s):\n• Main Deck com 2 cartas (precisa ter de 40 a 60)." in output
+    assert "Magos:\n  • Main Deck com 2 cartas" in output
+    assert "0 de 2 deck(s) válidos." in output
+    assert "Deck não encontrado." in output
+
+
+def test_remover_carta(run_cli):
+    """
+    Cenário: Usuário remove uma carta do deck e depois tenta remover uma que não está nele.
+    """
+    input_commands = """
+    create_deck X
+    add_card X 4041
+    remove_card X 4041
+    remove_card X 10000
+    exit
+    """
+    output = run_cli(input_commands)
+
+    assert "Carta 4041 removida do deck 'X'." in output
+    assert "A carta 10000 não está no deck 'X'." in output
+    assert "Carta 10000 removida" not in output
+
+
+def test_busca_por_relevancia_em_paginas(run_cli):
+    """
+    Cenário: Usuário busca um termo comum, vê o melhor resultado primeiro e pede a próxima página.
+    """
+    input_commands = """
+    search Mago Negro
+    search dragão --page 2
+    search dragão --page x
+    exit
+    """
+    output = run_cli(input_commands)
+
+    # O nome exato é a primeira linha depois do prompt
+    assert "> 4041: Mago Negro\n" in output
+    assert "Página 2 de" in output
+    assert "Próxima: search dragão --page 3" in output
+    assert "Página inválida." in output
+
+
+def test_adicionar_carta_pelo_nome(run_cli):
+    """
+    Cenário: Usuário monta o deck digitando nomes, com erros, em vez de ids.
+    """
+    input_commands = """
+    create_deck Magos
+    add_card Magos mago negor
+    add_card Magos kurbioh
+    add_card Magos dragão
+    add_card Magos zzzzzz
+    search mago negor
+    show_deck Magos
+    exit
+    """
+    output = run_cli(input_commands)
+
+    assert "Carta 4041 — Mago Negro adicionada ao deck 'Magos'." in output
+    assert "Carta 4064 — Kuriboh adicionada ao deck 'Magos'." in output
+    assert "Mais de uma carta parecida; use o id:" in output
+    assert "Carta não encontrada." in output
+    assert "Você quis dizer:" in output
+    assert "Main Deck (2):" in output
+
+
+def test_chance_da_mao_inicial(run_cli):
+    """
+    Cenário: Usuário pergunta a chance de abrir com uma carta, exata e simulada.
+    """
+    pytest.importorskip("numpy")
+    input_commands = """
+    create_deck Mao
+    add_card Mao 4041
+    add_card Mao 4064
+    add_card Mao 4064
+    odds Mao 4041 --hand 2
+    simulate Mao 4064 --hand 2 --trials 1000 --seed 3
+    odds Mao 4041 --hand 9
+    odds Nada 4041
+    exit
+    """
+    output = run_cli(input_commands)
+
+    assert "Main Deck com 3 cartas, mão de 2." in output
+    assert "Chance: 66.67% (exata)" in output
+    assert "Chance: 100.00% (IC 95%:" in output
+    assert "A mão precisa ter de 1 a 3 cartas (o deck tem 3)." in output
+    assert "Deck não encontrado." in output
+
+
+# --- MODO EM LOTE ---
+
+def test_lote_grava_cada_deck_uma_vez(decks_folder, capsys):
+    """
+    Cenário: Script altera e salva o mesmo deck várias vezes em um processo.
+    """
+    cli = CardCLI(defer_writes=True)
+    commands = [
+        "create_deck Lote",
+        "add_card Lote 15579",
+        "save_deck Lote",
+        "add_card Lote 15579",
+        "save_deck Lote",
+        "# comentário",
+        "",
+        "show_deck Lote",
+    ]
+    with patch.object(cli.store, "write_many", wraps=cli.store.write_many) as write_many:
+        results = run_batch(cli, commands)
+        assert write_many.call_count == 0
+        cli.close()
+    assert write_many.call_count == 1
+
+    assert [r["command"] for r in results] == [c for c in commands if c and not c.startswith("#")]
+    assert all(r["ok"] for r in results)
+    assert "  2x 15579 — Rivais Destinados" in results[-1]["output"]
+    assert (decks_folder / "Lote.json").exists()
+
+def test_lote_json_lines(tmp_path, capsys):
+    """
+    Cenário: Comandos vindos de arquivo e de -c, com saída em JSON lines.
+    """
+    script = tmp_path / "script.txt"
+    script.write_text("create_deck Arquivo\nvoar_alto\n", encoding="utf-8")
+
+    code = main(["-f", str(script), "-c", "list_decks"])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert code == 1
+    assert [r["command"] for r in lines] == ["create_deck Arquivo", "voar_alto", "list_decks"]
+    assert lines[1]["ok"] is False
+    assert lines[2]["output"] == ["• Arquivo"]
+
+    assert main(["--text", "-c", "list_decks"]) == 0
+    assert capsys.readouterr().out == "• Arquivo\n"
+
+def test_lote_comandos_que_falham(capsys):
+    """
+    Cenário: Script com comandos que falham termina com código 1 e o erro de cada um.
+    """
+    code = main([
+        "-c", "create_deck X",
+        "-c", "add_card nope 10000",
+        "-c", "add_card X 99999999",
+        "-c", "search",
+        "-c", "add_card X 4041",
+    ])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert code == 1
+    assert [r["ok"] for r in lines] == [True, False, False, False, True]
+    assert lines[1]["error"] == "Deck não encontrado."
+    assert lines[2]["error"] == "Carta não encontrada."
+    assert lines[3]["error"] == "Uso: search <texto> [--page N]"
@@ -0,0 +1,52 @@
+import pytest
+from models.card import Card
+
+np = pytest.importorskip("numpy")
+
+from models.columns import CardColumns  # noqa: E402
+
+
+CARDS = [
+    Card({"id": 1, "type": "monster", "localizedAttribute": "DARK", "level": 8, "atk": 3000, "def": 2500,
+          "properties": ["Dragon", "Effect"]}),
+    Card({"id": 2, "type": "monster", "localizedAttribute": "LIGHT", "level": 4, "atk": -1, "def": 1000,
+          "properties": ["Warrior"]}),
+    Card({"id": 3, "type": "monster", "localizedAttribute": "DARK", "level": 4, "atk": 1800, "def": 0,
+          "properties": ["Dragon"]}),
+    Card({"id": 4, "type": "spell", "localizedAttribute": "SPELL"}),
+]
+
+
+# unit: Colunas numéricas e categóricas são montadas a partir das cartas
+def test_build_columns():
+    columns = CardColumns.build(CARDS)
+
+    assert len(columns) == 4
+    assert columns.ids.tolist() == [1, 2, 3, 4]
+    assert columns.labels["type"] == ["monster", "spell", None]
+    assert columns.properties.shape == (4, 3)
+
+
+# unit: Filtros viram máscaras vetorizadas com a sintaxe de query
+def test_mask():
+    columns = CardColumns.build(CARDS)
+
+    assert columns.ids[columns.mask("attribute=dark level=4")].tolist() == [3]
+    assert columns.ids[columns.mask("property=Dragon")].tolist() == [1, 3]
+    assert columns.ids[columns.mask("type!=monster")].tolist() == [4]
+    assert columns.ids[columns.mask("atk>=0")].tolist() == [1, 3]  # ATK "?" conta como ausente
+    assert columns.mask().all()
+
+
+# unit: Agregações respeitam a máscara e ignoram valores ausentes
+def test_aggregates():
+    columns = CardColumns.build(CARDS)
+    monsters = columns.mask("type=monster")
+
+    assert columns.describe("atk", monsters) == {
+        "count": 2, "min": 1800, "max": 3000, "mean": 2400.0, "median": 2400.0,
+    }
+    assert columns.histogram("level") == {4: 2, 8: 1}
+    assert columns.count_by("attribute") == {"DARK": 2, "LIGHT": 1, "SPELL": 1}
+    assert columns.count_by("property", monsters) == {"Dragon": 2, "Effect": 1, "Warrior": 1}
+    assert columns.describe("rank")["count"] == 0
@@ -24,12 +24,11 @@ def clean_decks():
     # Limpa depois do teste também
     if os.path.exists(deck_folder):
         for file in os.listdir(deck_folder):
-            if file.endswith(".json"):
-                file_path = os.path.join(deck_folder, file)
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
+            file_path = os.path.join(deck_folder, file)
+            try:
+                os.remove(file_path)
+            except:
+                pass
 
 
 def run_cli(commands):
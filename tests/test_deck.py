@@ -97,7 +97,9 @@ class TestDeck:
 
         dicionario_esperado = {
             "name": dados["nome"],
-            "cards": dados["cartas"]
+            "main": {1: 1, 2: 1, 3: 1},
+            "extra": {},
+            "side": {},
         }
 
         assert deck.to_dict() == dicionario_esperado
@@ -0,0 +1,161 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from cli import DeckManager
+from conftest import keep_id
+from models.deck import Deck
+from storage.journal import DeckJournal
+from storage import storage
+from storage.storage import USAGE_NAME, JsonDeckStore, save_deck
+
+
+def saved_store(folder, count=50):
+    store = JsonDeckStore(str(folder))
+    decks = []
+    for i in range(count):
+        deck = Deck(f"deck{i:03}")
+        deck.add_card(i, amount=2)
+        decks.append(deck)
+    store.write_many(decks)
+    return store
+
+
+# unit: listar e contar decks não lê nenhum deck do backend
+def test_list_does_not_load(tmp_path):
+    store = saved_store(tmp_path)
+    with mock.patch.object(store, "read", wraps=store.read) as read:
+        manager = DeckManager(store, keep_id)
+        assert len(manager.list()) == 50
+        assert "deck007" in manager.decks
+        assert read.call_count == 0
+
+        assert manager.get("deck007").count(7) == 2
+        manager.get("deck007")
+        assert read.call_count == 1
+    assert manager.decks.loaded() == ["deck007"]
+
+
+# unit: só os decks alterados (e os apagados) são gravados de volta
+def test_flush_writes_only_dirty(tmp_path):
+    store = saved_store(tmp_path)
+    manager = DeckManager(store, keep_id)
+    manager.get("deck001")  # lido mas não alterado
+    manager.add("deck002", 99)
+    manager.create("novo")
+    manager.delete("deck003")
+    manager.rename("deck004", "renomeado")
+
+    with mock.patch.object(store, "write_many", wraps=store.write_many) as write:
+        manager.flush()
+    (saved, deleted), _ = write.call_args
+    assert sorted(d.name for d in saved) == ["deck002", "novo", "renomeado"]
+    assert deleted == {"deck003", "deck004"}
+
+    assert store.read("deck002")["main"] == {"2": 2, "99": 1}
+    assert "deck003" not in store and "renomeado" in store
+    assert not manager.decks.dirty and not manager.decks.deleted
+
+
+# unit: ao abrir, o diário só lê do backend os decks citados nele
+def test_replay_loads_only_journaled_decks(tmp_path):
+    store = saved_store(tmp_path)
+    manager = DeckManager(store, keep_id, DeckJournal(store))
+    manager.add("deck010", 5)
+    manager.journal.close()
+
+    reopened = DeckManager(store, keep_id, DeckJournal(store))
+    assert reopened.decks.loaded() == ["deck010"]
+    assert reopened.decks.dirty == {"deck010"}
+    assert reopened.get("deck010").count(5) == 1
+    reopened.journal.close()
+
+
+@pytest.fixture
+def store(store):
+    """Pasta JSON e SQLite, com dois decks salvos."""
+    a, b = Deck("a"), Deck("b")
+    a.add_card(1, amount=3)
+    a.add_card(2, zone="side")
+    b.add_card(2)
+    store.write_many([a, b])
+    return store
+
+
+# unit: o índice reverso junta o que está gravado com as alterações ainda não gravadas
+def test_decks_containing(store):
+    manager = DeckManager(store, keep_id)
+    manager.create("c")
+    manager.add("c", 1)
+    assert manager.decks_containing(1) == ["a", "c"]
+    assert manager.decks_containing(2) == ["a", "b"]
+    assert manager.decks.loaded() == ["c"]  # os salvos não foram lidos
+
+    manager.remove("a", 1)
+    assert manager.decks_containing(1) == ["a", "c"]  # ainda sobram 2 cópias
+    manager.remove("a", 1, amount=2)
+    assert manager.decks_containing(1) == ["c"]
+
+    manager.rename("b", "bb")
+    manager.clear("a")
+    assert manager.decks_containing(2) == ["bb"]
+    manager.delete("bb")
+    assert manager.decks_containing(2) == []
+
+    # Depois de gravar, um manager novo vê o mesmo índice
+    manager.flush()
+    reopened = DeckManager(store, keep_id)
+    assert reopened.decks_containing(1) == ["c"]
+    assert reopened.decks_containing(2) == []
+
+
+# unit: decks alterados fora do backend (save_deck, cópia à mão) são relidos pelo mtime
+def test_json_usage_revalidated(tmp_path):
+    store = saved_store(tmp_path, count=3)
+    assert DeckManager(store, keep_id).decks_containing(1) == ["deck001"]
+    assert os.path.exists(tmp_path / USAGE_NAME)
+
+    deck = Deck("deck001")
+    deck.add_card(500)
+    save_deck(deck, folder=str(tmp_path))
+    (tmp_path / "novo.json").write_text(json.dumps({"name": "novo", "main": {"1": 1}}), encoding="utf-8")
+
+    manager = DeckManager(JsonDeckStore(str(tmp_path)), keep_id)
+    assert manager.decks_containing(1) == ["novo"]
+    assert manager.decks_containing(500) == ["deck001"]
+
+
+# unit: gravar um deck só acrescenta uma linha aos arquivos auxiliares; reescreve de tempos em tempos
+def test_json_sidecars_append(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "SIDECAR_COMPACT_MIN", 4)
+    store = saved_store(tmp_path, count=3)
+    store.card_usage()
+    path = tmp_path / USAGE_NAME
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+
+    deck = Deck("deck001")
+    deck.add_card(500)
+    store.save(deck)
+    store.delete("deck002")
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()[1:]]
+    assert [name for name, _ in records] == ["deck001", "deck002"]
+    assert records[0][1][2] == [500] and records[1][1] is None
+
+    # Linha cortada no fim (queda no meio da escrita) não atrapalha e é descartada
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('["deck0')
+    store = JsonDeckStore(str(tmp_path))
+    with mock.patch.object(store, "read", side_effect=AssertionError("leu um deck")):
+        assert store.card_usage() == {"deck000": [0], "deck001": [500]}
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+    # Passando do limite o arquivo volta a ter uma linha só
+    for i in range(4):
+        store.save(deck)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 5
+    store.save(deck)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    assert JsonDeckStore(str(tmp_path)).card_usage() == {"deck000": [0], "deck001": [500]}
@@ -0,0 +1,142 @@
+import threading
+
+from cli import DeckManager
+from conftest import keep_id
+from storage.journal import DeckJournal
+from storage.storage import open_store
+
+THREADS = 8
+ADDS = 200
+
+
+def open_manager(location):
+    store = open_store(location)
+    journal = DeckJournal(store)
+    return DeckManager(store, keep_id, journal), journal, store
+
+
+def close(manager, journal, store):
+    manager.flush()
+    journal.close()
+    store.close()
+
+
+def run_threads(target, count=THREADS):
+    errors = []
+
+    def wrapped(i):
+        try:
+            target(i)
+        except Exception as e:  # noqa: BLE001 - repassado ao teste
+            errors.append(e)
+
+    threads = [threading.Thread(target=wrapped, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+# unit: threads alterando decks diferentes e o mesmo deck não perdem alterações, nem no diário
+def test_parallel_adds(location):
+    manager, journal, store = open_manager(location)
+    manager.create("shared")
+    for i in range(THREADS):
+        manager.create(f"deck{i}")
+
+    def work(i):
+        for n in range(ADDS):
+            manager.add(f"deck{i}", n % 40 + 1)
+            manager.add("shared", i + 1)
+
+    run_threads(work)
+
+    assert manager.get("shared").count(4) == ADDS
+    assert all(len(manager.get(f"deck{i}")) == ADDS for i in range(THREADS))
+    assert manager.decks_containing(3) == [f"deck{i}" for i in range(THREADS)] + ["shared"]
+
+    # O diário foi escrito na mesma ordem em que as alterações foram aplicadas
+    journal.close()
+    store.close()
+    reopened, journal, store = open_manager(location)
+    assert reopened.get("shared").count(8) == ADDS
+    assert len(reopened.get("deck5")) == ADDS
+    close(reopened, journal, store)
+
+
+# unit: renomear enquanto outra thread adiciona cartas não perde nem duplica nada
+def test_rename_while_adding(location):
+    manager, journal, store = open_manager(location)
+    manager.create("old")
+    manager.flush()
+    added = []
+
+    def work(i):
+        if i == 0:
+            manager.rename("old", "new", persist=True)
+            return
+        for n in range(ADDS):
+            try:
+                manager.add("old", i)
+            except ValueError:
+                return  # já renomeado
+            added.append(i)
+
+    run_threads(work)
+
+    assert manager.get("old") is None
+    assert len(manager.get("new")) == len(added)
+    assert "old" not in store and "new" in store
+    close(manager, journal, store)
+
+
+# unit: rename e delete com persist deixam memória e backend iguais ao retornar
+def test_rename_and_delete_persist(location):
+    manager, journal, store = open_manager(location)
+    manager.create("a")
+    manager.add("a", 1, amount=3)
+    manager.flush()
+
+    manager.rename("a", "b", persist=True)
+    assert store.names() == ["b"]
+    assert store.load("b", keep_id).count(1) == 3
+
+    manager.delete("b", persist=True)
+    assert store.names() == []
+    assert manager.list() == []
+    close(manager, journal, store)
+
+
+# unit: gravar um deck não trava alterações em outro deck
+def test_flush_does_not_block_other_decks(location):
+    manager, journal, store = open_manager(location)
+    manager.create("slow")
+    manager.create("fast")
+
+    writing = threading.Event()
+    release = threading.Event()
+    write_many = store.write_many
+
+    def blocking_write(decks, deleted=()):
+        writing.set()
+        assert release.wait(5)
+        write_many(decks, deleted)
+
+    store.write_many = blocking_write
+    flusher = threading.Thread(target=manager.flush, args=(["slow"],))
+    flusher.start()
+    assert writing.wait(5)
+
+    # Com "slow" sendo gravado, "fast" continua livre
+    done = threading.Event()
+    threading.Thread(target=lambda: (manager.add("fast", 1), done.set())).start()
+    assert done.wait(5)
+    assert manager.get("fast").count(1) == 1
+
+    release.set()
+    flusher.join()
+    store.write_many = write_many
+    assert "slow" in store and "fast" not in store
+    assert manager.decks.dirty == {"fast"}
+    close(manager, journal, store)
@@ -0,0 +1,79 @@
+import pytest
+
+from conftest import make_deck
+from storage.deck_cache import DeckCache
+from storage.journal import DeckJournal
+from storage.migrate import migrate
+from storage.sqlite_store import SqliteDeckStore
+from storage.storage import DeckStore, JsonDeckStore, open_store
+
+
+# unit: o backend é escolhido pela extensão do caminho
+def test_open_store_by_extension(tmp_path):
+    assert isinstance(open_store(str(tmp_path / "decks")), JsonDeckStore)
+    store = open_store(str(tmp_path / "decks.db"))
+    assert isinstance(store, SqliteDeckStore)
+    store.close()
+
+
+# unit: um backend incompleto falha ao ser criado, não no primeiro uso
+def test_incomplete_store_cannot_be_instantiated():
+    class OnlyNames(DeckStore):
+        def names(self):
+            return []
+
+    with pytest.raises(TypeError):
+        DeckStore()
+    with pytest.raises(TypeError):
+        OnlyNames()
+
+
+# unit: o SQLite grava, lê um deck por nome (na ordem original), sobrescreve e apaga
+def test_sqlite_roundtrip(tmp_path):
+    store = SqliteDeckStore(str(tmp_path / "decks.db"))
+    deck = make_deck("a", main=[30, 10, 10, 20], extra=[5], side=[7])
+    deck.seq = 12
+    store.write_many([deck, make_deck("b", main=[1])])
+
+    assert store.names() == ["a", "b"]
+    assert "a" in store and "z" not in store
+    assert store.read("a") == {"name": "a", "main": {30: 1, 10: 2, 20: 1}, "extra": {5: 1}, "side": {7: 1}, "seq": 12}
+    assert list(store.read("a")["main"]) == [30, 10, 20]
+    assert store.read("z") is None
+
+    store.write_many([make_deck("a", main=[99])], deleted=["b"])
+    assert store.names() == ["a"]
+    assert store.read("a")["main"] == {99: 1}
+    count = store.conn.execute("SELECT COUNT(*) FROM deck_cards").fetchone()[0]
+    assert count == 1
+    store.close()
+
+
+# unit: a busca de decks por carta usa o índice de deck_cards.card_id
+def test_sqlite_card_index(tmp_path):
+    store = SqliteDeckStore(str(tmp_path / "decks.db"))
+    plan = store.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT deck_id FROM deck_cards WHERE card_id = ?", (1,)
+    ).fetchall()
+    assert "deck_cards_card" in str(plan)
+    store.close()
+
+
+# e2e: migração da pasta JSON para o SQLite, incluindo alterações só no diário
+def test_migrate_json_to_sqlite(tmp_path):
+    source = str(tmp_path / "decks")
+    JsonDeckStore(source).write_many([make_deck("salvo", main=[1, 1], extra=[2])])
+
+    journal = DeckJournal(JsonDeckStore(source))
+    journal.load(DeckCache(), lambda card_id: card_id)
+    journal.append("create", "pendente")
+    journal.append("add", "pendente", card=3, amount=2, zone="side")
+    journal.close()
+
+    assert migrate(source, str(tmp_path / "decks.db"), batch_size=1) == 2
+
+    store = SqliteDeckStore(str(tmp_path / "decks.db"))
+    assert sorted(store.names()) == ["pendente", "salvo"]
+    assert store.read("salvo") == {"name": "salvo", "main": {1: 2}, "extra": {2: 1}, "side": {}}
+    assert store.read("pendente")["side"] == {3: 2}
+    store.close()
@@ -0,0 +1,90 @@
+import json
+
+from models.card import Card
+from models.deck import Deck
+from storage.storage import load_deck, save_deck
+
+
+def make_card(card_id, name, properties=None):
+    return Card({"id": card_id, "name": name, "properties": properties or []})
+
+
+class FakeDB:
+    def __init__(self, cards):
+        self.cards = {c.id: c for c in cards}
+
+    def get(self, card_id):
+        return self.cards.get(card_id)
+
+
+# unit: cartas de Fusão/Sincro/Xyz/Link vão para o Extra Deck, o resto para o Main
+def test_default_zone_by_properties():
+    deck = Deck("zonas")
+    deck.add_card(make_card(1, "Dragão", ["Dragão", "Efeito"]))
+    deck.add_card(make_card(2, "Fusão", ["Dragão", "Fusão"]))
+    deck.add_card(make_card(3, "Link", ["Ciberso", "Link"]))
+    deck.add_card(make_card(4, "Reserva"), zone="side")
+
+    assert deck.size("main") == 1
+    assert deck.size("extra") == 2
+    assert deck.size("side") == 1
+    assert len(deck) == 4
+
+
+# unit: cópias viram quantidade e count/contains não percorrem o deck
+def test_counts_and_membership():
+    deck = Deck("copias")
+    card = make_card(7, "Sete")
+    deck.add_card(card, amount=3)
+    deck.add_card(card, zone="side")
+
+    assert deck.count(7) == 4
+    assert deck.count(7, "main") == 3
+    assert 7 in deck
+    assert card in deck
+    assert deck.entries("main") == [(card, 3)]
+
+
+# unit: remover por id funciona mesmo com objetos Card guardados no deck
+def test_remove_card_objects_by_id():
+    deck = Deck("remover")
+    deck.add_card(make_card(1, "Um"), amount=2)
+    deck.add_card(make_card(1, "Um"), zone="side")
+
+    assert deck.remove_card(1, amount=2) == 2
+    assert deck.count(1) == 1
+    assert deck.count(1, "side") == 1
+
+    assert deck.remove_card(1, amount=5) == 1
+    assert 1 not in deck
+    assert deck.remove_card(1) == 0
+
+
+# unit: o JSON salvo guarda {id: quantidade} por zona e volta igual
+def test_save_and_load_zones(tmp_path):
+    cards = [make_card(1, "Um"), make_card(2, "Dois", ["Xyz"])]
+    deck = Deck("ida_e_volta")
+    deck.add_card(cards[0], amount=3)
+    deck.add_card(cards[1])
+    deck.add_card(cards[0], zone="side")
+
+    save_deck(deck, folder=str(tmp_path))
+    with open(tmp_path / "ida_e_volta.json", encoding="utf-8") as f:
+        raw = json.load(f)
+    assert raw == {"name": "ida_e_volta", "main": {"1": 3}, "extra": {"2": 1}, "side": {"1": 1}}
+
+    loaded = load_deck("ida_e_volta", FakeDB(cards), folder=str(tmp_path))
+    assert loaded.to_dict() == deck.to_dict()
+
+
+# unit: decks salvos no formato antigo (lista "cards") continuam carregando
+def test_load_old_format(tmp_path):
+    with open(tmp_path / "antigo.json", "w", encoding="utf-8") as f:
+        json.dump({"name": "antigo", "cards": [1, 1, 2, 99]}, f)
+
+    db = FakeDB([make_card(1, "Um"), make_card(2, "Dois", ["Fusão"])])
+    deck = load_deck("antigo", db, folder=str(tmp_path))
+
+    assert deck.count(1, "main") == 2
+    assert deck.count(2, "extra") == 1
+    assert 99 not in deck
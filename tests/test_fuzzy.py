@@ -0,0 +1,52 @@
+from models.fuzzy import NameMatcher, edit_distance, max_typos
+
+NAMES = [
+    (1, "Blue-Eyes White Dragon"),
+    (2, "Blue-Eyes Ultimate Dragon"),
+    (3, "Gem-Knight Seraphinite"),
+    (4, "Kuriboh"),
+    (5, "Winged Kuriboh"),
+    (6, "Dark Magician"),
+    (7, "Dark Magician Girl"),
+    (8, "Dragão Branco de Olhos Azuis"),
+]
+
+
+def ids(matches):
+    return [card_id for card_id, _ in matches]
+
+
+# unit: distância de edição com transposição, limitada
+def test_edit_distance():
+    assert edit_distance("kuriboh", "kuriboh", 2) == 0
+    assert edit_distance("kurbioh", "kuriboh", 2) == 1
+    assert edit_distance("seraphinit", "seraphinite", 2) == 1
+    assert edit_distance("magician", "magican", 2) == 1
+    assert edit_distance("dragon", "kuriboh", 2) == 3
+    assert max_typos("de") == 0 and max_typos("olhos") == 1 and max_typos("seraphinite") == 2
+
+
+# unit: erros de digitação, hífens, acentos e palavras soltas acham o nome certo
+def test_match_tolerates_typos():
+    matcher = NameMatcher.build(NAMES)
+
+    assert ids(matcher.match("Blue Eyes White Dragon")) == [1, 2]
+    assert matcher.match("Blue Eyes White Dragon")[0][1] == (0, 0, 0)
+    assert ids(matcher.match("Seraphinit"))[0] == 3
+    assert ids(matcher.match("kurbioh")) == [4, 5]
+    assert ids(matcher.match("dark magican girl"))[0] == 7
+    assert ids(matcher.match("dragao branco olhos azuis")) == [8]
+    assert matcher.match("zzzz") == []
+    assert matcher.match("") == []
+
+
+# unit: ordem por palavras faltando, erros e palavras a mais; limit corta a lista
+def test_match_order_and_limit():
+    matcher = NameMatcher.build(NAMES)
+
+    costs = dict(matcher.match("dark magician"))
+    assert costs[6] == (0, 0, 0) and costs[7] == (0, 0, 1)
+    assert ids(matcher.match("blue eyes dragon")) == [1, 2]
+    assert ids(matcher.match("blue eyes dragon", limit=1)) == [1]
+    # Metade das palavras precisa aparecer no nome
+    assert matcher.match("kuriboh azul verde") == []
@@ -0,0 +1,167 @@
+import json
+from unittest import mock
+
+import pytest
+
+from cli import DeckManager
+from models.card import Card
+from models.deck import Deck
+from storage.journal import DeckJournal
+from storage.storage import JsonDeckStore, open_store
+
+CARDS = {
+    1: Card({"id": 1, "name": "Um", "properties": ["Efeito"]}),
+    2: Card({"id": 2, "name": "Dois", "properties": ["Fusão"]}),
+    3: Card({"id": 3, "name": "Três"}),
+}
+
+
+def open_manager(location, **options):
+    store = open_store(location)
+    return DeckManager(store, CARDS.get, DeckJournal(store, **options))
+
+
+def close(manager):
+    manager.journal.close()
+    manager.journal.store.close()
+
+
+def state(manager):
+    return {name: deck.to_dict() for name, deck in sorted(manager.decks.items())}
+
+
+def journal_lines(manager):
+    with open(manager.journal.path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def edit(manager):
+    manager.create("a")
+    manager.add("a", CARDS[1], amount=3)
+    manager.add("a", CARDS[2])
+    manager.add("a", CARDS[3], zone="side")
+    manager.remove("a", 1)
+    manager.create("b")
+    manager.add("b", CARDS[3])
+    manager.rename("b", "c")
+    manager.create("d")
+    manager.delete("d")
+
+
+# unit: reabrir o diário reconstrói exatamente o mesmo estado
+def test_replay_restores_state(location):
+    manager = open_manager(location)
+    edit(manager)
+    expected = state(manager)
+    close(manager)
+
+    reopened = open_manager(location)
+    assert state(reopened) == expected
+    assert state(reopened)["a"]["main"] == {1: 2}
+    assert reopened.journal.seq == manager.journal.seq
+    close(reopened)
+
+
+# unit: uma linha cortada no fim do diário é descartada, o resto é aplicado
+def test_torn_tail_is_discarded(location):
+    manager = open_manager(location)
+    manager.create("a")
+    manager.add("a", CARDS[1])
+    close(manager)
+
+    with open(manager.journal.path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 3, "op": "add", "deck": "a", "ca')
+
+    reopened = open_manager(location)
+    assert reopened.get("a").count(1) == 1
+
+    # A entrada nova vai numa linha íntegra, logo após a última válida
+    reopened.add("a", CARDS[3])
+    assert [entry["seq"] for entry in journal_lines(reopened)] == [1, 2, 3]
+    close(reopened)
+
+
+# unit: deck salvo com seq maior que o diário (backup, outra instalação) não perde alterações
+def test_deck_ahead_of_journal(location):
+    store = open_store(location)
+    restored, gone = Deck("restaurado"), Deck("apagado")
+    restored.seq = gone.seq = 50
+    store.write_many([restored, gone])
+    store.close()
+
+    manager = open_manager(location)
+    manager.add("restaurado", CARDS[1])
+    manager.delete("apagado")
+    manager.create("apagado")
+    manager.add("apagado", CARDS[3])
+    assert manager.journal.seq > 50
+    expected = state(manager)
+    close(manager)  # queda: nada foi gravado no backend
+
+    reopened = open_manager(location)
+    assert state(reopened) == expected
+    assert reopened.get("restaurado").count(1) == 1
+    close(reopened)
+
+
+# unit: a compactação grava os decks no backend e recomeça o diário
+def test_compaction(location):
+    manager = open_manager(location, compact_every=4)
+    edit(manager)
+    expected = state(manager)
+
+    lines = journal_lines(manager)
+    assert lines[0]["op"] == "checkpoint"
+    assert len(lines) <= 4
+    assert "a" in manager.journal.store
+    close(manager)
+
+    reopened = open_manager(location)
+    assert state(reopened) == expected
+    reopened.create("e")
+    assert reopened.get("e").seq == 11
+    close(reopened)
+
+
+# unit: queda entre a gravação dos decks e o checkpoint não reaplica entradas
+def test_crash_before_checkpoint_is_idempotent(location):
+    manager = open_manager(location)
+    edit(manager)
+    expected = state(manager)
+
+    with mock.patch.object(manager.journal, "checkpoint", side_effect=OSError("queda")):
+        with pytest.raises(OSError):
+            manager.journal.compact(manager.decks)
+    close(manager)
+
+    assert state(open_manager(location)) == expected
+
+
+# unit: deck renomeado e salvo antes da queda não volta com o nome antigo
+def test_rename_already_saved(tmp_path):
+    manager = open_manager(str(tmp_path))
+    manager.create("velho")
+    manager.add("velho", CARDS[1])
+    manager.rename("velho", "novo")
+    manager.add("novo", CARDS[3])
+    manager.flush(["velho", "novo"])
+    expected = state(manager)
+    close(manager)
+
+    assert state(open_manager(str(tmp_path))) == expected
+
+
+# unit: o fsync é feito em lotes, não a cada entrada
+def test_fsync_batching(tmp_path):
+    manager = open_manager(str(tmp_path), sync_every=5, sync_interval=3600)
+    with mock.patch("storage.journal.os.fsync") as fsync:
+        manager.create("a")
+        for _ in range(9):
+            manager.add("a", CARDS[1])
+        assert fsync.call_count == 2
+
+        manager.journal.close()
+        assert fsync.call_count == 2  # nada pendente
+
+    assert open_manager(str(tmp_path)).get("a").count(1) == 9
+    assert JsonDeckStore(str(tmp_path)).names() == []  # nada gravado sem compactar
@@ -0,0 +1,58 @@
+import os
+from conftest import write_cards
+from models import catalog
+from models.database import CardDatabase
+
+
+CARDS = {f"{i}.json": {"id": i, "name": f"Card {i}", "effectText": "Efeito comum"} for i in range(1, 6)}
+
+
+# unit: Modo preguiçoso gera o catálogo e não materializa cartas na carga
+def test_lazy_database_builds_catalog_and_starts_empty(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+
+    db = CardDatabase(path=str(folder), lazy=True)
+
+    assert os.path.exists(catalog.catalog_path(str(folder)))
+    assert len(db.cards) == 5
+    assert len(db.cards._cache) == 0
+    db.close()
+
+
+# unit: get() materializa a carta uma vez e reaproveita o objeto do cache
+def test_lazy_get_uses_cache(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    db = CardDatabase(path=str(folder), lazy=True)
+
+    card = db.get(3)
+
+    assert card.name == "Card 3"
+    assert db.get(3) is card
+    assert db.get(999) is None
+    assert 3 in db.cards and 999 not in db.cards
+    db.close()
+
+
+# unit: O cache LRU respeita o limite e descarta a carta menos usada
+def test_lazy_cache_is_bounded(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    db = CardDatabase(path=str(folder), lazy=True, cache_size=2)
+
+    db.get(1)
+    db.get(2)
+    db.get(1)
+    db.get(3)
+
+    assert list(db.cards._cache) == [1, 3]
+    db.close()
+
+
+# unit: Busca no modo preguiçoso devolve os mesmos resultados do modo normal
+def test_lazy_search_matches_eager(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    eager = CardDatabase(path=str(folder), use_catalog=False)
+    lazy = CardDatabase(path=str(folder), lazy=True)
+
+    assert [c.id for c in lazy.search("card 2")] == [c.id for c in eager.search("card 2")]
+    assert len(lazy.search("efeito")) == 5
+    lazy.close()
@@ -0,0 +1,115 @@
+import json
+from unittest import mock
+
+import pytest
+
+from cli import DeckManager
+from models.card import Card
+from models.deck import Deck
+from models.legality import MAX_COPIES, Validator, load_banlist
+from storage.storage import open_store
+
+FORBIDDEN, LIMITED, SEMI, FUSION = 5, 6, 7, 900
+
+
+def resolve(card_id):
+    properties = ["Dragão", "Fusão"] if card_id == FUSION else ["Efeito"]
+    return Card({"id": card_id, "name": f"Carta {card_id}", "properties": properties})
+
+
+@pytest.fixture
+def validator(tmp_path):
+    path = tmp_path / "banlist.json"
+    path.write_text(json.dumps({"forbidden": [FORBIDDEN], "limited": [LIMITED], "semi_limited": [SEMI]}))
+    return Validator.load(str(path), resolve)
+
+
+def legal_zones():
+    return {"main": {card_id: 3 for card_id in range(10, 24)}, "extra": {FUSION: 2}, "side": {}}  # 42 no Main
+
+
+# unit: a lista de banidas vira um array id -> limite; sem arquivo, tudo vale 3
+def test_load_banlist(tmp_path, validator):
+    assert [validator.limit(i) for i in (FORBIDDEN, LIMITED, SEMI, 1, 10**6)] == [0, 1, 2, 3, 3]
+    assert load_banlist(str(tmp_path / "nada.json")) == bytearray()
+    assert Validator().limit(1) == MAX_COPIES
+
+    bad = tmp_path / "ruim.json"
+    bad.write_text(json.dumps({"banned": [1]}))
+    with pytest.raises(ValueError):
+        load_banlist(str(bad))
+
+
+# unit: tamanhos das zonas, cópias (somando Main, Extra e Side) e zona errada
+def test_check_deck(validator):
+    assert validator.check(legal_zones()) == []
+
+    zones = legal_zones()
+    zones["main"].update({FORBIDDEN: 1, LIMITED: 1, FUSION: 1})
+    zones["side"] = {LIMITED: 1, 10: 1, 30: 16}
+    zones["extra"][11] = 1
+    messages = [p.message for p in validator.check(zones)]
+    assert messages == [
+        "Side Deck com 18 cartas (máximo 15).",
+        "4 cópias da carta 10 (o limite é 3).",
+        "4 cópias da carta 11 (o limite é 3).",
+        "Carta 5 é proibida.",
+        "2 cópias da carta 6 (o limite é 1).",
+        "16 cópias da carta 30 (o limite é 3).",
+        "Carta 900 é do Extra Deck e está no Main Deck.",
+        "Carta 11 não pode ficar no Extra Deck.",
+    ]
+    assert validator.check({"main": {10: 3}})[0].message == "Main Deck com 3 cartas (precisa ter de 40 a 60)."
+
+
+# unit: com validador, add recusa só o que deixaria o deck ilegal
+def test_add_is_validated(validator):
+    manager = DeckManager(resolve=resolve, validator=validator)
+    manager.create("d")
+    manager.add("d", resolve(SEMI), amount=2)
+    manager.add("d", resolve(FUSION))  # vai para o Extra Deck
+
+    for card, amount, zone, message in [
+        (resolve(SEMI), 1, None, "3 cópias da carta 7 (o limite é 2)."),
+        (resolve(FORBIDDEN), 1, "side", "Carta 5 é proibida."),
+        (resolve(FUSION), 1, "main", "Carta 900 é do Extra Deck e está no Main Deck."),
+        (resolve(10), 1, "extra", "Carta 10 não pode ficar no Extra Deck."),
+    ]:
+        with pytest.raises(ValueError) as error:
+            manager.add("d", card, amount, zone)
+        assert str(error.value) == message
+
+    for card_id in range(10, 29):
+        manager.add("d", resolve(card_id), amount=3)
+    with pytest.raises(ValueError, match="O Main Deck passaria a ter 61 cartas"):
+        manager.add("d", resolve(40), amount=2)
+    assert manager.get("d").size("main") == 59
+    assert manager.validate("d").problems == []
+
+
+# unit: validar o acervo todo lê cada deck salvo uma vez e não o guarda em memória
+def test_validate_all_streams(tmp_path, validator):
+    store = open_store(str(tmp_path / "decks.db"))
+    good = Deck("bom")
+    for card_id, amount in legal_zones()["main"].items():
+        good.add_card(card_id, amount, "main")
+    bad = Deck("ruim")
+    bad.add_card(FORBIDDEN, 1, "main")
+    store.write_many([good, bad])
+
+    manager = DeckManager(store, resolve, validator=validator)
+    manager.create("novo")
+    with mock.patch.object(store, "read", wraps=store.read) as read:
+        reports = {report.name: report for report in manager.validate_all()}
+    assert read.call_count == 2
+    assert manager.decks.loaded() == ["novo"]
+
+    assert reports["bom"].problems == []
+    assert [p.message for p in reports["ruim"].problems] == [
+        "Main Deck com 1 cartas (precisa ter de 40 a 60).",
+        "Carta 5 é proibida.",
+    ]
+    assert reports["novo"].problems[0].card_id is None
+    with pytest.raises(ValueError):
+        manager.validate("nada")
+    store.close()
@@ -0,0 +1,32 @@
+from conftest import write_cards
+from models.database import CardDatabase
+from models.loader import load_files
+
+
+CARDS = {f"{i:03}.json": {"id": i, "name": f"Card {i}"} for i in range(40)}
+CARDS["zlist.json"] = [{"id": 100, "name": "A"}, {"id": 3, "name": "B"}]
+
+
+# unit: A leitura paralela devolve os registros na mesma ordem da leitura serial
+def test_parallel_load_matches_serial(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+    names = sorted(p.name for p in folder.iterdir())
+
+    serial = load_files(str(folder), names)
+    parallel = load_files(str(folder), names, workers=2)
+
+    assert parallel == serial
+    assert len(parallel) == len(names)
+    assert parallel[-1] == [{"id": 100, "name": "A"}, {"id": 3, "name": "B"}]
+
+
+# unit: CardDatabase com workers produz o mesmo mapa de cartas, inclusive com ids repetidos
+def test_database_with_workers_matches_serial(tmp_path):
+    folder = write_cards(tmp_path / "db", CARDS)
+
+    serial = CardDatabase(path=str(folder), use_catalog=False)
+    parallel = CardDatabase(path=str(folder), use_catalog=False, workers=2)
+
+    assert list(parallel.cards) == list(serial.cards)
+    assert [c.to_dict() for c in parallel.cards.values()] == [c.to_dict() for c in serial.cards.values()]
+    assert parallel.get(3).name == "B"
@@ -0,0 +1,68 @@
+import pytest
+from conftest import write_cards
+from models import catalog
+from models.multilang import MultiLocaleDatabase
+
+
+@pytest.fixture
+def database(tmp_path):
+    write_cards(tmp_path / "en", {"cards.json": [
+        {"id": 1, "type": "monster", "name": "Dark Magician", "localizedAttribute": "DARK",
+         "englishAttribute": "dark", "effectText": "The ultimate wizard.", "level": 7, "atk": 2500,
+         "def": 2100, "properties": ["Spellcaster", "Normal"]},
+        {"id": 2, "type": "spell", "name": "Pot of Greed", "localizedAttribute": "SPELL",
+         "englishAttribute": "spell", "effectText": "Draw 2 cards."},
+    ]})
+    write_cards(tmp_path / "pt", {"cards.json": [
+        {"id": 1, "type": "monster", "name": "Mago Negro", "localizedAttribute": "TREVAS",
+         "englishAttribute": "dark", "effectText": "O mago definitivo.", "level": 7, "atk": 2500,
+         "def": 2100, "properties": ["Mago", "Normal"]},
+    ]})
+    return MultiLocaleDatabase({"en": str(tmp_path / "en"), "pt": str(tmp_path / "pt")}, default="pt")
+
+
+# unit: get devolve a carta no idioma pedido, com os campos comuns compartilhados
+def test_get_by_language(database):
+    pt = database.get(1)
+    en = database.get(1, lang="en")
+
+    assert pt.name == "Mago Negro" and pt.attribute == "TREVAS" and pt.properties == ["Mago", "Normal"]
+    assert en.name == "Dark Magician" and en.attribute == "DARK"
+    assert pt.atk == en.atk == 2500
+    assert len(database.shared) == 2
+    assert database.get(2) is None
+    assert database.get(2, lang="en").name == "Pot of Greed"
+
+
+# unit: Busca usa o índice do idioma pedido
+def test_search_by_language(database):
+    assert [c.id for c in database.search("mago")] == [1]
+    assert database.search("wizard") == []
+    assert [c.name for c in database.search("wizard", lang="en")] == ["Dark Magician"]
+    assert [c.id for c in database.view("en").search("draw")] == [2]
+
+
+# unit: Idiomas não carregados levantam ValueError
+def test_unknown_language(database):
+    with pytest.raises(ValueError):
+        database.get(1, lang="jp")
+
+
+# unit: pastas sem como gravar o catálogo (somente leitura, disco cheio) são lidas direto
+def test_falls_back_on_os_error(tmp_path, monkeypatch):
+    write_cards(tmp_path / "en", {"cards.json": [
+        {"id": 1, "name": "Dark Magician", "effectText": "The ultimate wizard."},
+    ]})
+    write_cards(tmp_path / "pt", {"cards.json": [
+        {"id": 1, "name": "Mago Negro", "effectText": "O mago definitivo."},
+    ]})
+
+    def read_only(*args):
+        raise OSError(30, "Read-only file system")
+
+    monkeypatch.setattr(catalog, "sync_catalog", read_only)
+    db = MultiLocaleDatabase({"en": str(tmp_path / "en"), "pt": str(tmp_path / "pt")}, default="pt")
+
+    assert db.get(1).name == "Mago Negro"
+    assert [c.name for c in db.search("wizard", "en")] == ["Dark Magician"]
+    assert not list(tmp_path.glob("*.catalog")) and not list(tmp_path.glob("*.index"))
@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+from models import odds
+from models.deck import Deck
+from models.odds import Need, exact_odds, parse_needs
+
+
+def deck_of(copies, filler=40):
+    """Deck com as cópias pedidas ({id: n}) completado até ``filler`` cartas com a carta 999."""
+    deck = Deck("teste")
+    for card_id, n in copies.items():
+        deck.add_card(card_id, n)
+    deck.add_card(999, filler - deck.size())
+    return deck
+
+
+# unit: condições em texto viram Need; erros de formato levantam ValueError
+def test_parse_needs():
+    assert parse_needs("4007 4064,5649 2:1,2") == [
+        Need(frozenset({4007}), 1),
+        Need(frozenset({4064, 5649}), 1),
+        Need(frozenset({1, 2}), 2),
+    ]
+    for text in ("", "abc", "0:1", "1,"):
+        with pytest.raises(ValueError):
+            parse_needs(text)
+
+
+# unit: hipergeométrica exata, simples e com grupos disjuntos
+def test_exact_odds():
+    deck = deck_of({1: 3, 2: 3, 3: 2})
+
+    assert deck.odds("1") == pytest.approx(1 - math.comb(37, 5) / math.comb(40, 5))
+    assert deck.odds("1,2") == pytest.approx(1 - math.comb(34, 5) / math.comb(40, 5))
+    assert deck.odds("2:1", hand_size=6) == pytest.approx(
+        sum(math.comb(3, k) * math.comb(37, 6 - k) for k in (2, 3)) / math.comb(40, 6)
+    )
+
+    # Um de cada grupo: inclusão-exclusão sobre "nenhum do grupo"
+    none1, none2 = math.comb(37, 5), math.comb(37, 5)
+    both_missing = math.comb(34, 5)
+    expected = 1 - (none1 + none2 - both_missing) / math.comb(40, 5)
+    assert deck.odds("1 2") == pytest.approx(expected)
+
+    assert deck.odds("7") == 0.0
+    with pytest.raises(ValueError):
+        deck.odds("1", hand_size=41)
+    with pytest.raises(ValueError):
+        exact_odds(deck.zones["main"], parse_needs("1,2 2,3"))
+
+
+# unit: a simulação repete com a mesma semente e cobre o valor exato no intervalo
+def test_simulation_matches_exact():
+    pytest.importorskip("numpy")
+    deck = deck_of({1: 3, 2: 3, 3: 2})
+
+    first = deck.simulate("1 2,3", trials=200_000, seed=7)
+    assert first == deck.simulate("1 2,3", trials=200_000, seed=7)
+    # Folga de 4 meias-larguras: o intervalo de 95% erra 1 vez em 20
+    assert abs(first.probability - deck.odds("1 2,3")) <= 2 * (first.high - first.low)
+    assert first.trials == 200_000
+
+    # Grupos que se sobrepõem caem na simulação; mão do tamanho do deck sempre acerta
+    estimate = deck.odds("1,2 2,3")
+    assert isinstance(estimate, odds.Estimate)
+    assert 0 < estimate.low <= estimate.probability <= estimate.high < 1
+    assert deck.simulate("1", hand_size=40, trials=1000).probability == 1.0
+
+
+# unit: o intervalo de Wilson fica dentro de [0, 1] e contém a proporção
+def test_wilson_interval():
+    assert odds.wilson(0, 100)[0] == 0.0
+    assert odds.wilson(100, 100)[1] == 1.0
+    low, high = odds.wilson(50, 100)
+    assert low < 0.5 < high and high - low == pytest.approx(0.19, abs=0.01)
@@ -0,0 +1,89 @@
+import pytest
+from conftest import write_cards
+from models.card import Card
+from models.database import CardDatabase
+from models.query import Condition, QueryIndex, parse_query
+
+
+CARDS = [
+    Card({"id": 1, "type": "monster", "localizedAttribute": "DARK", "level": 8, "atk": 3000, "def": 2500,
+          "properties": ["Dragon", "Effect"]}),
+    Card({"id": 2, "type": "monster", "localizedAttribute": "LIGHT", "level": 4, "atk": 1800, "def": 1000,
+          "properties": ["Winged Beast"]}),
+    Card({"id": 3, "type": "monster", "localizedAttribute": "DARK", "rank": 4, "atk": 2500, "def": 2000,
+          "properties": ["Dragon", "Xyz"]}),
+    Card({"id": 4, "type": "spell", "localizedAttribute": "SPELL"}),
+]
+
+
+# unit: parse_query converte filtros, aliases e aspas
+def test_parse_query():
+    conditions = parse_query('type=monster attr=DARK level>=7 prop="Winged Beast"')
+
+    assert conditions == [
+        Condition("type", "=", "monster"),
+        Condition("attribute", "=", "dark"),
+        Condition("level", ">=", 7),
+        Condition("property", "=", "winged beast"),
+    ]
+
+
+# unit: Filtros inválidos levantam ValueError
+@pytest.mark.parametrize("text", ["level", "color=red", "atk>=muito", "type>monster", 'prop="aberto'])
+def test_parse_query_errors(text):
+    with pytest.raises(ValueError):
+        parse_query(text)
+
+
+# unit: Campos categóricos, numéricos e multivalorados combinados por interseção
+def test_query_index():
+    index = QueryIndex.build(CARDS)
+
+    assert index.query(parse_query("type=monster attribute=DARK")) == {1, 3}
+    assert index.query(parse_query("atk>=2500 property=Dragon")) == {1, 3}
+    assert index.query(parse_query("level>=7")) == {1}
+    assert index.query(parse_query("rank=4")) == {3}
+    assert index.query(parse_query("atk<2500")) == {2}
+    assert index.query(parse_query("atk<=2500 def!=2000")) == {2}
+    assert index.query(parse_query("type!=monster")) == {4}
+    assert index.query(parse_query("property=Xyz level>=1")) == set()
+    assert index.query([]) == {1, 2, 3, 4}
+
+
+# unit: monstros com ATK/DEF "?" (-1) nunca casam com filtros numéricos
+@pytest.mark.parametrize("text", ["atk<0", "atk<=1000", "atk=-1", "def<=0", "def!=2000"])
+def test_unknown_atk_def_never_match(text):
+    unknown = Card({"id": 9, "type": "monster", "localizedAttribute": "DIVINE", "level": 10, "atk": -1, "def": -1})
+    index = QueryIndex.build([*CARDS, unknown])
+    assert 9 not in index.query(parse_query(text))
+    assert index.query(parse_query("level>=10")) == {9}
+
+
+# unit: CardDatabase.query devolve as cartas ordenadas por id
+def test_database_query(tmp_path):
+    folder = write_cards(tmp_path / "db", {"list.json": [
+        {"id": 11, "name": "Dragão", "type": "monster", "localizedAttribute": "TREVAS", "level": 7, "atk": 2800,
+         "properties": ["Dragão"]},
+        {"id": 10, "name": "Guerreiro", "type": "monster", "localizedAttribute": "LUZ", "level": 4, "atk": 1900,
+         "properties": ["Guerreiro"]},
+    ]})
+
+    db = CardDatabase(path=str(folder))
+
+    assert [c.id for c in db.query("property=dragao")] == [11]
+    assert [c.id for c in db.query("type=monster")] == [10, 11]
+
+
+# unit: o atributo casa pelo nome da base e pelo nome em inglês, no índice e nas colunas
+@pytest.mark.parametrize("text", ["attribute=TREVAS", "attribute=DARK", "attr=dark", "attribute!=LUZ", "attribute!=light"])
+def test_attribute_in_either_language(text):
+    cards = [
+        Card({"id": 1, "type": "monster", "localizedAttribute": "TREVAS", "englishAttribute": "dark"}),
+        Card({"id": 2, "type": "monster", "localizedAttribute": "LUZ", "englishAttribute": "light"}),
+    ]
+    assert QueryIndex.build(cards).query(parse_query(text)) == {1}
+
+    pytest.importorskip("numpy")
+    from models.columns import CardColumns
+    columns = CardColumns.build(cards)
+    assert columns.ids[columns.mask(text)].tolist() == [1]
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from models import ratios
+from models.deck import Deck
+from models.odds import exact_odds, parse_needs
+from models.ratios import Flex, optimize, parse_flex, variants
+
+
+def base_deck():
+    """Deck de 40 cartas: ids 1 a 4 com 3 cópias, o resto preenchido com a carta 999."""
+    deck = Deck("base")
+    for card_id in (1, 2, 3, 4):
+        deck.add_card(card_id, 3)
+    deck.add_card(999, 28)
+    return deck
+
+
+# unit: formato id:mín-máx das cartas flexíveis
+def test_parse_flex():
+    assert parse_flex("1:1-3,2:2") == [Flex(1, 1, 3), Flex(2, 2, 2)]
+    for text in ("", "1", "1:3-1", "a:1-2"):
+        with pytest.raises(ValueError):
+            parse_flex(text)
+
+
+# unit: só variantes entre 40 e 60 cartas e com no máximo 3 cópias
+def test_variants_respect_rules():
+    counts = dict(base_deck().zones["main"])
+    found = list(variants(counts, [Flex(1, 0, 5), Flex(2, 1, 3)]))
+
+    assert {1: 3, 2: 3} in found
+    assert all(copies[1] <= 3 for copies in found)
+    # Tirar cópias das duas deixaria o deck com menos de 40
+    assert found == [copies for copies in found if 34 + sum(copies.values()) >= 40]
+    assert list(variants(counts, [Flex(1, 0, 0)])) == []
+
+
+# unit: com grupos disjuntos as variantes são ordenadas pela chance exata
+def test_optimize_exact():
+    deck = base_deck()
+    best = optimize(deck, "1,2", "1:1-3,2:1-3,3:0-3", top=3)
+
+    # Tirar cópias da carta 3 deixaria o deck com menos de 40
+    assert best[0].copies == {1: 3, 2: 3, 3: 3} and best[0].size == 40
+    expected = exact_odds(deck.zones["main"], parse_needs("1,2"))
+    assert best[0].probability == pytest.approx(expected)
+    assert [v.probability for v in best] == sorted((v.probability for v in best), reverse=True)
+    with pytest.raises(ValueError):
+        optimize(deck, "1", "1:0-0")
+
+
+# unit: a simulação em processos dá o mesmo que a local (mesmas chaves) e libera a memória
+def test_optimize_simulated_in_processes():
+    pytest.importorskip("numpy")
+    deck = base_deck()
+    options = dict(top=4, simulate=True, trials=20_000, seed=5)
+
+    local = optimize(deck, "1,2 3", "1:1-3,2:1-3,3:1-3", workers=1, **options)
+    pooled = optimize(deck, "1,2 3", "1:1-3,2:1-3,3:1-3", workers=2, **options)
+    assert pooled == local
+    assert ratios._memory is None
+
+    exact = optimize(deck, "1,2 3", "1:1-3,2:1-3,3:1-3", top=1)[0]
+    assert local[0].copies == exact.copies
+    assert abs(local[0].probability - exact.probability) < 0.02
+
+    if os.path.isdir("/dev/shm"):
+        assert not [f for f in os.listdir("/dev/shm") if f.startswith("psm_")]
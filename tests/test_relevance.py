@@ -0,0 +1,64 @@
+from cli import DeckManager
+from conftest import keep_id, make_deck
+from storage.relevance import CardRelevance, Partner, raw_counts
+
+
+def snapshot(relevance, ids):
+    return {card_id: (relevance.stats(card_id), relevance.played_with(card_id, 100)) for card_id in ids}
+
+
+# unit: inclusão, cópias médias e coocorrência lidas dos decks salvos
+def test_stats_from_store(store):
+    store.write_many([
+        make_deck("a", {1: 3, 2: 1}, side={3: 2}),
+        make_deck("b", {1: 1, 2: 2}),
+        make_deck("c", {1: 2, 4: 3}),
+        make_deck("d", {5: 1}),
+    ])
+    relevance = DeckManager(store, keep_id).relevance
+
+    stats = relevance.stats(1)
+    assert (stats.decks, stats.inclusion, stats.copies) == (3, 0.75, 2.0)
+    assert relevance.played_with(1) == [Partner(2, 2, 2 / 3), Partner(3, 1, 1 / 3), Partner(4, 1, 1 / 3)]
+    assert relevance.played_with(1, limit=1) == [Partner(2, 2, 2 / 3)]
+    assert relevance.played_with(5) == [] and relevance.played_with(99) == []
+    assert relevance.stats(99).decks == 0
+    assert [r.card_id for r in relevance.top(2)] == [1, 2]
+
+
+# unit: gravar, apagar e renomear atualiza o índice igual a reler tudo do backend
+def test_incremental_matches_rescan(store):
+    manager = DeckManager(store, keep_id)
+    for name, counts in {"a": {1: 3, 2: 1}, "b": {2: 2, 3: 1}, "c": {1: 1, 3: 3}}.items():
+        manager.create(name)
+        for card_id, amount in counts.items():
+            manager.add(name, card_id, amount)
+    manager.flush()
+    relevance = manager.relevance
+    assert len(relevance) == 3
+
+    manager.remove("a", 2, amount=1)
+    manager.add("a", 4)
+    manager.add("b", 1)
+    manager.delete("c", persist=True)
+    manager.rename("b", "d", persist=True)
+    manager.create("e")
+    manager.add("e", 1)  # não gravado: ainda não conta
+    manager.flush(["a"])
+
+    ids = range(1, 6)
+    assert len(relevance) == 2
+    assert snapshot(relevance, ids) == snapshot(DeckManager(store, keep_id).relevance, ids)
+    assert relevance.played_with(1) == [Partner(2, 1, 0.5), Partner(3, 1, 0.5), Partner(4, 1, 0.5)]
+
+    # Compactar o diário grava pelo mesmo caminho
+    manager.flush()
+    assert relevance.stats(1).decks == 3
+
+
+# unit: sem backend o índice fica vazio; registros antigos ("cards") também contam
+def test_without_store_and_old_format():
+    relevance = CardRelevance(DeckManager().decks)
+    assert len(relevance) == 0 and relevance.stats(1).inclusion == 0.0
+    assert raw_counts({"cards": [1, 1, 2]}) == {1: 2, 2: 1}
+    assert raw_counts({"main": {"7": 2}, "side": {"7": 1}}) == {7: 3}
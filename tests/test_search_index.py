@@ -0,0 +1,189 @@
+import os
+
+import pytest
+
+from conftest import write_cards
+from models.database import CardDatabase
+from models.search_index import SearchIndex, fold, index_path, needs_substring, tokenize
+
+
+RECORDS = [
+    (1, "Dragão Branco de Olhos Azuis", "Um dragão lendário."),
+    (2, "Blue-Eyes White Dragon", "This legendary dragon is a powerful engine of destruction."),
+    (3, "Hydragon", "Draw 1 card."),
+    (4, "Fusão Definitiva", None),
+]
+
+
+# unit: fold remove acentos e deixa em minúsculas
+def test_fold_and_tokenize():
+    assert fold("Fusão DRAGÃO") == "fusao dragao"
+    assert tokenize("Blue-Eyes, Dragão!") == ["blue", "eyes", "dragao"]
+    assert tokenize(None) == []
+
+
+# unit: Consultas exatas, por prefixo e por trecho de palavra
+def test_lookup_modes():
+    index = SearchIndex.build(RECORDS)
+
+    assert index.lookup("dragon") == [2]
+    assert index.lookup_prefix("drag") == {1, 2}
+    assert index.lookup_infix("ragon") == {2, 3}
+
+
+# unit: Vários termos são combinados com AND
+def test_multi_term_and():
+    index = SearchIndex.build(RECORDS)
+
+    assert index.search("blue dragon") == {2}
+    assert index.search("dragao olhos") == {1}
+    assert index.search("dragon zzz") == set()
+    assert index.search("draw", mode="exact") == {3}
+
+
+# unit: Consultas sem termos indexáveis devolvem None para permitir a busca por substring
+def test_search_without_terms_returns_none():
+    index = SearchIndex.build(RECORDS)
+
+    assert index.search("") is None
+    assert index.search("+ -") is None
+
+
+# unit: add e remove mantêm as listas de ids ordenadas e sem termos órfãos
+def test_add_and_remove():
+    index = SearchIndex.build(RECORDS)
+
+    index.add(0, "Dragon Egg", None)
+    assert index.lookup("dragon") == [0, 2]
+    assert index.lookup("egg") == [0]
+
+    index.remove(0, "Dragon Egg", None)
+    assert index.lookup("dragon") == [2]
+    assert "egg" not in index.postings
+
+
+# unit: CardDatabase.search ignora acentos e cai na busca por substring com pontuação
+def test_database_search_uses_index(tmp_path):
+    folder = write_cards(tmp_path / "db", {"list.json": [
+        {"id": 1, "name": "Fusão Definitiva", "effectText": "Invoque 1 monstro +1"},
+        {"id": 2, "name": "Polimerização", "effectText": "Fusão de 2 monstros"},
+    ]})
+
+    db = CardDatabase(path=str(folder))
+
+    assert [c.id for c in db.search("fusao")] == [1, 2]
+    assert [c.id for c in db.search("FUSÃO defin")] == [1]
+    assert [c.id for c in db.search("+")] == [1]
+    assert len(db.search("")) == 2
+
+
+# unit: O índice gravado é reaproveitado e atualizado só com as cartas alteradas
+def test_persisted_index_is_updated_incrementally(tmp_path, monkeypatch):
+    folder = write_cards(tmp_path / "db", {
+        "1.json": {"id": 1, "name": "Alpha"},
+        "2.json": {"id": 2, "name": "Beta"},
+    })
+
+    db = CardDatabase(path=str(folder))
+    assert [c.id for c in db.search("alpha")] == [1]
+    assert os.path.exists(index_path(str(folder)))
+
+    write_cards(folder, {
+        "2.json": {"id": 2, "name": "Gamma"},
+        "3.json": {"id": 3, "name": "Alpha Prime"},
+    })
+
+    # uma reconstrução completa indicaria que a atualização incremental falhou
+    def fail(*args):
+        raise AssertionError("índice reconstruído do zero")
+
+    monkeypatch.setattr(SearchIndex, "build", fail)
+    db = CardDatabase(path=str(folder))
+
+    assert [c.id for c in db.search("alpha")] == [1, 3]
+    assert db.search("beta") == []
+    assert [c.id for c in db.search("gamma")] == [2]
+
+
+# unit: Busca por relevância: nome exato, prefixo do nome, termos no nome e só no efeito
+def test_ranked_tiers():
+    index = SearchIndex.build([
+        (1, "Dragão Negro", "Um monstro."),
+        (2, "Cavaleiro", "Destrua 1 dragão. Depois, destrua 1 dragão."),
+        (3, "Dragão", None),
+        (4, "O Dragão Negro Final", None),
+        (5, "Mago", "Invoque 1 dragão do seu cemitério."),
+        (6, "Dragão Negro Meteoro", None),
+    ])
+
+    assert index.ranked("dragão negro") == (3, [1, 6, 4])
+    # No efeito, quem cita o termo mais vezes (em texto curto) vem antes
+    assert index.ranked("dragão") == (6, [3, 1, 6, 4, 2, 5])
+    assert index.ranked("zzz") == (0, [])
+    assert index.ranked("+") is None
+
+
+# unit: limit/offset paginam o resultado sem repetir cartas
+def test_ranked_paging():
+    index = SearchIndex.build([(i, f"Carta {i}", "efeito " * (i % 5)) for i in range(1, 101)])
+
+    total, first = index.ranked("carta", limit=30)
+    _, second = index.ranked("carta", limit=30, offset=30)
+    _, last = index.ranked("carta", limit=30, offset=90)
+    assert total == 100
+    assert len(first) == 30 and len(last) == 10
+    assert not set(first) & set(second)
+    assert index.ranked("carta", limit=200)[1][:60] == first + second
+    assert index.ranked("carta", offset=100) == (100, [])
+
+
+# unit: Frequências e nomes sobrevivem à gravação e às atualizações incrementais
+def test_ranked_after_save_and_update(tmp_path):
+    path = str(tmp_path / "db.index")
+    SearchIndex.build(RECORDS).save(path, "stamp")
+    index, stamp = SearchIndex.load(path)
+    assert stamp == "stamp"
+    assert index.ranked("dragon") == SearchIndex.build(RECORDS).ranked("dragon")
+
+    index.add(5, "Dragon", "Dragon dragon.")
+    index.remove(2, RECORDS[1][1], RECORDS[1][2])
+    rebuilt = SearchIndex.build([r for r in RECORDS if r[0] != 2] + [(5, "Dragon", "Dragon dragon.")])
+    assert index.freqs == rebuilt.freqs
+    assert index.ranked("drag") == rebuilt.ranked("drag") == (3, [5, 1, 3])
+
+
+# unit: CardDatabase.search_ranked devolve as cartas da página e cai na substring sem termos
+def test_database_search_ranked(tmp_path):
+    folder = write_cards(tmp_path / "db", {"list.json": [
+        {"id": 1, "name": "Fusão Definitiva", "effectText": "Invoque 1 monstro +1"},
+        {"id": 2, "name": "Polimerização", "effectText": "Fusão de 2 monstros"},
+        {"id": 3, "name": "Fusão", "effectText": None},
+    ]})
+
+    db = CardDatabase(path=str(folder))
+
+    total, cards = db.search_ranked("fusao", limit=2)
+    assert total == 3
+    assert [c.id for c in cards] == [3, 1]
+    assert [c.id for c in db.search_ranked("fusao", offset=2)[1]] == [2]
+    assert [c.id for c in db.search_ranked("+")[1]] == [1]
+
+
+# unit: pontuação e termos curtos pedem o texto inteiro; termos longos bastam
+def test_needs_substring():
+    assert needs_substring("e's") and needs_substring("é") and needs_substring("1 card")
+    assert needs_substring("Dragão Branco de Olhos Azuis")
+    assert not needs_substring("dragão branco") and not needs_substring("")
+
+
+# unit: com pontuação ou termos curtos, search e search_ranked casam o mesmo que a busca por substring
+@pytest.mark.parametrize("path", ["database/en", "database/pt"])
+@pytest.mark.parametrize("text", ["e's", "é", "1 card", "of the", "Dragão Branco de Olhos Azuis"])
+def test_short_and_punctuated_queries_match_substring(path, text):
+    db = CardDatabase(path=path)
+    expected = sorted(card.id for card in db._scan(text))
+
+    assert sorted(card.id for card in db.search(text)) == expected
+    total, page = db.search_ranked(text, limit=len(expected) + 1)
+    assert total == len(expected)
+    assert sorted(card.id for card in page) == expected
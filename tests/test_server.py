@@ -0,0 +1,127 @@
+import asyncio
+import contextlib
+import io
+import socket
+import threading
+
+import pytest
+
+import client
+from cli import CardCLI
+from server import CardServer
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="sem socket Unix")
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Servidor rodando em uma thread, com decks numa pasta temporária."""
+    monkeypatch.setattr("cli.DECKS_STORE", str(tmp_path / "decks"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = CardCLI(defer_writes=True)
+    server = CardServer(cli)
+    path = str(tmp_path / "s.sock")
+
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(path),), daemon=True)
+    thread.start()
+    assert server.started.wait(30)
+    yield server
+
+    if thread.is_alive():
+        conn = client.Client(path)
+        conn.request({"op": "shutdown"})
+        conn.close()
+    thread.join(10)
+    cli.close()
+
+
+# unit: operações diretas sem passar pelo socket
+def test_handle_request(server):
+    assert server.handle_request({"op": "get", "id": 15579})["card"]["name"] == "Rivais Destinados"
+    assert server.handle_request({"op": "get", "id": -1})["ok"] is False
+    assert server.handle_request({"op": "search", "text": "Rivais Destinados"})["cards"] == [[15579, "Rivais Destinados"]]
+    page = server.handle_request({"op": "search", "text": "dragão", "limit": 5, "offset": 5})
+    assert page["total"] > 10 and len(page["cards"]) == 5
+    assert server.handle_request({"op": "query", "text": "cor=azul"}) == {"ok": False, "error": "Campo desconhecido: cor"}
+    assert server.handle_request({"op": "voar"})["ok"] is False
+    assert server.handle_request({"command": "list_decks"})["output"] == ["Nenhum deck disponível."]
+
+
+# e2e: dois clientes intercalados veem o mesmo estado, cada um com suas respostas
+def test_concurrent_clients(server):
+    a = client.Client(server.address)
+    b = client.Client(server.address)
+
+    assert a.command("create_deck Compartilhado")["ok"]
+    assert b.command("add_card Compartilhado 15579")["output"] == ["Carta 15579 adicionada ao deck 'Compartilhado'."]
+    assert a.request({"op": "get", "id": 15579})["ok"]
+    assert "  1x 15579 — Rivais Destinados" in a.command("show_deck Compartilhado")["output"]
+
+    bad = b.command("voar_alto")
+    assert bad == {"command": "voar_alto", "ok": False, "error": "Comando desconhecido: voar_alto", "output": []}
+
+    # Linha que não é JSON não derruba a conexão
+    b.file.write(b"isso nao e json\n")
+    b.file.flush()
+    assert b"Requisi" in b.file.readline()
+    assert b.command("where_used 15579")["output"][1] == "• Compartilhado"
+
+    a.close()
+    b.close()
+
+
+# e2e: o cliente de linha de comando repassa -c e imprime a saída
+def test_client_main(server, capsys):
+    code = client.main(["--socket", server.address, "-c", "create_deck Cliente", "-c", "list_decks"])
+    assert code == 0
+    assert capsys.readouterr().out == "Deck 'Cliente' criado.\n• Cliente\n"
+
+
+# e2e: um comando lento não segura os outros clientes, e cada um recebe só a sua saída
+def test_slow_command_does_not_block(server, monkeypatch):
+    release = threading.Event()
+    search_ranked = server.cli.db.search_ranked
+
+    def slow_search(*args):
+        assert release.wait(30)
+        return search_ranked(*args)
+
+    monkeypatch.setattr(server.cli.db, "search_ranked", slow_search)
+    a = client.Client(server.address)
+    b = client.Client(server.address)
+
+    slow = threading.Thread(target=lambda: setattr(a, "reply", a.request({"op": "search", "text": "Rivais Destinados"})))
+    slow.start()
+    assert b.command("create_deck Rapido")["output"] == ["Deck 'Rapido' criado."]
+    assert b.request({"op": "get", "id": 15579})["ok"]
+    assert slow.is_alive()
+
+    release.set()
+    slow.join(30)
+    assert a.reply["cards"] == [[15579, "Rivais Destinados"]]
+    a.close()
+    b.close()
+
+
+# e2e: shutdown encerra o servidor mesmo com outro cliente conectado
+def test_shutdown_with_open_client(tmp_path, monkeypatch):
+    monkeypatch.setattr("cli.DECKS_STORE", str(tmp_path / "decks"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = CardCLI(defer_writes=True)
+    server = CardServer(cli)
+    path = str(tmp_path / "s.sock")
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(path),), daemon=True)
+    thread.start()
+    assert server.started.wait(30)
+
+    idle = client.Client(path)
+    assert idle.command("create_deck Aberto")["ok"]
+    other = client.Client(path)
+    assert other.request({"op": "shutdown"}) == {"ok": True}
+
+    thread.join(10)
+    assert not thread.is_alive()
+    assert idle.file.readline() == b""  # a conexão parada foi fechada
+    idle.close()
+    other.close()
+    cli.close()
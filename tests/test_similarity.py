@@ -0,0 +1,80 @@
+from unittest import mock
+
+import pytest
+
+from cli import DeckManager
+from conftest import keep_id, make_deck
+from storage import similarity
+from storage.similarity import HASHES, Similar, estimate, signature
+from storage.storage import open_store
+
+
+def jaccard(a, b):
+    ids = set(a) | set(b)
+    return sum(min(a.get(i, 0), b.get(i, 0)) for i in ids) / sum(max(a.get(i, 0), b.get(i, 0)) for i in ids)
+
+
+BASE = {card_id: 3 for card_id in range(1, 14)}  # 39 cartas
+NEAR = {**BASE, 13: 1, 14: 2}  # troca duas cópias
+HALF = {**{card_id: 3 for card_id in range(1, 11)}, **{card_id: 3 for card_id in range(50, 53)}}  # Jaccard 0,625
+OTHER = {card_id: 3 for card_id in range(100, 113)}
+
+
+def archive():
+    return [make_deck("base", BASE), make_deck("near", NEAR), make_deck("half", HALF), make_deck("other", OTHER)]
+
+
+# unit: a fração de hashes iguais estima o Jaccard do multiconjunto de cartas
+def test_estimate_close_to_jaccard():
+    assert len(signature(BASE)) == HASHES and signature({}) == ()
+    assert estimate(signature(BASE), signature(dict(BASE))) == 1.0
+    assert estimate(signature(BASE), ()) == 0.0
+    for other in (NEAR, HALF, OTHER, {1: 1}):
+        assert abs(estimate(signature(BASE), signature(other)) - jaccard(BASE, other)) < 0.15
+
+
+# unit: com ou sem NumPy a assinatura é a mesma (as gravadas continuam valendo)
+def test_signature_without_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    expected = signature(NEAR)
+    monkeypatch.setattr(similarity, "_arrays", ())
+    assert signature(NEAR) == expected
+
+
+# unit: o índice LSH acha os decks parecidos, do mais ao menos, sem o próprio deck
+def test_similar_decks(location):
+    store = open_store(location)
+    store.write_many(archive())
+    manager = DeckManager(store, keep_id)
+
+    found = manager.similarity.similar(manager.get("base"))
+    assert [s.name for s in found] == ["near", "half"]
+    assert abs(found[0].jaccard - jaccard(BASE, NEAR)) < 0.15
+    assert manager.similarity.similar(manager.get("base"), limit=1) == found[:1]
+    assert manager.similarity.similar(make_deck("vazio", {})) == []
+
+    # Gravar, apagar e renomear atualiza o índice sem reler o acervo
+    manager.delete("near", persist=True)
+    manager.rename("other", "copia", persist=True)
+    manager.clear("copia")
+    manager.add("copia", 1, amount=39)
+    manager.flush(["copia"])
+    names = [s.name for s in manager.similarity.similar(make_deck("base", BASE))]
+    assert names == ["half"]
+    assert manager.similarity.similar(make_deck("x", {1: 39})) == [Similar("copia", 1.0)]
+    store.close()
+
+
+# unit: as assinaturas ficam gravadas no backend e não são recalculadas ao reabrir
+def test_signatures_persisted(location):
+    store = open_store(location)
+    store.write_many(archive())
+    expected = store.signatures()
+    store.close()
+
+    store = open_store(location)
+    with mock.patch.object(store, "read", side_effect=AssertionError("leu um deck")):
+        assert store.signatures() == expected
+        manager = DeckManager(store, keep_id)
+        assert [s.name for s in manager.similarity.similar(make_deck("x", NEAR))] == ["near", "base", "half"]
+    store.close()
@@ -47,19 +47,35 @@ def test_save_deck(tmp_path):
     folder = tmp_path / "decks"
     folder.mkdir()
 
-    with mock.patch("builtins.open", mock.mock_open()) as mocked_open:
+    with mock.patch("os.fdopen", mock.mock_open()) as mocked_open, \
+            mock.patch("os.fsync"), mock.patch("os.replace") as mocked_replace:
 
         save_deck(deck, folder=str(folder))
 
+        # Grava num temporário exclusivo da mesma pasta e renomeia por cima do arquivo final
         caminho_esperado = os.path.join(str(folder), f"{deck.name}.json")
-        mocked_open.assert_called_once_with(caminho_esperado, "w", encoding="utf-8")
+        (temporario, destino), _ = mocked_replace.call_args
+        assert destino == caminho_esperado
+        assert os.path.dirname(temporario) == str(folder)
+        assert os.path.basename(temporario).startswith(f"{deck.name}.json.")
+        assert temporario.endswith(".tmp")
 
         handle = mocked_open()
         dados = "".join(call.args[0] for call in handle.write.call_args_list)
         deck_json = json.loads(dados)
 
         assert deck_json["name"] == "test_deck"
-        assert deck_json["cards"] == [1, 2]
+        assert deck_json["main"] == {"1": 1, "2": 1}
+
+def test_save_deck_failure_leaves_no_temp_file(tmp_path):
+    deck = Deck("test_deck")
+    deck.add_card(1)
+
+    with mock.patch("os.fsync", side_effect=OSError(28, "No space left on device")):
+        with pytest.raises(OSError):
+            save_deck(deck, folder=str(tmp_path))
+
+    assert os.listdir(tmp_path) == []
 
 def test_load_deck(deck, mock_db):
     